@@ -0,0 +1,48 @@
+"""add review_jobs
+
+Revision ID: 3c9a5e1d7b42
+Revises: 61b8c3f28b29
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9a5e1d7b42'
+down_revision: Union[str, Sequence[str], None] = '61b8c3f28b29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('review_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('pr_id', sa.Integer(), nullable=False),
+    sa.Column('installation_id', sa.Integer(), nullable=True),
+    sa.Column('head_sha', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['pr_id'], ['pull_requests.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_review_jobs_id'), 'review_jobs', ['id'], unique=False)
+    op.create_index('ix_review_jobs_status_run_after', 'review_jobs', ['status', 'run_after'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_review_jobs_status_run_after', table_name='review_jobs')
+    op.drop_index(op.f('ix_review_jobs_id'), table_name='review_jobs')
+    op.drop_table('review_jobs')
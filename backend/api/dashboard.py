@@ -1,26 +1,31 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Request
 from sqlalchemy import func
+from sqlalchemy.orm import Session
 
-from backend.api.deps import get_db
 from backend import models
+from backend.core.database import run_in_session
+from backend.integrations.github.rate_limit import rate_limit_snapshots
+from backend.services.response_cache import DASHBOARD_SCOPE, get_response_cache
+from backend.services.rollups import severity_counts
 
 router = APIRouter(prefix="/api", tags=["dashboard"])
 
 
 @router.get("/dashboard")
-def dashboard(db: Session = Depends(get_db)):
+async def dashboard(request: Request):
     """Returns basic statistics for the dashboard."""
+    return await get_response_cache().respond(
+        request, DASHBOARD_SCOPE, "dashboard", _dashboard_stats
+    )
+
+
+def _dashboard_stats(db: Session) -> dict:
     total_repos = db.query(models.Repository).count()
     total_prs = db.query(models.PullRequest).count()
-    total_issues = db.query(models.ReviewIssue).count()
-
-    severity_counts = (
-        db.query(models.ReviewIssue.severity, func.count(models.ReviewIssue.id))
-        .group_by(models.ReviewIssue.severity)
-        .all()
-    )
-    severity_dict = {severity: count for severity, count in severity_counts}
+    # Per-severity counts come from the per-repo rollups. The total is counted
+    # directly: the rollups have no bucket for issues without a severity.
+    severity_dict = severity_counts(db)
+    total_issues = db.query(func.count(models.ReviewIssue.id)).scalar() or 0
 
     return {
         "repositories": total_repos,
@@ -30,3 +35,9 @@ def dashboard(db: Session = Depends(get_db)):
         "major": severity_dict.get("major", 0),
         "minor": severity_dict.get("minor", 0),
     }
+
+
+@router.get("/github/rate-limits")
+async def github_rate_limits():
+    """Remaining GitHub API budget per installation, as last reported by any process."""
+    return await run_in_session(rate_limit_snapshots)
@@ -0,0 +1,87 @@
+"""
+Keyset pagination for list endpoints.
+
+A page is the first `limit` rows after the cursor in the listing's order.
+The cursor is an opaque token holding the sort key of the last row returned,
+so fetching page N costs the same as page 1, however large the table.
+Responses stay plain JSON arrays; the next page's cursor, if there is one,
+is sent in the `X-Next-Cursor` header.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+
+from backend.core.config import API_MAX_PAGE_SIZE, API_PAGE_SIZE
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def limit_param(
+    limit: int = Query(API_PAGE_SIZE, ge=1, le=API_MAX_PAGE_SIZE, description="Page size"),
+) -> int:
+    return limit
+
+
+def paginate(
+    query,
+    columns: Sequence,
+    limit: int,
+    cursor: Optional[str],
+    descending: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Run `query` ordered by `columns` (which must be unique together, with an
+    index to match) from `cursor` on. Returns the rows and the next cursor.
+    """
+    if cursor:
+        after = _decode(cursor, columns)
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+    query = query.order_by(*(c.desc() if descending else c.asc() for c in columns))
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, _encode([getattr(last, c.key) for c in columns])
+
+
+def _encode(values: List[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str, columns: Sequence) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong length")
+        return [_coerce(c, v) for c, v in zip(columns, values)]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(400, f"Invalid cursor: {e}")
+
+
+def _coerce(column, value: Any) -> Any:
+    # A cursor is client input: check each value against its column's type so
+    # a tampered one is a 400, not a type error from the database.
+    python_type = _python_type(column)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is not None and (
+        not isinstance(value, python_type) or isinstance(value, bool)
+    ):
+        raise ValueError(f"expected {python_type.__name__} for {column.key}")
+    return value
+
+
+def _python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
@@ -1,30 +1,65 @@
-from fastapi import APIRouter, HTTPException, Depends
+import math
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from backend.api.deps import get_db
+from backend.api.pagination import NEXT_CURSOR_HEADER, limit_param, paginate
 from backend import models
 from backend.schemas import ReviewIssueOut
-from backend.integrations.github.client import fetch_pr_diff
+from backend.integrations.github.diff_cache import get_cached_pr_diff
+from backend.integrations.github.rate_limit import RateLimited
+from backend.services.response_cache import CachedContent, get_response_cache, pr_scope
 from backend.services.review_service import run_and_store_review
 
 router = APIRouter(prefix="/api/prs", tags=["pull_requests"])
 
 
 @router.get("/{pr_id}/issues", response_model=list[ReviewIssueOut])
-def list_review_issues(pr_id: int, db: Session = Depends(get_db)):
-    return (
-        db.query(models.ReviewIssue)
-        .filter(models.ReviewIssue.pr_id == pr_id)
-        .order_by(models.ReviewIssue.created_at.desc())
-        .all()
-    )
+async def list_review_issues(
+    pr_id: int,
+    request: Request,
+    limit: int = Depends(limit_param),
+    cursor: Optional[str] = None,
+    kind: Optional[str] = None,
+    severity: Optional[str] = None,
+):
+    """A page of a PR's review issues, newest first, optionally filtered."""
+
+    def build(db: Session):
+        query = db.query(models.ReviewIssue).filter(models.ReviewIssue.pr_id == pr_id)
+        if kind:
+            query = query.filter(models.ReviewIssue.kind == kind)
+        if severity:
+            query = query.filter(models.ReviewIssue.severity == severity)
+        rows, next_cursor = paginate(
+            query,
+            (models.ReviewIssue.created_at, models.ReviewIssue.id),
+            limit,
+            cursor,
+            descending=True,
+        )
+        return CachedContent(
+            [ReviewIssueOut.model_validate(row) for row in rows],
+            {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {},
+        )
+
+    key = f"issues:{limit}:{cursor}:{kind}:{severity}"
+    return await get_response_cache().respond(request, pr_scope(pr_id), key, build)
 
 
 @router.get("/{pr_id}/summary")
-def get_pr_summary(pr_id: int, db: Session = Depends(get_db)):
+async def get_pr_summary(pr_id: int, request: Request):
     """Summary of a PR, including issue counts by severity."""
+    return await get_response_cache().respond(
+        request, pr_scope(pr_id), "summary", lambda db: _pr_summary(pr_id, db)
+    )
+
+
+def _pr_summary(pr_id: int, db: Session) -> dict:
     pr = db.query(models.PullRequest).filter(models.PullRequest.id == pr_id).first()
     if not pr:
         raise HTTPException(404, f"Pull request with id {pr_id} not found")
@@ -60,7 +95,7 @@ def get_pr_summary(pr_id: int, db: Session = Depends(get_db)):
 
 @router.get("/{pr_id}/diff")
 def get_pr_diff(pr_id: int, db: Session = Depends(get_db)):
-    """Returns the unified diff for a PR (fetched live from GitHub)."""
+    """Returns the unified diff for a PR (from GitHub, cached per head commit)."""
     pr = db.query(models.PullRequest).filter(models.PullRequest.id == pr_id).first()
     if not pr:
         raise HTTPException(404, f"Pull request with id {pr_id} not found")
@@ -70,7 +105,9 @@ def get_pr_diff(pr_id: int, db: Session = Depends(get_db)):
         raise HTTPException(404, f"Repository for PR id {pr_id} not found")
 
     try:
-        diff = fetch_pr_diff(repo.full_name, pr.pr_number, repo.installation_id)
+        diff = get_cached_pr_diff(repo.full_name, pr.pr_number, pr.head_sha, repo.installation_id)
+    except RateLimited as e:
+        raise _rate_limited(e)
     except ValueError as e:
         raise HTTPException(500, f"Failed to fetch PR diff: {str(e)}")
     except Exception as e:
@@ -94,10 +131,20 @@ def rerun_review(id: int, db: Session = Depends(get_db)):
         raise HTTPException(404, f"Repository for PR id {id} not found")
 
     try:
-        issues = run_and_store_review(db, repo, pr, repo.installation_id)
+        issues = run_and_store_review(
+            db, repo, pr, repo.installation_id, incremental=False
+        )
+    except RateLimited as e:
+        raise _rate_limited(e)
     except ValueError as e:
         raise HTTPException(500, f"Failed to fetch PR diff: {str(e)}")
     except Exception as e:
         raise HTTPException(500, f"Unexpected error during review: {str(e)}")
 
     return JSONResponse({"reviewed": True, "issues": len(issues)})
+
+
+def _rate_limited(e: RateLimited) -> HTTPException:
+    return HTTPException(
+        503, str(e), headers={"Retry-After": str(math.ceil(e.retry_after))}
+    )
@@ -1,62 +1,132 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from backend.api.deps import get_db
+from backend.api.pagination import NEXT_CURSOR_HEADER, limit_param, paginate
 from backend import models
+from backend.core.database import run_in_session
 from backend.schemas import RepositoryOut, PullRequestOut
 
 router = APIRouter(prefix="/api/repos", tags=["repositories"])
 
 
 @router.get("/repositories", response_model=list[RepositoryOut])
-def list_repositories(db: Session = Depends(get_db)):
-    return db.query(models.Repository).order_by(models.Repository.full_name).all()
+async def list_repositories(
+    response: Response,
+    limit: int = Depends(limit_param),
+    cursor: Optional[str] = None,
+):
+    rows, next_cursor = await run_in_session(
+        lambda db: paginate(
+            db.query(models.Repository), (models.Repository.full_name,), limit, cursor
+        )
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
+@router.get("/overview")
+async def list_repo_overviews(
+    response: Response,
+    ids: Optional[List[int]] = Query(None, description="Repository ids (default: all)"),
+    limit: int = Depends(limit_param),
+    cursor: Optional[str] = None,
+):
+    """
+    PR count, last review and critical issue count for many repositories in
+    one query: the ones in `ids`, or a page of all of them by name.
+    """
+
+    def load(db: Session):
+        query = _overview_query(db)
+        if ids:
+            rows = query.filter(models.Repository.id.in_(ids)).order_by(models.Repository.full_name)
+            return rows.all(), None
+        return paginate(query, (models.Repository.full_name,), limit, cursor)
+
+    rows, next_cursor = await run_in_session(load)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [_overview(row) for row in rows]
 
 
 @router.get("/{repo_id}/prs", response_model=list[PullRequestOut])
-def list_pull_requests(repo_id: int, db: Session = Depends(get_db)):
-    return (
-        db.query(models.PullRequest)
-        .filter(models.PullRequest.repo_id == repo_id)
-        .order_by(models.PullRequest.pr_number.desc())
-        .all()
+async def list_pull_requests(
+    repo_id: int,
+    response: Response,
+    limit: int = Depends(limit_param),
+    cursor: Optional[str] = None,
+):
+    rows, next_cursor = await run_in_session(
+        lambda db: paginate(
+            db.query(models.PullRequest).filter(models.PullRequest.repo_id == repo_id),
+            (models.PullRequest.pr_number,),
+            limit,
+            cursor,
+            descending=True,
+        )
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
 
 
 @router.get("/{repo_id}")
-def get_repo(repo_id: int, db: Session = Depends(get_db)):
+async def get_repo(repo_id: int):
     """
     Basic information about a repository: PR count, last review, critical count.
     """
-    repo = db.query(models.Repository).filter(models.Repository.id == repo_id).first()
-    if not repo:
+    row = await run_in_session(
+        lambda db: _overview_query(db).filter(models.Repository.id == repo_id).first()
+    )
+    if not row:
         raise HTTPException(404, f"Repository with id {repo_id} not found")
+    return _overview(row)
 
-    total_prs = (
-        db.query(models.PullRequest)
-        .filter(models.PullRequest.repo_id == repo.id)
-        .count()
+
+def _overview_query(db: Session):
+    # One statement; the per-repo aggregates are correlated subqueries, so
+    # each one is a range scan of the (repo_id, ...) indexes for just the
+    # repositories being returned.
+    pr = models.PullRequest
+    prs = (
+        db.query(func.count(pr.id))
+        .filter(pr.repo_id == models.Repository.id)
+        .correlate(models.Repository)
+        .scalar_subquery()
     )
-    last_reviewed_at = (
-        db.query(func.max(models.PullRequest.last_reviewed_at))
-        .filter(models.PullRequest.repo_id == repo.id)
-        .scalar()
+    last_review = (
+        db.query(func.max(pr.last_reviewed_at))
+        .filter(pr.repo_id == models.Repository.id)
+        .correlate(models.Repository)
+        .scalar_subquery()
     )
-    critical_issues_count = (
-        db.query(func.count(models.ReviewIssue.id))
-        .join(models.PullRequest, models.ReviewIssue.pr_id == models.PullRequest.id)
+    critical = (
+        db.query(models.SeverityRollup.count)
         .filter(
-            models.PullRequest.repo_id == repo.id,
-            models.ReviewIssue.severity == "critical",
+            models.SeverityRollup.repo_id == models.Repository.id,
+            models.SeverityRollup.severity == "critical",
         )
-        .scalar()
+        .correlate(models.Repository)
+        .scalar_subquery()
+    )
+    return db.query(
+        models.Repository.id,
+        models.Repository.full_name,
+        prs.label("prs"),
+        last_review.label("last_review"),
+        critical.label("critical"),
     )
 
+
+def _overview(row) -> dict:
     return {
-        "id": repo.id,
-        "name": repo.full_name,
-        "prs": total_prs,
-        "last_review": last_reviewed_at.isoformat() if last_reviewed_at else None,
-        "critical": critical_issues_count,
+        "id": row.id,
+        "name": row.full_name,
+        "prs": row.prs or 0,
+        "last_review": row.last_review.isoformat() if row.last_review else None,
+        "critical": row.critical or 0,
     }
@@ -1,54 +1,58 @@
-import json
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from backend.api.deps import get_db
 from backend import models
 from backend.core.config import GITHUB_INSTALLATION_ID
-from backend.integrations.github.webhook_utils import check_signature
-from backend.services.review_service import run_and_store_review
+from backend.core.database import run_in_session
+from backend.integrations.github.webhook_utils import check_signature, load_payload, peek_action
+from backend.services.job_queue import enqueue_review
+from backend.services.response_cache import ainvalidate_pr
+from backend.services.webhook_deliveries import claim_delivery, prune_if_due
 
 router = APIRouter(prefix="/api/webhook", tags=["webhook"])
 
 
+REVIEW_ACTIONS = ("opened", "reopened", "synchronize")
+
+
 @router.post("/github/webhook")
-async def webhook(request: Request, db: Session = Depends(get_db)):
+async def webhook(request: Request):
     raw_body = await request.body()
     signature = request.headers.get("X-Hub-Signature-256", "")
-    content_type = request.headers.get("content-type", "")
-
-    # 1. Parse payload
-    if content_type.startswith("application/x-www-form-urlencoded"):
-        form = await request.form()
-        payload = form.get("payload")
-        if not payload:
-            raise HTTPException(400, "Missing payload")
-        try:
-            data = json.loads(payload)
-        except Exception:
-            raise HTTPException(400, "Invalid JSON inside form payload")
-    else:
-        try:
-            data = json.loads(raw_body.decode())
-        except Exception:
-            raise HTTPException(400, "Invalid JSON body")
-
-    event = request.headers.get("X-GitHub-Event")
-    action = data.get("action")
+    form_encoded = request.headers.get("content-type", "").startswith(
+        "application/x-www-form-urlencoded"
+    )
 
-    # 2. Verify signature
+    # 1. Verify signature on the raw bytes, before any decoding
     if not check_signature(signature, raw_body):
         raise HTTPException(401, "Invalid signature")
 
+    # 2. Drop events we don't act on from the headers / leading bytes; most
+    # deliveries stop here without the payload ever being parsed.
+    event = request.headers.get("X-GitHub-Event")
     if event == "ping":
         return {"ok": True}
 
     if event != "pull_request":
         return {"ignored": True}
 
-    if action not in ("opened", "reopened", "synchronize"):
+    action = peek_action(raw_body, form_encoded)
+    if action is not None and action not in REVIEW_ACTIONS:
+        return {"ignored": True}
+
+    # 3. Parse payload
+    try:
+        data = load_payload(raw_body, form_encoded)
+    except Exception:
+        raise HTTPException(400, "Invalid webhook payload")
+    if not isinstance(data, dict):
+        raise HTTPException(400, "Invalid webhook payload")
+
+    if data.get("action") not in REVIEW_ACTIONS:
         return {"ignored": True}
 
     # Installation id: prefer the webhook payload, fall back to config.
@@ -82,6 +86,55 @@ async def webhook(request: Request, db: Session = Depends(get_db)):
     state = pr_info.get("state")
     head_sha = pr_info.get("head", {}).get("sha")
 
+    # GitHub redelivers on timeouts and errors; acknowledge repeats without work.
+    delivery_id = request.headers.get("X-GitHub-Delivery")
+
+    # The database work is sync ORM code; keep it off the event loop.
+    result = await run_in_session(
+        lambda db: _handle_delivery(
+            db, delivery_id, event, repo_full, installation_id, pr_number, title, state, head_sha
+        )
+    )
+    if result is None:
+        return {"duplicate": True}
+    pr_id, job_id = result
+    # Title/state/head show up in the PR summary; new PRs in the dashboard.
+    await ainvalidate_pr(pr_id)
+    return JSONResponse({"queued": True, "job_id": job_id}, status_code=202)
+
+
+def _handle_delivery(
+    db: Session,
+    delivery_id: Optional[str],
+    event: str,
+    *args,
+) -> Optional[Tuple[int, int]]:
+    """
+    _record_and_enqueue once per delivery id; None for a repeat delivery. The
+    claim commits in the same transaction as the PR upsert and the job.
+    """
+    if delivery_id and not claim_delivery(db, delivery_id, event):
+        db.rollback()
+        return None
+    result = _record_and_enqueue(db, *args)
+    if delivery_id:
+        prune_if_due(db)
+    return result
+
+
+def _record_and_enqueue(
+    db: Session,
+    repo_full: str,
+    installation_id: int,
+    pr_number: int,
+    title: Optional[str],
+    state: Optional[str],
+    head_sha: Optional[str],
+) -> Tuple[int, int]:
+    """
+    Upsert the repository and PR, then queue a review, in one transaction
+    (committed by enqueue_review). Returns (PR id, job id).
+    """
     # Upsert repository (and remember which installation owns it, so manual
     # reruns work later).
     repo = (
@@ -92,43 +145,35 @@ async def webhook(request: Request, db: Session = Depends(get_db)):
     if not repo:
         repo = models.Repository(full_name=repo_full, installation_id=installation_id)
         db.add(repo)
-        db.commit()
-        db.refresh(repo)
+        db.flush()
     elif repo.installation_id != installation_id:
         repo.installation_id = installation_id
-        db.commit()
 
     # Upsert pull request
-    pr = (
+    pr = _find_pr(db, repo.id, pr_number)
+    if not pr:
+        try:
+            with db.begin_nested():
+                pr = models.PullRequest(repo_id=repo.id, pr_number=pr_number)
+                db.add(pr)
+        except IntegrityError:
+            # A concurrent delivery for the same PR inserted it first.
+            pr = _find_pr(db, repo.id, pr_number)
+    pr.title = title
+    pr.state = state
+    pr.head_sha = head_sha
+
+    # Hand the review to a worker; GitHub only waits ~10s for a response.
+    job = enqueue_review(db, pr, installation_id)
+    return pr.id, job.id
+
+
+def _find_pr(db: Session, repo_id: int, pr_number: int):
+    return (
         db.query(models.PullRequest)
         .filter(
-            models.PullRequest.repo_id == repo.id,
+            models.PullRequest.repo_id == repo_id,
             models.PullRequest.pr_number == pr_number,
         )
         .first()
     )
-    if not pr:
-        pr = models.PullRequest(
-            repo_id=repo.id,
-            pr_number=pr_number,
-            title=title,
-            state=state,
-            head_sha=head_sha,
-        )
-        db.add(pr)
-    else:
-        pr.title = title
-        pr.state = state
-        pr.head_sha = head_sha
-    db.commit()
-    db.refresh(pr)
-
-    # Fetch diff → review → store issues → post comment
-    try:
-        issues = run_and_store_review(db, repo, pr, installation_id)
-    except ValueError as e:
-        raise HTTPException(500, f"Failed to fetch PR diff: {str(e)}")
-    except Exception as e:
-        raise HTTPException(500, f"Unexpected error during review: {str(e)}")
-
-    return JSONResponse({"reviewed": True, "issues": len(issues)})
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -30,13 +31,122 @@ if _private_key:
 GITHUB_PRIVATE_KEY = os.getenv("GITHUB_PRIVATE_KEY", _private_key)
 GITHUB_INSTALLATION_ID = os.getenv("GITHUB_INSTALLATION_ID")
 GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+# Handled X-GitHub-Delivery ids are remembered this long (seconds; GitHub
+# redelivers for up to 3 days) so redeliveries are acknowledged without work.
+# The oldest are dropped past the entry cap.
+WEBHOOK_DELIVERY_TTL = int(os.getenv("WEBHOOK_DELIVERY_TTL", 3 * 24 * 3600))
+WEBHOOK_DELIVERY_MAX_ENTRIES = int(os.getenv("WEBHOOK_DELIVERY_MAX_ENTRIES", 100_000))
 GITHUB_PERSONAL_TOKEN = os.getenv("GITHUB_PERSONAL_TOKEN")
+# Point these at a local stand-in server to test without GitHub.
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_WEB_URL = os.getenv("GITHUB_WEB_URL", "https://github.com").rstrip("/")
+# Shared GitHub HTTP client: HTTP/2 needs the h2 package (httpx[http2]).
+GITHUB_HTTP2 = os.getenv("GITHUB_HTTP2", "true").lower() == "true"
+GITHUB_CONNECT_TIMEOUT = float(os.getenv("GITHUB_CONNECT_TIMEOUT", 5))
+GITHUB_READ_TIMEOUT = float(os.getenv("GITHUB_READ_TIMEOUT", 30))
+GITHUB_MAX_CONNECTIONS = int(os.getenv("GITHUB_MAX_CONNECTIONS", 20))
+# GitHub GET responses kept for ETag revalidation (304s are free of rate
+# limit); total body bytes per process, 0 to disable.
+GITHUB_HTTP_CACHE_MAX_BYTES = int(os.getenv("GITHUB_HTTP_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+# Requests per installation left for comment posting when fetches must wait,
+# and the longest (seconds) a call waits on a rate limit before the review is
+# requeued for later instead.
+GITHUB_RATE_LIMIT_RESERVE = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", 100))
+GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", 60))
+# Seconds between writes of a process's budget snapshot to github_rate_limits,
+# which GET /api/github/rate-limits serves.
+GITHUB_RATE_LIMIT_SNAPSHOT_INTERVAL = float(os.getenv("GITHUB_RATE_LIMIT_SNAPSHOT_INTERVAL", 10))
 
 GPT_API_URL = os.getenv("GPT_API_URL")
 GPT_API_KEY = os.getenv("GPT_API_KEY")
 GPT_MODEL = os.getenv("GPT_MODEL", "gpt-4o-mini")
+GPT_CONNECT_TIMEOUT = float(os.getenv("GPT_CONNECT_TIMEOUT", 5))
+GPT_READ_TIMEOUT = float(os.getenv("GPT_READ_TIMEOUT", 60))
+# Retries on 429/5xx and connection errors, with jittered exponential backoff.
+GPT_MAX_RETRIES = int(os.getenv("GPT_MAX_RETRIES", 3))
+GPT_MAX_CONNECTIONS = int(os.getenv("GPT_MAX_CONNECTIONS", 10))
+
+# --- Review pipeline --------------------------------------------------------
+# How many agent calls may talk to the LLM at once, across every review in the
+# process, and how long (seconds) a single call may take, retries included,
+# before it is abandoned and its findings are dropped from the review.
+REVIEW_AGENT_CONCURRENCY = int(os.getenv("REVIEW_AGENT_CONCURRENCY", 4))
+REVIEW_AGENT_TIMEOUT = float(os.getenv("REVIEW_AGENT_TIMEOUT", 90))
+# Estimated tokens of diff per prompt; larger diffs are split into batches.
+REVIEW_CONTEXT_BUDGET = int(os.getenv("REVIEW_CONTEXT_BUDGET", 12_000))
+# Unchanged lines kept around each change in prompts (the diff itself has 3).
+REVIEW_PROMPT_CONTEXT_LINES = int(os.getenv("REVIEW_PROMPT_CONTEXT_LINES", 2))
+# An issue whose line isn't in the diff is moved to the nearest diff line
+# within this distance; further away, it is kept without a line number.
+REVIEW_LINE_SNAP_DISTANCE = int(os.getenv("REVIEW_LINE_SNAP_DISTANCE", 3))
+# Cap on diff size, so a huge (e.g. vendored) PR can't exhaust memory: parsing
+# stops here and the rest of the diff is left unreviewed. The per-file cap is
+# REVIEW_MAX_FILE_BYTES below.
+DIFF_MAX_TOTAL_BYTES = int(os.getenv("DIFF_MAX_TOTAL_BYTES", 20 * 1024 * 1024))
+# PR diffs are stored compressed per head commit, so a PR whose head hasn't
+# moved is downloaded once. Least recently used diffs are evicted past the
+# total (compressed) size.
+DIFF_CACHE_ENABLED = os.getenv("DIFF_CACHE_ENABLED", "true").lower() == "true"
+DIFF_CACHE_MAX_BYTES = int(os.getenv("DIFF_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# Path filters applied before the agents (comma-separated globs). Lockfiles,
+# minified bundles, snapshots and vendored code are always excluded; if
+# REVIEW_INCLUDE_GLOBS is set, only matching files are reviewed.
+REVIEW_INCLUDE_GLOBS = [g.strip() for g in os.getenv("REVIEW_INCLUDE_GLOBS", "").split(",") if g.strip()]
+REVIEW_EXCLUDE_GLOBS = [g.strip() for g in os.getenv("REVIEW_EXCLUDE_GLOBS", "").split(",") if g.strip()]
+# Files with a larger patch are listed as skipped instead of reviewed. The diff
+# parser drops them as it reads, so they are never held in memory whole.
+REVIEW_MAX_FILE_BYTES = int(os.getenv("REVIEW_MAX_FILE_BYTES", 200 * 1024))
+# Review only files touched since the last reviewed head, keeping earlier
+# findings for the rest of the PR.
+REVIEW_INCREMENTAL = os.getenv("REVIEW_INCREMENTAL", "true").lower() == "true"
+# Agent findings are cached per file patch, so unchanged files skip the LLM.
+REVIEW_CACHE_ENABLED = os.getenv("REVIEW_CACHE_ENABLED", "true").lower() == "true"
+REVIEW_CACHE_MAX_ENTRIES = int(os.getenv("REVIEW_CACHE_MAX_ENTRIES", 2048))  # in-process LRU
+REVIEW_CACHE_MAX_ROWS = int(os.getenv("REVIEW_CACHE_MAX_ROWS", 100_000))  # database tier
+REVIEW_CACHE_TTL = int(os.getenv("REVIEW_CACHE_TTL", 7 * 24 * 60 * 60))  # seconds
+
+# --- Review job queue -------------------------------------------------------
+# Webhooks enqueue jobs; `python -m backend.worker` processes them.
+REVIEW_JOB_MAX_ATTEMPTS = int(os.getenv("REVIEW_JOB_MAX_ATTEMPTS", 3))
+# Seconds a claimed job stays invisible to other workers. A worker that dies
+# mid-review loses its claim after this and the job is picked up again.
+REVIEW_JOB_VISIBILITY_TIMEOUT = int(os.getenv("REVIEW_JOB_VISIBILITY_TIMEOUT", 600))
+# While a review runs, its worker extends the claim this often (seconds), so a
+# long review isn't handed to a second worker. Keep well below the timeout.
+REVIEW_JOB_HEARTBEAT_INTERVAL = int(os.getenv("REVIEW_JOB_HEARTBEAT_INTERVAL", 60))
+# Base delay (seconds) before a failed job is retried; doubles per attempt.
+REVIEW_JOB_RETRY_BACKOFF = int(os.getenv("REVIEW_JOB_RETRY_BACKOFF", 30))
+REVIEW_WORKER_POLL_INTERVAL = float(os.getenv("REVIEW_WORKER_POLL_INTERVAL", 2))
+# New jobs wait this many seconds before they can run, so a burst of pushes to
+# the same PR collapses into one review of the last head.
+REVIEW_DEBOUNCE_SECONDS = int(os.getenv("REVIEW_DEBOUNCE_SECONDS", 20))
+
+# --- API response cache -----------------------------------------------------
+# Dashboard / PR summary / PR issues responses are cached in process and
+# served with ETags until a review or webhook changes them. Invalidations go
+# through a bus shared with the workers: "sqlite" (a file every process on the
+# host, or a shared volume, opens), "database" (API and workers on separate
+# hosts) or "memory" (single process only).
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+RESPONSE_CACHE_BUS = os.getenv("RESPONSE_CACHE_BUS", "sqlite").lower()
+RESPONSE_CACHE_BUS_PATH = os.getenv(
+    "RESPONSE_CACHE_BUS_PATH", os.path.join(tempfile.gettempdir(), "prauditor_cache_bus.sqlite")
+)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Connection pool (ignored for SQLite). pre-ping drops connections the server
+# closed while idle; recycle (seconds) retires them before provider timeouts.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Run API request sessions on an async engine (needs sqlalchemy[asyncio] plus
+# asyncpg, or aiosqlite for SQLite).
+# DB_ASYNC_URL defaults to DATABASE_URL with the async driver swapped in.
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+DB_ASYNC_URL = os.getenv("DB_ASYNC_URL", "")
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", 8000))
 ENV = os.getenv("ENV", "production")
@@ -50,6 +160,12 @@ CORS_ORIGINS = [
     if o.strip()
 ]
 
+# Default and maximum `limit` for paginated list endpoints. Lists used to be
+# unbounded: clients that don't follow X-Next-Cursor see only the first
+# API_PAGE_SIZE rows (see docs/API.md).
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 100))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 500))
+
 # --- GitHub OAuth (user login) ---------------------------------------------
 GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID")
 GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
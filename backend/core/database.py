@@ -1,15 +1,84 @@
+"""
+Engines and sessions.
+
+- `get_db` / `run_in_session`: request-scoped sessions for the API. With
+  DB_ASYNC=true, `run_in_session` runs its function on an AsyncSession
+  (asyncpg / aiosqlite) without blocking the event loop; otherwise on a sync
+  session in the threadpool.
+- `SessionLocal`: plain sync sessions for the review worker, caches and
+  scripts. They open, commit and close their own sessions.
+"""
+
+from typing import Any, Callable
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+
+from backend.core.config import (
+    DATABASE_URL,
+    DB_ASYNC,
+    DB_ASYNC_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
+
+
+def _engine_options(url: str) -> dict:
+    options = {"echo": False, "pool_pre_ping": DB_POOL_PRE_PING}
+    if url.startswith("sqlite"):
+        # Sessions are handed between threads (threadpool routes, workers).
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def _async_url(url: str) -> str:
+    """postgresql:// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        # asyncpg spells libpq's sslmode as ssl.
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+        return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(
+            hide_password=False
+        )
+    raise ValueError(f"No async driver known for {backend}; set DB_ASYNC_URL")
 
-from backend.core.config import DATABASE_URL
 
 # Creating SQLAlchemy engine
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 
 # Database session factory
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _url = DB_ASYNC_URL or _async_url(DATABASE_URL)
+    async_engine = create_async_engine(_url, **_engine_options(_url))
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
 # Base class for ORM models
 Base = declarative_base()
 
@@ -27,3 +96,36 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def run_in_session(fn: Callable[[Session], Any]) -> Any:
+    """
+    Run `fn(session)` with a fresh request-scoped session and return its
+    result, without blocking the event loop. `fn` is ordinary sync ORM code;
+    with DB_ASYNC it runs through AsyncSession.run_sync on the async engine.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            return await session.run_sync(fn)
+
+    def call() -> Any:
+        db = SessionLocal()
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(call)
+
+
+def dialect_insert(db: Session):
+    """`insert` for the session's database, with its ON CONFLICT upsert support."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+async def dispose_engines() -> None:
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
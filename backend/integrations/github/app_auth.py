@@ -1,15 +1,54 @@
+import asyncio
+import threading
 import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 
 import httpx
 import jwt
 
 from backend.core.config import GITHUB_APP_ID, GITHUB_PRIVATE_KEY
+from backend.integrations.github.http import github_client
+
+
+# Installation tokens live for an hour. Reuse one until it is within
+# TOKEN_EXPIRY_MARGIN seconds of expiring; once inside TOKEN_REFRESH_MARGIN,
+# keep serving it but mint its replacement in the background.
+TOKEN_EXPIRY_MARGIN = 5 * 60
+TOKEN_REFRESH_MARGIN = 10 * 60
+# The app JWT lives for 10 minutes; stop reusing it a minute before exp.
+JWT_EXPIRY_MARGIN = 60
+
+_jwt_lock = threading.Lock()
+_cached_jwt: Optional[Tuple[str, int]] = None  # (token, exp)
 
 
 def generate_jwt() -> str:
     """
     Create a short-lived JWT for GitHub App authentication.
     """
+    return _sign_jwt()[0]
+
+
+def get_app_jwt() -> str:
+    """
+    Return the app JWT, re-signing only when the cached one is about to expire.
+    """
+    global _cached_jwt
+    with _jwt_lock:
+        if _cached_jwt is None or time.time() >= _cached_jwt[1] - JWT_EXPIRY_MARGIN:
+            _cached_jwt = _sign_jwt()
+        return _cached_jwt[0]
+
+
+def _forget_app_jwt() -> None:
+    global _cached_jwt
+    with _jwt_lock:
+        _cached_jwt = None
+
+
+def _sign_jwt() -> Tuple[str, int]:
     if not GITHUB_APP_ID:
         raise ValueError("GITHUB_APP_ID is not configured")
 
@@ -29,32 +68,138 @@ def generate_jwt() -> str:
     payload = {"iat": iat, "exp": exp, "iss": app_id}
 
     try:
-        return jwt.encode(payload, GITHUB_PRIVATE_KEY, algorithm="RS256")
+        return jwt.encode(payload, GITHUB_PRIVATE_KEY, algorithm="RS256"), exp
     except Exception as e:
         raise ValueError(f"Failed to generate JWT: {str(e)}") from e
 
 
+@dataclass
+class _CachedToken:
+    token: str
+    expires_at: float  # unix timestamp
+
+
+class InstallationTokenCache:
+    """
+    Per-installation cache of access tokens.
+
+    Safe to share across threads; concurrent misses for the same installation
+    wait on a single mint instead of each calling GitHub. Async callers use
+    `aget`, which runs the (possibly blocking) lookup off the event loop.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[int, _CachedToken] = {}
+        self._locks: Dict[int, threading.Lock] = {}
+        self._refreshing: set[int] = set()
+        self._guard = threading.Lock()
+
+    def get(self, installation_id: int) -> str:
+        cached = self._fresh(installation_id)
+        if cached:
+            if cached.expires_at - time.time() <= TOKEN_REFRESH_MARGIN:
+                self._refresh_in_background(installation_id)
+            return cached.token
+
+        with self._lock_for(installation_id):
+            # Another thread may have minted it while we waited.
+            cached = self._fresh(installation_id)
+            if cached:
+                return cached.token
+            return self._mint(installation_id).token
+
+    async def aget(self, installation_id: int) -> str:
+        cached = self._fresh(installation_id)
+        if cached and cached.expires_at - time.time() > TOKEN_REFRESH_MARGIN:
+            return cached.token
+        return await asyncio.to_thread(self.get, installation_id)
+
+    def invalidate(self, installation_id: int) -> None:
+        with self._guard:
+            self._tokens.pop(installation_id, None)
+
+    def _fresh(self, installation_id: int) -> Optional[_CachedToken]:
+        cached = self._tokens.get(installation_id)
+        if cached and time.time() < cached.expires_at - TOKEN_EXPIRY_MARGIN:
+            return cached
+        return None
+
+    def _mint(self, installation_id: int) -> _CachedToken:
+        token, expires_at = _request_installation_token(installation_id)
+        cached = _CachedToken(token=token, expires_at=expires_at)
+        with self._guard:
+            self._tokens[installation_id] = cached
+        return cached
+
+    def _lock_for(self, installation_id: int) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(installation_id, threading.Lock())
+
+    def _refresh_in_background(self, installation_id: int) -> None:
+        with self._guard:
+            if installation_id in self._refreshing:
+                return
+            self._refreshing.add(installation_id)
+
+        def refresh():
+            try:
+                with self._lock_for(installation_id):
+                    cached = self._tokens.get(installation_id)
+                    if cached and cached.expires_at - time.time() > TOKEN_REFRESH_MARGIN:
+                        return
+                    self._mint(installation_id)
+            except Exception as e:  # noqa: BLE001
+                # The current token is still valid; the next call will retry.
+                print(f"Warning: Background token refresh failed: {e}")
+            finally:
+                with self._guard:
+                    self._refreshing.discard(installation_id)
+
+        threading.Thread(
+            target=refresh, name=f"token-refresh-{installation_id}", daemon=True
+        ).start()
+
+
+_token_cache = InstallationTokenCache()
+
+
 def get_installation_token(installation_id: int) -> str:
     """
-    Exchange the app JWT for an installation access token.
+    Return a cached installation access token, minting a new one when needed.
+    """
+    return _token_cache.get(installation_id)
+
+
+async def aget_installation_token(installation_id: int) -> str:
+    return await _token_cache.aget(installation_id)
+
+
+def invalidate_installation_token(installation_id: int) -> None:
+    _token_cache.invalidate(installation_id)
+
+
+def _request_installation_token(installation_id: int) -> Tuple[str, float]:
+    """
+    Exchange the app JWT for an installation access token and its expiry.
     """
     try:
-        jwt_token = generate_jwt()
+        jwt_token = get_app_jwt()
     except Exception as e:
         raise ValueError(f"Failed to generate JWT token: {str(e)}") from e
 
-    url = f"https://api.github.com/app/installations/{installation_id}/access_tokens"
+    url = f"/app/installations/{installation_id}/access_tokens"
     headers = {
         "Authorization": f"Bearer {jwt_token}",
         "Accept": "application/vnd.github+json",
     }
 
     try:
-        r = httpx.post(url, headers=headers)
+        r = github_client().post(url, headers=headers)
     except Exception as e:
         raise ValueError(f"Failed to connect to GitHub API: {str(e)}") from e
 
     if r.status_code == 401:
+        _forget_app_jwt()
         try:
             error_detail = r.json()
         except Exception:
@@ -82,4 +227,15 @@ def get_installation_token(installation_id: int) -> str:
     if "token" not in response_data:
         raise ValueError(f"GitHub API did not return a token. Response: {response_data}")
 
-    return response_data["token"]
+    return response_data["token"], _parse_expires_at(response_data.get("expires_at"))
+
+
+def _parse_expires_at(value: Optional[str]) -> float:
+    # e.g. "2016-07-11T22:14:10Z". If GitHub omits it, assume the documented
+    # one-hour lifetime.
+    if value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return time.time() + 60 * 60
@@ -1,33 +1,159 @@
+from typing import Callable, Dict, Iterator
+
 import httpx
 
-from backend.integrations.github.app_auth import get_installation_token
+from backend.integrations.github.app_auth import (
+    get_installation_token,
+    invalidate_installation_token,
+)
+from backend.integrations.github.conditional import conditional_get, installation_identity
+from backend.integrations.github.http import github_client
+from backend.integrations.github.rate_limit import (
+    HIGH,
+    MAX_RETRIES,
+    RateLimited,
+    get_rate_limiter,
+    send_with_rate_limit,
+)
+
+
+def _with_token(installation_id: int, send: Callable[[str], httpx.Response]) -> httpx.Response:
+    """
+    Call `send(token)` with the cached installation token. A 401 means GitHub
+    revoked it early (app reinstalled, permissions changed), so drop it and
+    retry once with a freshly minted one.
+    """
+    r = send(get_installation_token(installation_id))
+    if r.status_code == 401:
+        invalidate_installation_token(installation_id)
+        r = send(get_installation_token(installation_id))
+    return r
+
+
+def _auth(headers: Dict[str, str], token: str) -> Dict[str, str]:
+    return {**headers, "Authorization": f"token {token}"}
 
 
 def fetch_pr_diff(repo_full: str, pr_number: int, installation_id: int) -> str:
     """
     Fetch the unified diff for a PR using an installation token.
     """
+    url = f"/repos/{repo_full}/pulls/{pr_number}"
+    headers = {"Accept": "application/vnd.github.v3.diff"}
+    r = _with_token(
+        installation_id,
+        lambda token: send_with_rate_limit(
+            installation_id,
+            lambda: conditional_get(
+                url, _auth(headers, token), installation_identity(installation_id)
+            ),
+        ),
+    )
+    r.raise_for_status()
+    return r.text
+
+
+def fetch_pr_head_sha(repo_full: str, pr_number: int, installation_id: int) -> str:
+    """
+    The PR's current head commit. Revalidated with ETags, so an unchanged PR
+    costs a free 304.
+    """
+    url = f"/repos/{repo_full}/pulls/{pr_number}"
+    headers = {"Accept": "application/vnd.github+json"}
+    r = _with_token(
+        installation_id,
+        lambda token: send_with_rate_limit(
+            installation_id,
+            lambda: conditional_get(
+                url, _auth(headers, token), installation_identity(installation_id)
+            ),
+        ),
+    )
+    r.raise_for_status()
+    return r.json()["head"]["sha"]
+
+
+def iter_pr_diff_lines(repo_full: str, pr_number: int, installation_id: int) -> Iterator[str]:
+    """
+    Stream the unified diff for a PR line by line, without buffering the
+    whole response. Stop iterating early to drop the connection.
+    """
+    url = f"/repos/{repo_full}/pulls/{pr_number}"
+    headers = {"Accept": "application/vnd.github.v3.diff"}
     token = get_installation_token(installation_id)
-    url = f"https://api.github.com/repos/{repo_full}/pulls/{pr_number}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3.diff",
-    }
-    r = httpx.get(url, headers=headers)
+    reauthed = False
+    limiter = get_rate_limiter()
+    for _ in range(MAX_RETRIES):
+        limiter.acquire(installation_id)
+        with github_client().stream("GET", url, headers=_auth(headers, token)) as r:
+            retry_after = limiter.record(installation_id, r)
+            if retry_after is None:
+                if r.status_code == 401 and not reauthed:
+                    # Revoked early; retry once with a fresh token (see _with_token).
+                    invalidate_installation_token(installation_id)
+                    token = get_installation_token(installation_id)
+                    reauthed = True
+                    continue
+                r.raise_for_status()
+                yield from r.iter_lines()
+                return
+    raise RateLimited(installation_id, retry_after)
+
+
+def fetch_compare_diff(repo_full: str, base: str, head: str, installation_id: int) -> str:
+    """
+    Fetch the unified diff between two commits (e.g. two pushes to a PR).
+    """
+    url = f"/repos/{repo_full}/compare/{base}...{head}"
+    headers = {"Accept": "application/vnd.github.v3.diff"}
+    r = _with_token(
+        installation_id,
+        lambda token: send_with_rate_limit(
+            installation_id,
+            lambda: conditional_get(
+                url, _auth(headers, token), installation_identity(installation_id)
+            ),
+        ),
+    )
     r.raise_for_status()
     return r.text
 
 
+def fetch_compare_status(repo_full: str, base: str, head: str, installation_id: int) -> str:
+    """
+    How `head` relates to `base`: "ahead" when base is an ancestor of head,
+    "identical", "behind", or "diverged" (e.g. base was force-pushed away).
+    """
+    # One commit/file per page: only the status is needed.
+    url = f"/repos/{repo_full}/compare/{base}...{head}?per_page=1"
+    headers = {"Accept": "application/vnd.github+json"}
+    r = _with_token(
+        installation_id,
+        lambda token: send_with_rate_limit(
+            installation_id,
+            lambda: conditional_get(
+                url, _auth(headers, token), installation_identity(installation_id)
+            ),
+        ),
+    )
+    r.raise_for_status()
+    return r.json()["status"]
+
+
 def post_pr_comment(repo_full: str, pr_number: int, body: str, installation_id: int):
     """
-    Post a PR review comment using an installation token.
+    Post a PR review comment using an installation token. Goes ahead of
+    background fetches for the installation's rate limit budget.
     """
-    token = get_installation_token(installation_id)
-    url = f"https://api.github.com/repos/{repo_full}/pulls/{pr_number}/reviews"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json",
-    }
+    url = f"/repos/{repo_full}/pulls/{pr_number}/reviews"
+    headers = {"Accept": "application/vnd.github+json"}
     payload = {"body": body, "event": "COMMENT"}
-    r = httpx.post(url, json=payload, headers=headers)
+    r = _with_token(
+        installation_id,
+        lambda token: send_with_rate_limit(
+            installation_id,
+            lambda: github_client().post(url, json=payload, headers=_auth(headers, token)),
+            priority=HIGH,
+        ),
+    )
     r.raise_for_status()
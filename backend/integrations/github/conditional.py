@@ -0,0 +1,128 @@
+"""
+Conditional GETs against the GitHub API.
+
+The ETag / Last-Modified of each 200 response is remembered, together with
+its body, per URL, Accept header and caller identity (the installation). The next GET for the same thing sends If-None-Match /
+If-Modified-Since; GitHub answers 304 without a body and doesn't count it
+against the rate limit, and the stored body is served instead. The replayed
+response carries the 304's X-RateLimit-* headers and the NOT_MODIFIED
+extension, so the rate limiter doesn't count it as a spent request.
+
+The store is an in-process LRU bounded by total body size.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from backend.core.config import GITHUB_HTTP_CACHE_MAX_BYTES
+from backend.integrations.github.http import github_client
+
+# Response headers kept with a cached body and replayed on a 304.
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "link")
+# Set in a replayed response's `extensions`.
+NOT_MODIFIED = "github_not_modified"
+
+
+@dataclass
+class _Entry:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content: bytes
+    headers: Dict[str, str]
+
+
+class ConditionalCache:
+    def __init__(self, max_bytes: int = GITHUB_HTTP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], _Entry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url: str, headers: Dict[str, str], identity: str, **kwargs) -> httpx.Response:
+        """GET `url` on the shared GitHub client, revalidated against the store."""
+        key = (url, headers.get("Accept", ""), identity)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+
+        send = dict(headers)
+        if entry and entry.etag:
+            send["If-None-Match"] = entry.etag
+        elif entry and entry.last_modified:
+            send["If-Modified-Since"] = entry.last_modified
+
+        r = github_client().get(url, headers=send, **kwargs)
+        if r.status_code == 304 and entry:
+            with self._lock:
+                self.hits += 1
+            headers = {
+                **entry.headers,
+                **{h: v for h, v in r.headers.items() if h.startswith("x-ratelimit-")},
+            }
+            return httpx.Response(
+                200,
+                content=entry.content,
+                headers=headers,
+                request=r.request,
+                extensions={NOT_MODIFIED: True},
+            )
+
+        with self._lock:
+            self.misses += 1
+        if r.status_code == 200:
+            self._store(key, r)
+        return r
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key: Tuple[str, str, str], r: httpx.Response) -> None:
+        etag, last_modified = r.headers.get("etag"), r.headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        content = r.content
+        if len(content) > self.max_bytes // 4:
+            return  # one huge body would flush everything else
+        entry = _Entry(
+            etag=etag,
+            last_modified=last_modified,
+            content=content,
+            headers={h: r.headers[h] for h in _KEPT_HEADERS if h in r.headers},
+        )
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._size -= len(old.content)
+            self._entries[key] = entry
+            self._size += len(content)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.content)
+
+
+def installation_identity(installation_id: int) -> str:
+    return f"installation:{installation_id}"
+
+
+_conditional_cache = ConditionalCache()
+
+
+def get_conditional_cache() -> ConditionalCache:
+    return _conditional_cache
+
+
+def conditional_get(url: str, headers: Dict[str, str], identity: str, **kwargs) -> httpx.Response:
+    return _conditional_cache.get(url, headers, identity, **kwargs)
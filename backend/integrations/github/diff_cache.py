@@ -0,0 +1,219 @@
+"""
+PR diffs stored per (repo, PR number, head SHA) in the `pr_diffs` table, so
+the diff endpoint, reruns and webhook-triggered reviews of an unchanged head
+share one download. Diffs are zlib-compressed; once the table holds more
+than DIFF_CACHE_MAX_BYTES, the least recently read diffs are evicted.
+
+GitHub serves a PR's diff for whatever its head is now, which can be newer
+than the head SHA we have recorded (debounce window, a push the webhook
+hasn't delivered yet). A fetched diff is only stored if the PR's head, read
+after the diff, is still the SHA it would be stored under.
+
+The table is shared by the API and every worker. A broken cache never breaks
+a review: errors fall back to fetching from GitHub.
+"""
+
+import codecs
+import threading
+import zlib
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import delete, func, select, tuple_
+
+from backend import models
+from backend.core.config import DIFF_CACHE_ENABLED, DIFF_CACHE_MAX_BYTES, DIFF_MAX_TOTAL_BYTES
+from backend.core.database import SessionLocal
+from backend.integrations.github.client import fetch_pr_diff, fetch_pr_head_sha, iter_pr_diff_lines
+
+_READ_CHUNK = 64 * 1024
+# Re-read the table's total size every this many puts, to pick up other
+# processes' writes.
+RESYNC_EVERY = 50
+
+
+class DiffCache:
+    def __init__(
+        self,
+        max_bytes: int = DIFF_CACHE_MAX_BYTES,
+        max_entry_bytes: int = DIFF_MAX_TOTAL_BYTES,
+        enabled: bool = DIFF_CACHE_ENABLED,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.enabled = enabled
+        # Running estimate of the table's size; None until first read.
+        self._total = None
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def get(self, repo_full: str, pr_number: int, head_sha: str) -> Optional[bytes]:
+        """The compressed diff, or None."""
+        db = SessionLocal()
+        try:
+            row = db.get(models.PrDiff, (repo_full, pr_number, head_sha))
+            if row is None:
+                return None
+            row.accessed_at = datetime.utcnow()
+            db.commit()
+            return row.data
+        except Exception as e:  # noqa: BLE001
+            db.rollback()
+            print(f"Warning: Diff cache read failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def put(self, repo_full: str, pr_number: int, head_sha: str, data: bytes, raw_size: int) -> None:
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            db.merge(
+                models.PrDiff(
+                    repo_full_name=repo_full,
+                    pr_number=pr_number,
+                    head_sha=head_sha,
+                    data=data,
+                    size=len(data),
+                    raw_size=raw_size,
+                    created_at=now,
+                    accessed_at=now,
+                )
+            )
+            db.commit()
+            if self._over_budget(db, len(data)):
+                self._evict(db)
+        except Exception as e:  # noqa: BLE001
+            db.rollback()
+            print(f"Warning: Diff cache write failed: {e}")
+        finally:
+            db.close()
+
+    def _over_budget(self, db, added: int) -> bool:
+        with self._lock:
+            self._puts += 1
+            if self._total is None or self._puts % RESYNC_EVERY == 0:
+                self._total = None
+            else:
+                self._total += added
+        if self._total is None:
+            total = db.query(func.coalesce(func.sum(models.PrDiff.size), 0)).scalar()
+            with self._lock:
+                self._total = total
+        return self._total > self.max_bytes
+
+    def _evict(self, db) -> None:
+        """Delete the least recently read diffs past max_bytes, in one statement."""
+        key = (models.PrDiff.repo_full_name, models.PrDiff.pr_number, models.PrDiff.head_sha)
+        running = (
+            select(
+                *key,
+                func.sum(models.PrDiff.size)
+                .over(order_by=(models.PrDiff.accessed_at.desc(), *key))
+                .label("running"),
+            )
+        ).subquery()
+        db.execute(
+            delete(models.PrDiff).where(
+                tuple_(*key).in_(
+                    select(running.c.repo_full_name, running.c.pr_number, running.c.head_sha).where(
+                        running.c.running > self.max_bytes
+                    )
+                )
+            )
+        )
+        db.commit()
+        with self._lock:
+            self._total = None
+
+
+_diff_cache = DiffCache()
+
+
+def get_diff_cache() -> DiffCache:
+    return _diff_cache
+
+
+def iter_cached_pr_diff_lines(
+    repo_full: str, pr_number: int, head_sha: Optional[str], installation_id: int
+) -> Iterator[str]:
+    """
+    iter_pr_diff_lines through the cache. On a miss the diff is streamed from
+    GitHub and stored once it has been read to the end; a consumer that stops
+    early (e.g. the parser's size cap) leaves nothing behind.
+    """
+    cache = get_diff_cache()
+    if not cache.enabled or not head_sha:
+        yield from iter_pr_diff_lines(repo_full, pr_number, installation_id)
+        return
+
+    data = cache.get(repo_full, pr_number, head_sha)
+    if data is not None:
+        yield from _iter_lines(data)
+        return
+
+    compressor = zlib.compressobj()
+    parts = []
+    raw_size = 0
+    for line in iter_pr_diff_lines(repo_full, pr_number, installation_id):
+        if compressor is not None:
+            piece = (line + "\n").encode("utf-8", "surrogateescape")
+            raw_size += len(piece)
+            if raw_size > cache.max_entry_bytes:
+                compressor, parts = None, []
+            else:
+                parts.append(compressor.compress(piece))
+        yield line
+    if compressor is not None and _head_is(repo_full, pr_number, head_sha, installation_id):
+        parts.append(compressor.flush())
+        cache.put(repo_full, pr_number, head_sha, b"".join(parts), raw_size)
+
+
+def get_cached_pr_diff(
+    repo_full: str, pr_number: int, head_sha: Optional[str], installation_id: int
+) -> str:
+    """fetch_pr_diff through the cache."""
+    cache = get_diff_cache()
+    if not cache.enabled or not head_sha:
+        return fetch_pr_diff(repo_full, pr_number, installation_id)
+
+    data = cache.get(repo_full, pr_number, head_sha)
+    if data is not None:
+        return zlib.decompress(data).decode("utf-8", "replace")
+
+    diff = fetch_pr_diff(repo_full, pr_number, installation_id)
+    raw = diff.encode("utf-8", "surrogateescape")
+    if len(raw) <= cache.max_entry_bytes and _head_is(repo_full, pr_number, head_sha, installation_id):
+        cache.put(repo_full, pr_number, head_sha, zlib.compress(raw), len(raw))
+    return diff
+
+
+def _head_is(repo_full: str, pr_number: int, head_sha: str, installation_id: int) -> bool:
+    """
+    Whether the PR's head is still `head_sha`. Checked after the diff was read:
+    heads only move forward, so a match means the diff was for `head_sha`.
+    """
+    try:
+        current = fetch_pr_head_sha(repo_full, pr_number, installation_id)
+    except Exception as e:  # noqa: BLE001
+        print(f"Warning: Could not confirm PR head, not caching its diff: {e}")
+        return False
+    if current != head_sha:
+        print(f"PR {repo_full}#{pr_number} moved to {current[:7]}; not caching its diff")
+        return False
+    return True
+
+
+def _iter_lines(data: bytes) -> Iterator[str]:
+    # Decompress and decode incrementally, so a hit costs no more memory
+    # than streaming the diff from GitHub.
+    decompressor = zlib.decompressobj()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    for i in range(0, len(data), _READ_CHUNK):
+        pending += decoder.decode(decompressor.decompress(data[i : i + _READ_CHUNK]))
+        *lines, pending = pending.split("\n")
+        yield from lines
+    pending += decoder.decode(decompressor.flush(), final=True)
+    if pending:
+        yield pending
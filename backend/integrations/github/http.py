@@ -0,0 +1,111 @@
+"""
+The one HTTP client every GitHub call in the process goes through.
+
+Pooled keep-alive connections (HTTP/2 when the h2 package is installed), the
+same timeouts for every call, and GITHUB_API_URL as the base URL, so API
+paths are passed relative ("/repos/..."). Absolute URLs (the OAuth token
+endpoint on GITHUB_WEB_URL) still work.
+
+The client is shared by every user's OAuth calls, so it refuses cookies:
+a Set-Cookie from one user's login must never ride along on the next
+user's request.
+
+The API (lifespan) and the review worker (main) open it at startup and
+close it on shutdown; anything else gets it created on first use.
+"""
+
+import importlib.util
+import threading
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Optional
+
+import httpx
+
+from backend.core.config import (
+    GITHUB_API_URL,
+    GITHUB_CONNECT_TIMEOUT,
+    GITHUB_HTTP2,
+    GITHUB_MAX_CONNECTIONS,
+    GITHUB_READ_TIMEOUT,
+)
+
+USER_AGENT = "PRAuditor"
+
+
+class GitHubHTTP:
+    def __init__(
+        self,
+        base_url: str = GITHUB_API_URL,
+        http2: bool = GITHUB_HTTP2,
+        connect_timeout: float = GITHUB_CONNECT_TIMEOUT,
+        read_timeout: float = GITHUB_READ_TIMEOUT,
+        max_connections: int = GITHUB_MAX_CONNECTIONS,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            print("Warning: GITHUB_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+            http2 = False
+        self.base_url = base_url
+        self.http2 = http2
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        """Create the client now instead of on the first call."""
+        self.client
+
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(**self._options())
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        # Single event loop per process, so no lock is needed here.
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(**self._options())
+        return self._async_client
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            client, self._async_client = self._async_client, None
+            await client.aclose()
+
+    def _options(self) -> dict:
+        return {
+            "base_url": self.base_url,
+            "http2": self.http2,
+            "timeout": self._timeout,
+            "limits": self._limits,
+            "headers": {"User-Agent": USER_AGENT},
+            "cookies": _no_cookies(),
+        }
+
+
+def _no_cookies() -> CookieJar:
+    # No domain is allowed, so nothing is ever stored or sent.
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+_github_http = GitHubHTTP()
+
+
+def get_github_http() -> GitHubHTTP:
+    return _github_http
+
+
+def github_client() -> httpx.Client:
+    return _github_http.client
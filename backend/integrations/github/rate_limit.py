@@ -0,0 +1,261 @@
+"""
+Per-installation GitHub rate limiting.
+
+Each installation has a token bucket whose level is the last
+X-RateLimit-Remaining GitHub reported, refilled to X-RateLimit-Limit at
+X-RateLimit-Reset. Every call takes a token first. Background fetches
+(priority LOW) leave the last GITHUB_RATE_LIMIT_RESERVE tokens to comment
+posting (priority HIGH), so a burst of reviews can't starve the comments.
+
+Secondary rate limits (403/429 with Retry-After, or an exhausted budget)
+pause the installation. Callers then wait, up to GITHUB_RATE_LIMIT_MAX_WAIT
+seconds, and retry. Longer waits raise RateLimited, which the review worker
+turns into a delayed requeue instead of a failed attempt.
+
+Buckets are per process and resynchronized from every response's headers.
+A 304 from a conditional GET doesn't count against the limit, so its token
+is handed back. Each process also writes its view to the github_rate_limits
+table at most every GITHUB_RATE_LIMIT_SNAPSHOT_INTERVAL seconds (at once on a
+rate-limit rejection), so the API can report the budget the workers see.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import httpx
+from sqlalchemy.orm import Session
+
+from backend import models
+from backend.core.config import (
+    GITHUB_RATE_LIMIT_MAX_WAIT,
+    GITHUB_RATE_LIMIT_RESERVE,
+    GITHUB_RATE_LIMIT_SNAPSHOT_INTERVAL,
+)
+from backend.core.database import SessionLocal, dialect_insert
+from backend.integrations.github.conditional import NOT_MODIFIED
+
+HIGH = 0
+LOW = 1
+
+# GitHub's documented default when a secondary limit gives no Retry-After.
+SECONDARY_LIMIT_WAIT = 60
+# Installation tokens start with 5000 requests/hour.
+DEFAULT_LIMIT = 5000
+MAX_RETRIES = 3
+
+
+class RateLimited(Exception):
+    """GitHub won't take more calls for this installation for `retry_after` seconds."""
+
+    def __init__(self, installation_id: int, retry_after: float):
+        super().__init__(
+            f"GitHub rate limit for installation {installation_id}; retry in {retry_after:.0f}s"
+        )
+        self.installation_id = installation_id
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Bucket:
+    limit: int = DEFAULT_LIMIT
+    remaining: int = DEFAULT_LIMIT
+    reset_at: float = 0.0       # epoch seconds; 0 = unknown
+    paused_until: float = 0.0   # secondary limit / Retry-After
+    high_waiting: int = 0
+    published_at: float = 0.0   # last snapshot written to the database
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        reserve: int = GITHUB_RATE_LIMIT_RESERVE,
+        max_wait: float = GITHUB_RATE_LIMIT_MAX_WAIT,
+        clock: Callable[[], float] = time.time,
+        snapshot_interval: Optional[float] = None,
+    ):
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.clock = clock
+        # None: keep the buckets in memory only.
+        self.snapshot_interval = snapshot_interval
+        self._buckets: Dict[int, _Bucket] = {}
+        self._cond = threading.Condition()
+
+    def acquire(self, installation_id: int, priority: int = LOW) -> None:
+        """Take a token, waiting up to `max_wait`; raises RateLimited past that."""
+        with self._cond:
+            bucket = self._buckets.setdefault(installation_id, _Bucket())
+            if priority == HIGH:
+                bucket.high_waiting += 1
+            try:
+                while True:
+                    now = self.clock()
+                    if bucket.reset_at and now >= bucket.reset_at:
+                        bucket.remaining, bucket.reset_at = bucket.limit, 0.0
+                    wait = self._wait_for(bucket, priority, now)
+                    if wait <= 0:
+                        bucket.remaining -= 1
+                        return
+                    if wait > self.max_wait:
+                        raise RateLimited(installation_id, wait)
+                    # Woken early by record() when new headers arrive.
+                    self._cond.wait(timeout=min(wait, 5))
+            finally:
+                if priority == HIGH:
+                    bucket.high_waiting -= 1
+
+    def record(self, installation_id: int, response: httpx.Response) -> Optional[float]:
+        """
+        Update the bucket from a response's headers. Returns how long to wait
+        before retrying if the response was a rate-limit rejection, else None.
+        """
+        headers = response.headers
+        now = self.clock()
+        with self._cond:
+            bucket = self._buckets.setdefault(installation_id, _Bucket())
+            try:
+                if "x-ratelimit-limit" in headers:
+                    bucket.limit = int(headers["x-ratelimit-limit"])
+                if "x-ratelimit-remaining" in headers:
+                    bucket.remaining = int(headers["x-ratelimit-remaining"])
+                elif response.extensions.get(NOT_MODIFIED):
+                    # Free for GitHub; return the token acquire() took.
+                    bucket.remaining = min(bucket.remaining + 1, bucket.limit)
+                if "x-ratelimit-reset" in headers:
+                    bucket.reset_at = float(headers["x-ratelimit-reset"])
+            except ValueError:
+                pass
+
+            retry_after = None
+            if response.status_code in (403, 429) and _is_rate_limited(response, bucket):
+                retry_after = _retry_after(headers)
+                if retry_after is None:
+                    if bucket.remaining == 0 and bucket.reset_at > now:
+                        retry_after = bucket.reset_at - now
+                    else:
+                        retry_after = SECONDARY_LIMIT_WAIT
+                bucket.paused_until = max(bucket.paused_until, now + retry_after)
+            self._cond.notify_all()
+
+            snapshot = None
+            if self.snapshot_interval is not None and (
+                retry_after is not None or now - bucket.published_at >= self.snapshot_interval
+            ):
+                bucket.published_at = now
+                snapshot = (bucket.limit, bucket.remaining, bucket.reset_at, bucket.paused_until)
+
+        if snapshot:
+            _save_snapshot(installation_id, *snapshot)
+        return retry_after
+
+    def _wait_for(self, bucket: _Bucket, priority: int, now: float) -> float:
+        if bucket.paused_until > now:
+            return bucket.paused_until - now
+        floor = 0 if priority == HIGH else self.reserve
+        if bucket.remaining > floor:
+            # A comment waiting for the same installation goes first.
+            return 0.05 if priority == LOW and bucket.high_waiting else 0.0
+        return (bucket.reset_at - now) if bucket.reset_at > now else SECONDARY_LIMIT_WAIT
+
+
+def _is_rate_limited(response: httpx.Response, bucket: _Bucket) -> bool:
+    if response.status_code == 429 or "retry-after" in response.headers:
+        return True
+    if bucket.remaining == 0:
+        return True
+    try:
+        return "rate limit" in response.text.lower()
+    except httpx.ResponseNotRead:
+        return False
+
+
+def _retry_after(headers) -> Optional[float]:
+    try:
+        return max(float(headers["retry-after"]), 0.0)
+    except (KeyError, ValueError):
+        return None
+
+
+def _save_snapshot(
+    installation_id: int, limit: int, remaining: int, reset_at: float, paused_until: float
+) -> None:
+    values = {
+        "limit": limit,
+        "remaining": max(remaining, 0),
+        "reset_at": _to_datetime(reset_at),
+        "paused_until": _to_datetime(paused_until),
+        "updated_at": datetime.utcnow(),
+    }
+    db = SessionLocal()
+    try:
+        stmt = dialect_insert(db)(models.GitHubRateLimit).values(
+            installation_id=installation_id, **values
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[models.GitHubRateLimit.installation_id], set_=values
+            )
+        )
+        db.commit()
+    except Exception as e:  # noqa: BLE001
+        # Monitoring only; never fail the GitHub call over it.
+        db.rollback()
+        print(f"Warning: Could not save GitHub rate limit snapshot: {e}")
+    finally:
+        db.close()
+
+
+def _to_datetime(epoch: float) -> Optional[datetime]:
+    return datetime.utcfromtimestamp(epoch) if epoch else None
+
+
+def rate_limit_snapshots(db: Session) -> Dict[str, Dict[str, object]]:
+    """
+    Each installation's last published budget, as of now: a budget whose
+    reset time has passed is reported refilled.
+    """
+    now = datetime.utcnow()
+    out = {}
+    for row in db.query(models.GitHubRateLimit).order_by(models.GitHubRateLimit.installation_id):
+        reset = row.reset_at is not None and row.reset_at <= now
+        out[str(row.installation_id)] = {
+            "limit": row.limit,
+            "remaining": row.limit if reset else row.remaining,
+            "reset_in": None if reset or row.reset_at is None else (row.reset_at - now).total_seconds(),
+            "paused_for": max((row.paused_until - now).total_seconds(), 0.0) if row.paused_until else 0.0,
+            "updated_at": row.updated_at,
+        }
+    return out
+
+
+_rate_limiter = RateLimiter(snapshot_interval=GITHUB_RATE_LIMIT_SNAPSHOT_INTERVAL)
+
+
+def get_rate_limiter() -> RateLimiter:
+    return _rate_limiter
+
+
+def send_with_rate_limit(
+    installation_id: int,
+    send: Callable[[], httpx.Response],
+    priority: int = LOW,
+) -> httpx.Response:
+    """
+    Call `send()` under the installation's budget, retrying rate-limit
+    rejections after the wait GitHub asks for.
+    """
+    limiter = get_rate_limiter()
+    for _ in range(MAX_RETRIES):
+        limiter.acquire(installation_id, priority)
+        r = send()
+        retry_after = limiter.record(installation_id, r)
+        if retry_after is None:
+            return r
+        print(
+            f"Warning: GitHub rate limited installation {installation_id}; "
+            f"waiting {retry_after:.0f}s"
+        )
+    raise RateLimited(installation_id, retry_after)
@@ -1,6 +1,14 @@
 import hmac
 import hashlib
-from typing import Optional
+import json
+import re
+from typing import Any, Optional
+from urllib.parse import parse_qs, unquote_to_bytes
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is ~2-3x slower on large payloads
+    orjson = None
 
 from backend.core.config import GITHUB_WEBHOOK_SECRET
 
@@ -26,3 +34,34 @@ def check_signature(signature: Optional[str], payload: bytes) -> bool:
     ).hexdigest()
 
     return hmac.compare_digest(sent_sig, expected)
+
+
+# GitHub serializes "action" as the first key of event payloads.
+_LEADING_ACTION = re.compile(rb'\A\s*\{\s*"action"\s*:\s*"([^"\\]*)"')
+_PEEK_BYTES = 128
+
+
+def peek_action(body: bytes, form_encoded: bool = False) -> Optional[str]:
+    """
+    The payload's action from its first few bytes, without parsing the rest;
+    None when it isn't the leading key (callers then parse in full).
+    """
+    head = body[: _PEEK_BYTES * 3 if form_encoded else _PEEK_BYTES]
+    if form_encoded:
+        if not head.startswith(b"payload="):
+            return None
+        head = unquote_to_bytes(head[len(b"payload="):].replace(b"+", b" "))
+    match = _LEADING_ACTION.match(head)
+    return match.group(1).decode() if match else None
+
+
+def load_payload(body: bytes, form_encoded: bool = False) -> Any:
+    """Decode a webhook body (JSON, or JSON in a form's `payload` field)."""
+    if form_encoded:
+        payload = parse_qs(body.decode()).get("payload")
+        if not payload:
+            raise ValueError("Missing payload")
+        body = payload[0].encode()
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
@@ -1,24 +1,225 @@
-import requests
-from typing import List, Dict
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
 
-from backend.core.config import GPT_API_URL, GPT_API_KEY, GPT_MODEL
+import httpx
 
+from backend.core.config import (
+    GPT_API_KEY,
+    GPT_API_URL,
+    GPT_CONNECT_TIMEOUT,
+    GPT_MAX_CONNECTIONS,
+    GPT_MAX_RETRIES,
+    GPT_MODEL,
+    GPT_READ_TIMEOUT,
+)
 
-def chat(messages: List[Dict], max_tokens: int = 600) -> str:
-    if not GPT_API_URL:
-        raise RuntimeError("GPT_API_URL is not configured")
+# Statuses worth another attempt: rate limiting and transient upstream errors.
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
 
-    payload = {
-        "model": GPT_MODEL,
-        "messages": messages,
-        "max_tokens": max_tokens,
-    }
 
-    headers: Dict[str, str] = {}
-    if GPT_API_KEY:
-        headers["Authorization"] = f"Bearer {GPT_API_KEY}"
+class LLMClient:
+    """
+    OpenAI-compatible chat client with pooled keep-alive connections.
 
-    r = requests.post(GPT_API_URL, json=payload, headers=headers, timeout=60)
+    One instance is meant to be shared by every agent in the process; the
+    underlying httpx clients are created lazily on first use.
+    """
+
+    def __init__(
+        self,
+        api_url: Optional[str] = GPT_API_URL,
+        api_key: Optional[str] = GPT_API_KEY,
+        model: str = GPT_MODEL,
+        connect_timeout: float = GPT_CONNECT_TIMEOUT,
+        read_timeout: float = GPT_READ_TIMEOUT,
+        max_retries: int = GPT_MAX_RETRIES,
+        max_connections: int = GPT_MAX_CONNECTIONS,
+    ):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.model = model
+        self.max_retries = max_retries
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    def chat(
+        self, messages: List[Dict], max_tokens: int = 600, deadline: Optional[float] = None
+    ) -> str:
+        """
+        `deadline` (a time.monotonic() value) bounds the whole call, retries
+        included: each request's timeouts are cut to the time left, and
+        TimeoutError is raised once it has passed.
+        """
+        payload = self._payload(messages, max_tokens)
+        client = self._sync_client()
+
+        attempt = 0
+        while True:
+            try:
+                r = client.post(self.api_url, json=payload, timeout=self._timeout_until(deadline))
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                _sleep_until(_retry_delay(attempt), deadline)
+            else:
+                if r.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return _content(r)
+                _sleep_until(_retry_delay(attempt, r), deadline)
+            attempt += 1
+
+    async def achat(
+        self, messages: List[Dict], max_tokens: int = 600, deadline: Optional[float] = None
+    ) -> str:
+        """Async `chat`, with the same `deadline` semantics."""
+        payload = self._payload(messages, max_tokens)
+        client = self._get_async_client()
+
+        attempt = 0
+        while True:
+            try:
+                r = await client.post(
+                    self.api_url, json=payload, timeout=self._timeout_until(deadline)
+                )
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                await _asleep_until(_retry_delay(attempt), deadline)
+            else:
+                if r.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return _content(r)
+                await _asleep_until(_retry_delay(attempt, r), deadline)
+            attempt += 1
+
+    def open(self) -> None:
+        """Create the sync client now instead of on the first call."""
+        self._sync_client()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            client, self._async_client = self._async_client, None
+            await client.aclose()
+
+    def _payload(self, messages: List[Dict], max_tokens: int) -> Dict:
+        if not self.api_url:
+            raise RuntimeError("GPT_API_URL is not configured")
+        return {"model": self.model, "messages": messages, "max_tokens": max_tokens}
+
+    def _timeout_until(self, deadline: Optional[float]) -> httpx.Timeout:
+        if deadline is None:
+            return self._timeout
+        left = _time_left(deadline)
+        return httpx.Timeout(
+            min(self._timeout.read, left),
+            connect=min(self._timeout.connect, left),
+        )
+
+    def _headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    headers=self._headers(), timeout=self._timeout, limits=self._limits
+                )
+            return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # Single event loop per process, so no lock is needed here.
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                headers=self._headers(), timeout=self._timeout, limits=self._limits
+            )
+        return self._async_client
+
+
+def _content(r: httpx.Response) -> str:
     r.raise_for_status()
     data = r.json()
     return data["choices"][0]["message"]["content"]
+
+
+def _time_left(deadline: float) -> float:
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise TimeoutError("LLM call ran past its deadline")
+    return left
+
+
+def _sleep_until(delay: float, deadline: Optional[float]) -> None:
+    """Back off before a retry, unless the retry couldn't start before the deadline."""
+    _check_retry_fits(delay, deadline)
+    time.sleep(delay)
+
+
+async def _asleep_until(delay: float, deadline: Optional[float]) -> None:
+    _check_retry_fits(delay, deadline)
+    await asyncio.sleep(delay)
+
+
+def _check_retry_fits(delay: float, deadline: Optional[float]) -> None:
+    if deadline is not None and delay >= _time_left(deadline):
+        raise TimeoutError("LLM call ran past its deadline")
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    Seconds to wait before the next attempt: the server's Retry-After if it
+    sent one, otherwise exponential backoff with full jitter.
+    """
+    if response is not None:
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_default_client = LLMClient()
+
+
+def get_llm_client() -> LLMClient:
+    return _default_client
+
+
+def chat(messages: List[Dict], max_tokens: int = 600, deadline: Optional[float] = None) -> str:
+    return _default_client.chat(messages, max_tokens=max_tokens, deadline=deadline)
+
+
+async def achat(
+    messages: List[Dict], max_tokens: int = 600, deadline: Optional[float] = None
+) -> str:
+    return await _default_client.achat(messages, max_tokens=max_tokens, deadline=deadline)
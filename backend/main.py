@@ -1,4 +1,5 @@
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -8,10 +9,27 @@ if __package__ in {None, ""}:
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from backend.api import auth, dashboard, repos, pull_requests, webhook
+from backend.api.pagination import NEXT_CURSOR_HEADER
 from backend.core.config import CORS_ORIGINS
-from backend.core.database import init_db
+from backend.core.database import dispose_engines, init_db
+from backend.integrations.github.http import get_github_http
+from backend.integrations.llm.client import get_llm_client
 
-app = FastAPI(title="PRAuditor API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    github_http, llm = get_github_http(), get_llm_client()
+    github_http.open()
+    llm.open()
+    yield
+    github_http.close()
+    await github_http.aclose()
+    llm.close()
+    await llm.aclose()
+    await dispose_engines()
+
+
+app = FastAPI(title="PRAuditor API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +37,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(auth.router)
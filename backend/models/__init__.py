@@ -1,6 +1,25 @@
+from backend.models.agent_result import AgentResult
+from backend.models.cache_version import CacheVersion
+from backend.models.github_rate_limit import GitHubRateLimit
 from backend.models.repository import Repository
 from backend.models.pull_request import PullRequest
+from backend.models.pr_diff import PrDiff
 from backend.models.review_issue import ReviewIssue
+from backend.models.review_job import ReviewJob
+from backend.models.severity_rollup import SeverityRollup
 from backend.models.user import User
+from backend.models.webhook_delivery import WebhookDelivery
 
-__all__ = ["Repository", "PullRequest", "ReviewIssue", "User"]
+__all__ = [
+    "AgentResult",
+    "CacheVersion",
+    "GitHubRateLimit",
+    "Repository",
+    "PullRequest",
+    "PrDiff",
+    "ReviewIssue",
+    "ReviewJob",
+    "SeverityRollup",
+    "User",
+    "WebhookDelivery",
+]
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import Column, String, Text, DateTime
+
+from backend.core.database import Base
+
+
+class AgentResult(Base):
+    """Cached agent findings for one file patch (see backend/review/cache.py)."""
+
+    __tablename__ = "agent_results"
+
+    # sha256 of (patch, agent kind, prompt version, model)
+    key = Column(String(64), primary_key=True)
+    kind = Column(String)
+    issues = Column(Text)  # JSON list of Issue dicts
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String
+
+from backend.core.database import Base
+
+
+class CacheVersion(Base):
+    """Response cache version token per scope (see backend/services/response_cache.py)."""
+
+    __tablename__ = "cache_versions"
+
+    scope = Column(String, primary_key=True)  # "dashboard", "pr:<id>"
+    token = Column(String(16), nullable=False)
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer
+
+from backend.core.database import Base
+
+
+class GitHubRateLimit(Base):
+    """
+    Last known GitHub API budget per installation, written by whichever
+    process made the call (see backend/integrations/github/rate_limit.py).
+    """
+
+    __tablename__ = "github_rate_limits"
+
+    installation_id = Column(Integer, primary_key=True, autoincrement=False)
+    limit = Column(Integer, nullable=False)
+    remaining = Column(Integer, nullable=False)
+    reset_at = Column(DateTime, nullable=True)      # when `remaining` refills to `limit`
+    paused_until = Column(DateTime, nullable=True)  # secondary limit / Retry-After
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime
+
+from backend.core.database import Base
+
+
+class PrDiff(Base):
+    """Cached PR diff for one head commit (see backend/integrations/github/diff_cache.py)."""
+
+    __tablename__ = "pr_diffs"
+
+    repo_full_name = Column(String, primary_key=True)
+    pr_number = Column(Integer, primary_key=True)
+    head_sha = Column(String(40), primary_key=True)
+    data = Column(LargeBinary, nullable=False)  # zlib-compressed unified diff
+    size = Column(Integer, nullable=False)      # len(data), for the size bound
+    raw_size = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
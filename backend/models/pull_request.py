@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from backend.core.database import Base
@@ -13,7 +13,16 @@ class PullRequest(Base):
     title = Column(String)
     state = Column(String)  # open, closed, merged
     head_sha = Column(String)
+    last_reviewed_sha = Column(String, nullable=True)  # head the stored issues belong to
+    last_commented_sha = Column(String, nullable=True)  # head whose review comment was posted
     last_reviewed_at = Column(DateTime)
 
     repository = relationship("Repository", back_populates="pull_requests")
     issues = relationship("ReviewIssue", back_populates="pull_request")
+
+    __table_args__ = (
+        # Webhook upsert lookup; also stops duplicate rows for the same PR.
+        Index("uq_pull_requests_repo_id_pr_number", "repo_id", "pr_number", unique=True),
+        # Per-repo PR listings and last-review lookups.
+        Index("ix_pull_requests_repo_id_last_reviewed_at", "repo_id", "last_reviewed_at"),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from backend.core.database import Base
@@ -18,6 +18,16 @@ class ReviewIssue(Base):
     severity = Column(String)    # info / minor / major / critical
     message = Column(Text)
     suggestion = Column(Text)
+    # sha256 of file/line/kind/message, see backend/review/fingerprint.py
+    fingerprint = Column(String(64), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     pull_request = relationship("PullRequest", back_populates="issues")
+
+    __table_args__ = (
+        Index("ix_review_issues_pr_id_fingerprint", "pr_id", "fingerprint"),
+        # Per-PR severity counts (PR summary, dashboard, repo overview).
+        Index("ix_review_issues_pr_id_severity", "pr_id", "severity"),
+        # Keyset pagination of a PR's issues, newest first.
+        Index("ix_review_issues_pr_id_created_at_id", "pr_id", "created_at", "id"),
+    )
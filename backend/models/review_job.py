@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+
+from backend.core.database import Base
+
+
+class ReviewJob(Base):
+    __tablename__ = "review_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    pr_id = Column(Integer, ForeignKey("pull_requests.id"), nullable=False)
+    installation_id = Column(Integer, nullable=True)
+    head_sha = Column(String)
+
+    status = Column(String, nullable=False, default="queued")  # queued / running / done / dead / superseded
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # While running, the job is invisible to other workers until this passes.
+    locked_until = Column(DateTime, nullable=True)
+    locked_by = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (Index("ix_review_jobs_status_run_after", "status", "run_after"),)
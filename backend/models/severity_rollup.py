@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+
+from backend.core.database import Base
+
+
+class SeverityRollup(Base):
+    """
+    Issue count per repository and severity, kept in step with review_issues
+    by the review service (see backend/services/rollups.py).
+    """
+
+    __tablename__ = "severity_rollups"
+
+    repo_id = Column(Integer, ForeignKey("repositories.id"), primary_key=True)
+    severity = Column(String, primary_key=True)  # info / minor / major / critical
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import Column, String, DateTime
+
+from backend.core.database import Base
+
+
+class WebhookDelivery(Base):
+    """A handled X-GitHub-Delivery id (see backend/services/webhook_deliveries.py)."""
+
+    __tablename__ = "webhook_deliveries"
+
+    delivery_id = Column(String(64), primary_key=True)
+    event = Column(String)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -1,9 +1,17 @@
 import json
-from typing import List
+from typing import List, Optional
 
 from backend.review.types import DiffChunk, Issue
 from backend.integrations.llm.client import chat
 
+# Bump whenever a prompt below changes, so cached findings for the old prompt
+# (backend/review/cache.py) stop being reused.
+PROMPT_VERSION = "1"
+
+
+class AgentOutputError(ValueError):
+    """The model's reply held no JSON array of issues."""
+
 
 def _chunks_to_text(chunks: List[DiffChunk]) -> str:
     parts: list[str] = []
@@ -12,9 +20,19 @@ def _chunks_to_text(chunks: List[DiffChunk]) -> str:
     return "\n\n".join(parts)
 
 
-def _run_agent(chunks: List[DiffChunk], role_instructions: str, kind: str) -> List[Issue]:
+def _run_agent(
+    chunks: List[DiffChunk],
+    role_instructions: str,
+    kind: str,
+    deadline: Optional[float] = None,
+) -> List[Issue]:
     """
-    Shared helper for all agents.
+    Shared helper for all agents. A reply that isn't a JSON array raises
+    AgentOutputError, like a failed LLM call, so the pipeline counts the
+    batch as failed instead of caching "no issues" for its files.
+
+    `deadline` (time.monotonic()) is passed to the LLM call, which gives up
+    with TimeoutError once it has passed.
     """
     diff_text = _chunks_to_text(chunks)
 
@@ -29,7 +47,7 @@ def _run_agent(chunks: List[DiffChunk], role_instructions: str, kind: str) -> Li
         f"{diff_text}"
     )
 
-    raw = chat([{"role": "user", "content": prompt}], max_tokens=900)
+    raw = chat([{"role": "user", "content": prompt}], max_tokens=900, deadline=deadline)
 
     try:
         data = json.loads(raw)
@@ -41,12 +59,12 @@ def _run_agent(chunks: List[DiffChunk], role_instructions: str, kind: str) -> Li
             try:
                 data = json.loads(raw[start : end + 1])
             except Exception:
-                return []
+                raise AgentOutputError(f"{kind} agent returned unparseable output")
         else:
-            return []
+            raise AgentOutputError(f"{kind} agent returned no JSON array")
 
     if not isinstance(data, list):
-        return []
+        raise AgentOutputError(f"{kind} agent returned {type(data).__name__}, not a list")
 
     issues: List[Issue] = []
     for item in data:
@@ -66,41 +84,41 @@ def _run_agent(chunks: List[DiffChunk], role_instructions: str, kind: str) -> Li
     return issues
 
 
-def logic_agent(chunks: List[DiffChunk]) -> List[Issue]:
+def logic_agent(chunks: List[DiffChunk], deadline: Optional[float] = None) -> List[Issue]:
     instructions = (
         "You review code changes for LOGIC and CORRECTNESS problems. "
         "Look for bugs, incorrect conditions, wrong edge-case handling, "
         "bad state transitions, missing null/None checks, and regressions."
         "Focus only on changed code."
     )
-    return _run_agent(chunks, instructions, kind="logic")
+    return _run_agent(chunks, instructions, kind="logic", deadline=deadline)
 
 
-def readability_agent(chunks: List[DiffChunk]) -> List[Issue]:
+def readability_agent(chunks: List[DiffChunk], deadline: Optional[float] = None) -> List[Issue]:
     instructions = (
         "You review code changes for READABILITY and MAINTAINABILITY. "
         "Look for unclear names, deeply nested code, missing comments around complex logic, "
         "and inconsistent style that makes the code hard to read."
         "Focus only on changed code."
     )
-    return _run_agent(chunks, instructions, kind="readability")
+    return _run_agent(chunks, instructions, kind="readability", deadline=deadline)
 
 
-def performance_agent(chunks: List[DiffChunk]) -> List[Issue]:
+def performance_agent(chunks: List[DiffChunk], deadline: Optional[float] = None) -> List[Issue]:
     instructions = (
         "You review code changes for PERFORMANCE issues. "
         "Look for obvious inefficiencies like unnecessary loops, repeated expensive calls, "
         "N+1 queries, or operations inside tight loops that could be moved out."
         "Focus only on changed code."
     )
-    return _run_agent(chunks, instructions, kind="performance")
+    return _run_agent(chunks, instructions, kind="performance", deadline=deadline)
 
 
-def security_agent(chunks: List[DiffChunk]) -> List[Issue]:
+def security_agent(chunks: List[DiffChunk], deadline: Optional[float] = None) -> List[Issue]:
     instructions = (
         "You review code changes for SECURITY issues. "
         "Look for SQL injection, command injection, XSS, unsafe deserialization, "
         "hard-coded secrets, insecure use of crypto, and missing auth checks."
         "Focus only on changed code."
     )
-    return _run_agent(chunks, instructions, kind="security")
+    return _run_agent(chunks, instructions, kind="security", deadline=deadline)
@@ -0,0 +1,93 @@
+"""
+Pack diff chunks into prompt-sized batches.
+
+Each batch is sent to an agent as one prompt, so a large PR becomes several
+calls that fit the model's context (and run in parallel) instead of one
+prompt that overflows it.
+"""
+
+from typing import List
+
+from backend.review.types import DiffChunk
+
+# Rough chars-per-token for code with an OpenAI-style BPE tokenizer. Errs on
+# the side of overestimating, which only makes batches a little smaller.
+CHARS_PER_TOKEN = 3.5
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def chunk_tokens(chunk: DiffChunk) -> int:
+    # Matches how agents render a chunk: "File: <path>\n<patch>\n\n".
+    return estimate_tokens(chunk.file_path) + estimate_tokens(chunk.patch) + 4
+
+
+def split_chunk(chunk: DiffChunk, budget: int) -> List[DiffChunk]:
+    """
+    Split a chunk that exceeds `budget` at hunk ("@@") boundaries. Every piece
+    repeats the file header so it still reads as a patch of that file. A
+    single hunk larger than the budget is kept whole.
+    """
+    if chunk_tokens(chunk) <= budget:
+        return [chunk]
+
+    lines = chunk.patch.split("\n")
+    first_hunk = next((i for i, l in enumerate(lines) if l.startswith("@@")), None)
+    if first_hunk is None:
+        return [chunk]
+
+    header = lines[:first_hunk]
+    hunks: List[List[str]] = []
+    for line in lines[first_hunk:]:
+        if line.startswith("@@"):
+            hunks.append([line])
+        else:
+            hunks[-1].append(line)
+
+    pieces: List[DiffChunk] = []
+    current: List[str] = []
+    for hunk in hunks:
+        candidate = DiffChunk(chunk.file_path, "\n".join(header + current + hunk))
+        if current and chunk_tokens(candidate) > budget:
+            pieces.append(DiffChunk(chunk.file_path, "\n".join(header + current)))
+            current = []
+        current.extend(hunk)
+    if current:
+        pieces.append(DiffChunk(chunk.file_path, "\n".join(header + current)))
+    return pieces
+
+
+def pack_chunks(chunks: List[DiffChunk], budget: int) -> List[List[DiffChunk]]:
+    """
+    Bin-pack chunks into batches of at most `budget` estimated tokens
+    (first-fit decreasing). Oversized files are split first; anything still
+    over budget gets a batch of its own.
+
+    Deterministic for a given input: ties keep the original chunk order, and
+    chunks inside each batch are restored to that order.
+    """
+    pieces: List[DiffChunk] = []
+    for chunk in chunks:
+        pieces.extend(split_chunk(chunk, budget))
+
+    sized = sorted(
+        ((chunk_tokens(p), i, p) for i, p in enumerate(pieces)),
+        key=lambda t: (-t[0], t[1]),
+    )
+
+    batches: List[List[tuple[int, DiffChunk]]] = []
+    used: List[int] = []
+    for size, i, piece in sized:
+        for b, total in enumerate(used):
+            if total + size <= budget:
+                batches[b].append((i, piece))
+                used[b] += size
+                break
+        else:
+            batches.append([(i, piece)])
+            used.append(size)
+
+    ordered = sorted(batches, key=lambda batch: min(i for i, _ in batch))
+    return [[p for _, p in sorted(batch, key=lambda t: t[0])] for batch in ordered]
@@ -0,0 +1,171 @@
+"""
+Content-addressed cache of agent findings per file patch.
+
+A file whose patch hasn't changed since the last push gets the same key, so
+its findings are reused without another LLM call. Two tiers: an in-process
+LRU in front of the `agent_results` table, which is shared by all workers.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from backend import models
+from backend.core.config import (
+    GPT_MODEL,
+    REVIEW_CACHE_MAX_ENTRIES,
+    REVIEW_CACHE_MAX_ROWS,
+    REVIEW_CACHE_TTL,
+)
+from backend.core.database import SessionLocal
+from backend.review.types import Issue
+
+# Prune the database tier once every this many writes.
+PRUNE_EVERY = 200
+
+
+def cache_key(patch: str, kind: str, prompt_version: str, model: str = GPT_MODEL) -> str:
+    h = hashlib.sha256()
+    for part in (prompt_version, model, kind, patch):
+        h.update(part.encode("utf-8", "surrogateescape"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of `List[Issue]` by key.
+
+    Issues are stored as plain dicts and rebuilt on every `get`, because the
+    pipeline mutates the Issue objects it is handed (severity merging).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = REVIEW_CACHE_MAX_ENTRIES,
+        ttl: int = REVIEW_CACHE_TTL,
+        max_rows: int = REVIEW_CACHE_MAX_ROWS,
+        persistent: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.persistent = persistent
+        self._lru: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = {"memory": 0, "database": 0}
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[List[Issue]]:
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._lru.move_to_end(key)
+                self.hits["memory"] += 1
+                return [Issue(**d) for d in entry[1]]
+            if entry:
+                del self._lru[key]
+
+        stored = self._db_get(key) if self.persistent else None
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            self.hits["database"] += 1
+            self._remember(key, stored)
+        return [Issue(**d) for d in stored[1]]
+
+    def set(self, key: str, kind: str, issues: List[Issue]) -> None:
+        items = [asdict(it) for it in issues]
+        with self._lock:
+            self._remember(key, (time.time(), items))
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 0
+        if self.persistent:
+            self._db_set(key, kind, items, prune)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_hits": self.hits["memory"],
+                "database_hits": self.hits["database"],
+                "misses": self.misses,
+                "memory_entries": len(self._lru),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def _remember(self, key: str, entry: Tuple[float, List[Dict]]) -> None:
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[Tuple[float, List[Dict]]]:
+        db = SessionLocal()
+        try:
+            row = db.query(models.AgentResult).filter(models.AgentResult.key == key).first()
+            if not row:
+                return None
+            if row.created_at < datetime.utcnow() - timedelta(seconds=self.ttl):
+                return None
+            created = (row.created_at - datetime(1970, 1, 1)).total_seconds()
+            return created, json.loads(row.issues)
+        except Exception as e:  # noqa: BLE001
+            # A broken cache must never break a review.
+            print(f"Warning: Agent result cache read failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _db_set(self, key: str, kind: str, items: List[Dict], prune: bool) -> None:
+        db = SessionLocal()
+        try:
+            db.merge(
+                models.AgentResult(
+                    key=key,
+                    kind=kind,
+                    issues=json.dumps(items),
+                    created_at=datetime.utcnow(),
+                )
+            )
+            db.commit()
+            if prune:
+                self._db_prune(db)
+        except Exception as e:  # noqa: BLE001
+            db.rollback()
+            print(f"Warning: Agent result cache write failed: {e}")
+        finally:
+            db.close()
+
+    def _db_prune(self, db) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        db.query(models.AgentResult).filter(models.AgentResult.created_at < cutoff).delete()
+        excess = db.query(models.AgentResult).count() - self.max_rows
+        if excess > 0:
+            oldest = (
+                db.query(models.AgentResult.key)
+                .order_by(models.AgentResult.created_at)
+                .limit(excess)
+                .subquery()
+            )
+            db.query(models.AgentResult).filter(
+                models.AgentResult.key.in_(oldest.select())
+            ).delete(synchronize_session=False)
+        db.commit()
+
+
+_result_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    return _result_cache
@@ -1,48 +1,235 @@
-from typing import List
+import io
+import re
+from typing import Iterable, Iterator, List, Optional, Union
 
-from backend.review.types import DiffChunk
+from backend.core.config import DIFF_MAX_TOTAL_BYTES, REVIEW_MAX_FILE_BYTES
+from backend.review.filters import SkippedFile
+from backend.review.types import DiffChunk, Hunk
 
+# SkippedFile reason for the file that hit the total cap.
+TRUNCATED = "diff too large; rest not reviewed"
 
-def parse_unified_diff(diff_text: str) -> List[DiffChunk]:
-    chunks: List[DiffChunk] = []
-    current_file = None
+# "@@ -12,7 +12,9 @@ optional section heading"; counts default to 1.
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$")
+
+
+def parse_unified_diff(
+    diff_text: str, skipped: Optional[List[SkippedFile]] = None
+) -> List[DiffChunk]:
+    return list(iter_unified_diff(io.StringIO(diff_text), skipped=skipped))
+
+
+def iter_unified_diff(
+    lines: Iterable[Union[str, bytes]],
+    max_file_bytes: int = REVIEW_MAX_FILE_BYTES,
+    max_total_bytes: int = DIFF_MAX_TOTAL_BYTES,
+    skipped: Optional[List[SkippedFile]] = None,
+) -> Iterator[DiffChunk]:
+    """
+    Parse a unified diff from an iterable of lines (a file, a streamed HTTP
+    response, ...) and yield one DiffChunk per file as soon as it is complete.
+
+    Only the current file is held in memory. A file whose patch exceeds
+    `max_file_bytes` is skipped; once the diff as a whole exceeds
+    `max_total_bytes`, parsing stops and the partial file is dropped. Both
+    are appended to `skipped`, if given, so the review comment lists them.
+    """
+    if skipped is None:
+        skipped = []
+    current_file: Optional[str] = None
     current_lines: list[str] = []
+    file_bytes = 0
+    total_bytes = 0
+    in_header = False
+    oversized = False
+
+    for raw in lines:
+        if isinstance(raw, bytes):
+            size = len(raw)
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        else:
+            line = raw.rstrip("\r\n")
+            size = len(line) + 1
 
-    lines = diff_text.splitlines()
+        total_bytes += size
+        if total_bytes > max_total_bytes:
+            print(f"Warning: Diff exceeds {max_total_bytes} bytes; ignoring the rest")
+            if current_file:
+                skipped.append(SkippedFile(current_file, file_bytes, TRUNCATED))
+            return
 
-    for line in lines:
         if line.startswith("diff --git "):
             # flush previous file
-            if current_file and current_lines:
-                chunks.append(
-                    DiffChunk(
-                        file_path=current_file,
-                        patch="\n".join(current_lines),
-                    )
-                )
-            current_file = None
+            chunk = _flush(current_file, current_lines, oversized, file_bytes, skipped)
+            if chunk:
+                yield chunk
+            # "diff --git a/x b/x"; the "+++" line below refines this, but
+            # binary files and pure renames don't have one.
+            current_file = line.rsplit(" b/", 1)[1] if " b/" in line else None
             current_lines = [line]
-        elif line.startswith("--- ") or line.startswith("+++ "):
-            current_lines.append(line)
-            if line.startswith("+++ "):
-                # example: "+++ b/src/main.py"
-                parts = line.split()
-                if len(parts) >= 2:
-                    path = parts[1]
-                    # strip leading a/ or b/
-                    if path.startswith("a/") or path.startswith("b/"):
-                        path = path[2:]
+            file_bytes = size
+            in_header = True
+            oversized = False
+            continue
+
+        file_bytes += size
+        if in_header and line.startswith("+++ "):
+            # example: "+++ b/src/main.py"
+            parts = line.split()
+            if len(parts) >= 2:
+                path = parts[1]
+                # strip leading a/ or b/
+                if path.startswith("a/") or path.startswith("b/"):
+                    path = path[2:]
+                if path != "/dev/null":
                     current_file = path
-        else:
-            current_lines.append(line)
+        elif line.startswith("@@"):
+            # Past the file header: "+++ "/"--- " from here on are content.
+            in_header = False
+
+        if oversized:
+            continue
+        if file_bytes > max_file_bytes:
+            oversized = True
+            current_lines = []
+            continue
+        current_lines.append(line)
 
     # flush last one
-    if current_file and current_lines:
-        chunks.append(
-            DiffChunk(
-                file_path=current_file,
-                patch="\n".join(current_lines),
+    chunk = _flush(current_file, current_lines, oversized, file_bytes, skipped)
+    if chunk:
+        yield chunk
+
+
+def _flush(
+    file_path: Optional[str],
+    lines: list[str],
+    oversized: bool,
+    file_bytes: int,
+    skipped: List[SkippedFile],
+) -> Optional[DiffChunk]:
+    if oversized:
+        if file_path:
+            skipped.append(SkippedFile(file_path, file_bytes, "too large"))
+        return None
+    if file_path and lines:
+        return DiffChunk(file_path=file_path, patch="\n".join(lines), hunks=parse_hunks(lines))
+    return None
+
+
+def parse_hunks(lines: List[str]) -> List[Hunk]:
+    """
+    Split a file's patch lines into hunks, numbering every added and context
+    line with its new-file line number and its diff position (the number of
+    lines below the file's first "@@" line, as used by GitHub review comments).
+    """
+    hunks: List[Hunk] = []
+    position = -1
+    old_line = new_line = 0
+
+    for line in lines:
+        if position < 0 and not line.startswith("@@"):
+            continue  # file header
+        position += 1
+
+        if line.startswith("@@"):
+            m = HUNK_HEADER.match(line)
+            if not m:
+                continue
+            old_line, new_line = int(m.group(1)), int(m.group(3))
+            hunks.append(
+                Hunk(
+                    old_start=old_line,
+                    old_count=int(m.group(2)) if m.group(2) is not None else 1,
+                    new_start=new_line,
+                    new_count=int(m.group(4)) if m.group(4) is not None else 1,
+                    position=position,
+                    lines=[line],
+                )
             )
-        )
+            continue
+        if not hunks:
+            continue
+
+        hunk = hunks[-1]
+        hunk.lines.append(line)
+        if line.startswith("+"):
+            hunk.new_lines[new_line] = position
+            new_line += 1
+        elif line.startswith("-"):
+            old_line += 1
+        elif line.startswith("\\"):
+            pass  # "\ No newline at end of file"
+        else:
+            hunk.new_lines[new_line] = position
+            old_line += 1
+            new_line += 1
+
+    return hunks
+
+
+def trim_context(chunk: DiffChunk, context: int) -> DiffChunk:
+    """
+    Return a copy of the chunk that keeps only changed lines plus `context`
+    unchanged lines around them. Hunks are re-split and their "@@" headers
+    recomputed, so line numbers in the trimmed patch stay correct.
+
+    The copy is for prompts only: it has no hunk index, since its diff
+    positions no longer match GitHub's.
+    """
+    if not chunk.hunks:
+        return chunk
+
+    header = chunk.patch.split("\n")
+    first = next((i for i, l in enumerate(header) if l.startswith("@@")), len(header))
+    out: List[str] = header[:first]
+
+    for hunk in chunk.hunks:
+        m = HUNK_HEADER.match(hunk.lines[0])
+        section = m.group(5) if m else ""
+        body = hunk.lines[1:]
+
+        # (old, new) line numbers at the start of each body line
+        numbers = []
+        old_line, new_line = hunk.old_start, hunk.new_start
+        for line in body:
+            numbers.append((old_line, new_line))
+            if line.startswith("+"):
+                new_line += 1
+            elif line.startswith("-"):
+                old_line += 1
+            elif not line.startswith("\\"):
+                old_line += 1
+                new_line += 1
+
+        keep = [False] * len(body)
+        for i, line in enumerate(body):
+            if line.startswith(("+", "-")):
+                for j in range(max(0, i - context), min(len(body), i + context + 1)):
+                    keep[j] = True
+        for i, line in enumerate(body):
+            if line.startswith("\\") and i > 0:
+                keep[i] = keep[i - 1]
+
+        i = 0
+        while i < len(body):
+            if not keep[i]:
+                i += 1
+                continue
+            j = i
+            while j < len(body) and keep[j]:
+                j += 1
+            group = body[i:j]
+            old_count = sum(1 for l in group if not l.startswith(("+", "\\")))
+            new_count = sum(1 for l in group if not l.startswith(("-", "\\")))
+            old_start, new_start = numbers[i]
+            # git's convention for an empty side is the line before it
+            if old_count == 0:
+                old_start -= 1
+            if new_count == 0:
+                new_start -= 1
+            out.append(f"@@ -{old_start},{old_count} +{new_start},{new_count} @@{section}")
+            out.extend(group)
+            i = j
 
-    return chunks
+    return DiffChunk(file_path=chunk.file_path, patch="\n".join(out))
@@ -0,0 +1,102 @@
+"""
+Drop files that aren't worth an LLM pass before they reach the agents:
+lockfiles, minified bundles, snapshots, vendored/generated code and binary
+stubs. Files over REVIEW_MAX_FILE_BYTES never get this far: the diff parser
+skips them without holding their patch.
+"""
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import List, Sequence, Tuple
+
+from backend.core.config import REVIEW_EXCLUDE_GLOBS, REVIEW_INCLUDE_GLOBS
+from backend.review.types import DiffChunk
+
+# Matched against the full path and against every trailing sub-path, so
+# "vendor/*" also skips "services/api/vendor/x.go".
+DEFAULT_EXCLUDE_GLOBS: Tuple[str, ...] = (
+    # lockfiles
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "poetry.lock",
+    "Pipfile.lock",
+    "uv.lock",
+    "Cargo.lock",
+    "Gemfile.lock",
+    "composer.lock",
+    "go.sum",
+    # minified / bundled / generated
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*.bundle.js",
+    "*.pb.go",
+    "*_pb2.py",
+    "*_pb2_grpc.py",
+    "*.generated.*",
+    # snapshots
+    "*.snap",
+    "__snapshots__/*",
+    # vendored / build output
+    "vendor/*",
+    "node_modules/*",
+    "third_party/*",
+    "dist/*",
+)
+
+
+@dataclass
+class SkippedFile:
+    file_path: str
+    bytes: int
+    reason: str
+
+
+def filter_chunks(
+    chunks: List[DiffChunk],
+    include: Sequence[str] = REVIEW_INCLUDE_GLOBS,
+    exclude: Sequence[str] = REVIEW_EXCLUDE_GLOBS,
+) -> Tuple[List[DiffChunk], List[SkippedFile]]:
+    """
+    Split chunks into the ones to review and the ones skipped (with why).
+
+    If `include` is non-empty only matching paths are reviewed. Paths matching
+    the built-in or configured `exclude` globs are always skipped.
+    """
+    kept: List[DiffChunk] = []
+    skipped: List[SkippedFile] = []
+    excludes = tuple(DEFAULT_EXCLUDE_GLOBS) + tuple(exclude)
+
+    for chunk in chunks:
+        size = len(chunk.patch.encode("utf-8", "surrogateescape"))
+        if include and not _matches(chunk.file_path, include):
+            reason = "not included"
+        elif _matches(chunk.file_path, excludes):
+            reason = "excluded"
+        elif _is_binary(chunk):
+            reason = "binary"
+        else:
+            kept.append(chunk)
+            continue
+        skipped.append(SkippedFile(file_path=chunk.file_path, bytes=size, reason=reason))
+
+    return kept, skipped
+
+
+def _matches(path: str, patterns: Sequence[str]) -> bool:
+    parts = path.split("/")
+    for i in range(len(parts)):
+        sub = "/".join(parts[i:])
+        if any(fnmatchcase(sub, p) for p in patterns):
+            return True
+    return False
+
+
+def _is_binary(chunk: DiffChunk) -> bool:
+    if chunk.hunks:
+        return False
+    return "GIT binary patch" in chunk.patch or (
+        "Binary files " in chunk.patch and " differ" in chunk.patch
+    )
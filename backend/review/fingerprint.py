@@ -0,0 +1,18 @@
+import hashlib
+import re
+
+from backend.review.types import Issue
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def issue_fingerprint(issue: Issue) -> str:
+    """
+    Stable identity of a finding across reviews: same file, line, kind and
+    (case/whitespace-normalized) message means the same issue.
+    """
+    message = _WHITESPACE.sub(" ", (issue.message or "").strip().lower())
+    key = "\0".join(
+        [issue.file_path or "", str(issue.line or ""), issue.kind or "", message]
+    )
+    return hashlib.sha256(key.encode("utf-8", "surrogateescape")).hexdigest()
@@ -1,11 +1,21 @@
-from typing import List
+from typing import List, Optional, Set
 
+from backend.review.filters import SkippedFile
+from backend.review.fingerprint import issue_fingerprint
 from backend.review.types import Issue
 
 
-def issues_to_markdown(issues: List[Issue]) -> str:
+def issues_to_markdown(
+    issues: List[Issue],
+    skipped: Optional[List[SkippedFile]] = None,
+    new: Optional[Set[str]] = None,
+) -> str:
+    """
+    Render the review comment. Issues whose fingerprint is in `new` (found
+    for the first time on this push) are marked 🆕.
+    """
     if not issues:
-        return "✅ No issues found by the automated reviewer."
+        return "✅ No issues found by the automated reviewer." + _skipped_section(skipped)
 
     out = ["## 🔍 Automated Code Review", ""]
 
@@ -22,10 +32,40 @@ def issues_to_markdown(issues: List[Issue]) -> str:
 
         for it in items:
             msg = it.message.replace("\n", " ")
+            if new and issue_fingerprint(it) in new:
+                msg = f"🆕 {msg}"
             out.append(
                 f"| `{it.file_path}` | {it.line or '-'} | {it.severity} | {msg} |"
             )
 
         out.append("")
 
+    return "\n".join(out) + _skipped_section(skipped)
+
+
+def _skipped_section(skipped: Optional[List[SkippedFile]]) -> str:
+    if not skipped:
+        return ""
+
+    total = sum(s.bytes for s in skipped)
+    out = [
+        "",
+        "",
+        f"<details><summary>Skipped {len(skipped)} file(s) ({_format_bytes(total)})</summary>",
+        "",
+        "| File | Size | Reason |",
+        "|------|------|--------|",
+    ]
+    for s in skipped:
+        out.append(f"| `{s.file_path}` | {_format_bytes(s.bytes)} | {s.reason} |")
+    out.append("")
+    out.append("</details>")
     return "\n".join(out)
+
+
+def _format_bytes(n: int) -> str:
+    if n < 1024:
+        return f"{n} B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / (1024 * 1024):.1f} MB"
@@ -1,31 +1,236 @@
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Set
 
-from backend.review.types import Issue
-from backend.review.diff_parser import parse_unified_diff
+from backend.core.config import (
+    REVIEW_AGENT_CONCURRENCY,
+    REVIEW_AGENT_TIMEOUT,
+    REVIEW_CACHE_ENABLED,
+    REVIEW_CONTEXT_BUDGET,
+    REVIEW_LINE_SNAP_DISTANCE,
+    REVIEW_PROMPT_CONTEXT_LINES,
+)
+from backend.review.types import DiffChunk, Issue
+from backend.review.batching import pack_chunks
+from backend.review.cache import cache_key, get_result_cache
+from backend.review.diff_parser import parse_unified_diff, trim_context
+from backend.review.filters import filter_chunks
+from backend.review.trivial import drop_trivial_hunks
 from backend.review.agents import (
+    PROMPT_VERSION,
     logic_agent,
     readability_agent,
     performance_agent,
     security_agent,
 )
 
+# Fixed order: results are merged in this order regardless of which agent
+# finishes first, so the output of _merge_similar stays deterministic.
+AGENTS: List[tuple[str, Callable[[List[DiffChunk], Optional[float]], List[Issue]]]] = [
+    ("logic", logic_agent),
+    ("readability", readability_agent),
+    ("performance", performance_agent),
+    ("security", security_agent),
+]
+
 
-def run_review(diff_text: str) -> List[Issue]:
+def run_review(diff_text: str, timeout: Optional[float] = None) -> List[Issue]:
     """
     Main entry point for the review pipeline.
+
+    The diff is split into prompt-sized batches and the agent calls run
+    concurrently on the process-wide agent pool. A call that fails or
+    exceeds `timeout` seconds contributes no issues; the others are still
+    returned.
+    """
+    chunks, _ = filter_chunks(parse_unified_diff(diff_text))
+    chunks, _ = drop_trivial_hunks(chunks)
+    issues, _ = review_chunks(chunks, timeout)
+    return issues
+
+
+def review_chunks(
+    chunks: List[DiffChunk], timeout: Optional[float] = None
+) -> tuple[List[Issue], Set[tuple[str, str]]]:
     """
-    chunks = parse_unified_diff(diff_text)
+    Run the agents over already-parsed chunks and merge their findings.
 
+    Prompts only carry the changed lines plus a little context, and every
+    reported line is checked against the diff.
+
+    Also returns the (kind, file_path) pairs whose batch failed or timed out:
+    no findings there means "not reviewed", not "nothing wrong".
+    """
     if not chunks:
-        return []
+        return [], set()
 
+    prompt_chunks = [trim_context(c, REVIEW_PROMPT_CONTEXT_LINES) for c in chunks]
+
+    results, failed = _run_agents(prompt_chunks, timeout)
     issues: List[Issue] = []
-    issues.extend(logic_agent(chunks))
-    issues.extend(readability_agent(chunks))
-    issues.extend(performance_agent(chunks))
-    issues.extend(security_agent(chunks))
+    for agent_issues in results:
+        issues.extend(agent_issues)
+
+    return _merge_similar(_check_lines(issues, chunks)), failed
+
+
+def _run_agents(
+    chunks: List[DiffChunk], timeout: Optional[float] = None
+) -> tuple[List[List[Issue]], Set[tuple[str, str]]]:
+    """
+    Run every agent over the chunks and return one list of issues per agent,
+    in AGENTS order, plus the (kind, file_path) pairs that failed.
+
+    Chunks with cached findings are skipped; the rest are packed into
+    prompt-sized batches and every (agent, batch) call runs on the
+    process-wide agent pool. A failed or timed-out batch only loses the findings for the
+    files in it.
+    """
+    cache = get_result_cache() if REVIEW_CACHE_ENABLED else None
+
+    keys: List[List[str]] = []
+    found: List[List[Optional[List[Issue]]]] = []
+    tasks: List[tuple[int, List[DiffChunk]]] = []
+    for a, (kind, _) in enumerate(AGENTS):
+        agent_keys = [cache_key(c.patch, kind, PROMPT_VERSION) for c in chunks] if cache else []
+        agent_found = [cache.get(k) for k in agent_keys] if cache else [None] * len(chunks)
+        misses = [c for c, hit in zip(chunks, agent_found) if hit is None]
+        for batch in pack_chunks(misses, REVIEW_CONTEXT_BUDGET):
+            tasks.append((a, batch))
+        keys.append(agent_keys)
+        found.append(agent_found)
+
+    outcomes = _run_tasks(tasks, timeout)
+
+    fresh: List[dict[str, List[Issue]]] = [{} for _ in AGENTS]
+    failed: List[set[str]] = [set() for _ in AGENTS]
+    for (a, batch), outcome in zip(tasks, outcomes):
+        if outcome is None:
+            failed[a].update(c.file_path for c in batch)
+            continue
+        for issue in outcome:
+            fresh[a].setdefault(issue.file_path, []).append(issue)
+
+    results: List[List[Issue]] = []
+    for a, (kind, _) in enumerate(AGENTS):
+        issues: List[Issue] = []
+        for i, chunk in enumerate(chunks):
+            hit = found[a][i]
+            if hit is None:
+                hit = fresh[a].pop(chunk.file_path, [])
+                # Only cache a file whose batches all came back.
+                if cache and chunk.file_path not in failed[a]:
+                    cache.set(keys[a][i], kind, hit)
+            issues.extend(hit)
+        # Findings on paths the model made up can't be attributed to a patch,
+        # so they are returned but never cached.
+        for leftovers in fresh[a].values():
+            issues.extend(leftovers)
+        results.append(issues)
+
+    return results, {(kind, path) for a, (kind, _) in enumerate(AGENTS) for path in failed[a]}
+
+
+def _run_tasks(
+    tasks: List[tuple[int, List[DiffChunk]]],
+    timeout: Optional[float] = None,
+) -> List[Optional[List[Issue]]]:
+    """
+    Run (agent index, batch) tasks on the agent pool. Returns the issues per
+    task in task order, or None for a task that failed or timed out.
+
+    Each call gets `timeout` seconds from when a pool thread picks it up, and
+    the LLM client gives up at that deadline, so every task finishes on its
+    own and no thread is left running after the review returns.
+    """
+    if not tasks:
+        return []
+
+    timeout = timeout if timeout is not None else REVIEW_AGENT_TIMEOUT
+    executor = _agent_pool()
+    futures = [executor.submit(_call_agent, a, batch, timeout) for a, batch in tasks]
+
+    outcomes: List[Optional[List[Issue]]] = []
+    for (a, batch), future in zip(tasks, futures):
+        kind = AGENTS[a][0]
+        try:
+            outcomes.append(future.result())
+        except TimeoutError:
+            print(f"Warning: {kind} agent timed out after {timeout:.0f}s ({len(batch)} files)")
+            outcomes.append(None)
+        except Exception as e:  # noqa: BLE001
+            print(f"Warning: {kind} agent failed ({len(batch)} files): {e}")
+            outcomes.append(None)
+
+    return outcomes
+
+
+def _call_agent(a: int, batch: List[DiffChunk], timeout: float) -> List[Issue]:
+    return AGENTS[a][1](batch, time.monotonic() + timeout)
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
 
-    return _merge_similar(issues)
+def _agent_pool() -> ThreadPoolExecutor:
+    """
+    One pool per process, shared by every review running in it (worker jobs
+    and manual reruns alike), so REVIEW_AGENT_CONCURRENCY caps the process's
+    LLM calls rather than each review's.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, REVIEW_AGENT_CONCURRENCY), thread_name_prefix="review-agent"
+            )
+        return _pool
+
+
+def _check_lines(issues: List[Issue], chunks: List[DiffChunk]) -> List[Issue]:
+    """
+    Drop issues on files that aren't in the diff, and move lines that aren't
+    part of it onto the nearest diff line (or clear them if none is close).
+    """
+    by_path = {c.file_path: c for c in chunks}
+    checked: List[Issue] = []
+    for it in issues:
+        chunk = _chunk_for_path(it.file_path, by_path)
+        if chunk is None:
+            continue
+        it.file_path = chunk.file_path
+        if isinstance(it.line, str) and it.line.strip().isdigit():
+            it.line = int(it.line)
+        if isinstance(it.line, int) and chunk.hunks and chunk.position_for_line(it.line) is None:
+            nearest = chunk.nearest_line(it.line)
+            if nearest is not None and abs(nearest - it.line) <= REVIEW_LINE_SNAP_DISTANCE:
+                it.line = nearest
+            else:
+                it.line = None
+        elif not isinstance(it.line, int):
+            it.line = None
+        checked.append(it)
+    return checked
+
+
+def _chunk_for_path(path, by_path: dict[str, DiffChunk]) -> Optional[DiffChunk]:
+    """
+    The chunk a reported path refers to. Models echo paths the way they saw
+    them in the patch, so "a/src/x.py", "b/src/x.py" and "./src/x.py" all
+    mean "src/x.py" (unless a file by that literal name is in the diff).
+    """
+    if not isinstance(path, str):
+        return None
+    path = path.strip()
+    if path in by_path:
+        return by_path[path]
+    while path.startswith("./"):
+        path = path[2:]
+    if path.startswith(("a/", "b/")) and path not in by_path:
+        path = path[2:]
+    return by_path.get(path)
 
 
 def _merge_similar(issues: List[Issue]) -> List[Issue]:
@@ -0,0 +1,161 @@
+"""
+Drop hunks with nothing to review before prompts are built: whitespace-only
+reformatting, blocks moved unchanged, reordered imports, and files that are
+pure renames or mode changes.
+
+Changed lines are compared by a hash of their normalized text.
+"""
+
+import re
+from collections import Counter
+from typing import List, Set, Tuple
+
+from backend.review.filters import SkippedFile
+from backend.review.types import DiffChunk, Hunk
+
+# Leading whitespace is significant in these, so reindenting is a real change.
+INDENT_SENSITIVE = (".py", ".pyi", ".yaml", ".yml", ".haml", ".pug", ".coffee", "Makefile")
+# A run of added lines shorter than this is too generic ("}", "return") to
+# call a move just because the same text was removed somewhere else.
+MIN_MOVED_LINES = 3
+
+IMPORT_LINE = re.compile(
+    r"^\s*(import\s|from\s+\S+\s+import\s|#include\s|using\s|require[\s(]|use\s|@import\s)"
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def drop_trivial_hunks(chunks: List[DiffChunk]) -> Tuple[List[DiffChunk], List[SkippedFile]]:
+    """
+    Remove trivial hunks from each chunk. Chunks left with nothing to review
+    are returned as skipped.
+    """
+    moved = _moved_runs(chunks)
+
+    kept: List[DiffChunk] = []
+    skipped: List[SkippedFile] = []
+    for chunk in chunks:
+        size = len(chunk.patch.encode("utf-8", "surrogateescape"))
+        if not chunk.hunks:
+            if _is_rename_or_mode_change(chunk):
+                skipped.append(SkippedFile(chunk.file_path, size, "rename only"))
+            else:
+                kept.append(chunk)
+            continue
+
+        sensitive = chunk.file_path.endswith(INDENT_SENSITIVE)
+        hunks = [
+            h for h in chunk.hunks
+            if not _is_trivial(h, sensitive, moved)
+        ]
+        if not hunks:
+            skipped.append(SkippedFile(chunk.file_path, size, "no reviewable changes"))
+        elif len(hunks) == len(chunk.hunks):
+            kept.append(chunk)
+        else:
+            kept.append(_with_hunks(chunk, hunks))
+
+    return kept, skipped
+
+
+def _moved_runs(chunks: List[DiffChunk]) -> Set[Tuple[int, int]]:
+    """
+    (id(hunk), run index) of every changed run that is paired with an
+    identical run on the other side of the diff. Pairing is one-to-one: a
+    block removed once and added twice only makes one of the copies a move.
+    """
+    runs = []  # (hunk id, run index, sign, key), in diff order
+    removed, added = Counter(), Counter()
+    for chunk in chunks:
+        sensitive = chunk.file_path.endswith(INDENT_SENSITIVE)
+        for hunk in chunk.hunks:
+            for i, (sign, run) in enumerate(_runs(hunk)):
+                key = _run_key(run, sensitive)
+                if key is not None:
+                    runs.append((id(hunk), i, sign, key))
+                    (removed if sign == "-" else added)[key] += 1
+
+    pairs = {key: min(removed[key], added[key]) for key in removed}
+    used = {"-": Counter(), "+": Counter()}
+    moved: Set[Tuple[int, int]] = set()
+    for hunk_id, i, sign, key in runs:
+        if used[sign][key] < pairs.get(key, 0):
+            used[sign][key] += 1
+            moved.add((hunk_id, i))
+    return moved
+
+
+def _is_trivial(hunk: Hunk, sensitive: bool, moved: Set[Tuple[int, int]]) -> bool:
+    removed = [l[1:] for l in hunk.lines[1:] if l.startswith("-")]
+    added = [l[1:] for l in hunk.lines[1:] if l.startswith("+")]
+    if not removed and not added:
+        return True
+
+    # Whitespace-only: same non-blank lines, in the same order.
+    old = [n for n in (_normalize(l, sensitive) for l in removed) if n]
+    new = [n for n in (_normalize(l, sensitive) for l in added) if n]
+    if old == new:
+        return True
+
+    # Import reordering: only imports changed, and the same set of them.
+    if all(IMPORT_LINE.match(l) or not l.strip() for l in removed + added):
+        if Counter(old) == Counter(new):
+            return True
+
+    # Pure move: every changed run appears, identically, on the other side
+    # somewhere in the diff.
+    return all((id(hunk), i) in moved for i, _ in enumerate(_runs(hunk)))
+
+
+def _runs(hunk: Hunk):
+    """Yield ("+" | "-", lines) for each run of consecutive added/removed lines."""
+    sign, run = None, []
+    for line in hunk.lines[1:]:
+        s = line[:1]
+        if s in ("+", "-") and s == sign:
+            run.append(line[1:])
+            continue
+        if run:
+            yield sign, run
+        sign, run = (s, [line[1:]]) if s in ("+", "-") else (None, [])
+    if run:
+        yield sign, run
+
+
+def _run_key(run: List[str], sensitive: bool):
+    # Moved code is often reindented, so compare runs ignoring indentation,
+    # except where indentation is syntax: a Python block moved one level
+    # deeper (say, under a new `with lock:`) changes what the code does.
+    lines = [_normalize(l if sensitive else l.strip(), sensitive) for l in run]
+    lines = [l for l in lines if l]
+    if len(lines) < MIN_MOVED_LINES:
+        return None
+    return hash(tuple(lines))
+
+
+def _normalize(line: str, sensitive: bool) -> str:
+    if sensitive:
+        stripped = line.lstrip()
+        indent = line[: len(line) - len(stripped)]
+        return (indent + _WHITESPACE.sub(" ", stripped)).rstrip() if stripped else ""
+    # Runs of whitespace collapse to one space rather than vanishing, so
+    # "int a" and "inta", or "a - -b" and "a--b", still differ.
+    return _WHITESPACE.sub(" ", line).strip()
+
+
+def _is_rename_or_mode_change(chunk: DiffChunk) -> bool:
+    return any(
+        l.startswith(("rename from ", "rename to ", "old mode ", "new mode ", "similarity index "))
+        for l in chunk.patch.split("\n")
+    )
+
+
+def _with_hunks(chunk: DiffChunk, hunks: List[Hunk]) -> DiffChunk:
+    # Kept hunks keep their original diff positions, so inline comments on
+    # them still land on the right line of the PR diff.
+    lines = chunk.patch.split("\n")
+    first = next((i for i, l in enumerate(lines) if l.startswith("@@")), len(lines))
+    out = lines[:first]
+    for h in hunks:
+        out.extend(h.lines)
+    return DiffChunk(file_path=chunk.file_path, patch="\n".join(out), hunks=hunks)
@@ -1,11 +1,43 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Hunk:
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    position: int       # diff position of the "@@" line; the first hunk's is 0
+    lines: List[str]    # the "@@" line followed by the hunk body
+    # new-file line number -> diff position, for added and context lines
+    new_lines: Dict[int, int] = field(default_factory=dict)
 
 
 @dataclass
 class DiffChunk:
     file_path: str
     patch: str
+    hunks: List[Hunk] = field(default_factory=list)
+
+    def position_for_line(self, line: int) -> Optional[int]:
+        """
+        The diff position GitHub expects for an inline comment on `line` of
+        the new file, or None if that line isn't part of the diff.
+        """
+        for h in self.hunks:
+            if h.new_start <= line < h.new_start + h.new_count:
+                return h.new_lines.get(line)
+        return None
+
+    def nearest_line(self, line: int) -> Optional[int]:
+        """The closest new-file line that is part of the diff."""
+        best = None
+        for h in self.hunks:
+            for candidate in h.new_lines:
+                if best is None or abs(candidate - line) < abs(best - line):
+                    best = candidate
+        return best
 
 
 @dataclass
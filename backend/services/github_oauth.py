@@ -1,20 +1,25 @@
-"""GitHub OAuth: build the authorize URL and exchange the code for a profile."""
+"""
+GitHub OAuth: build the authorize URL and exchange the code for a profile.
+
+The profile calls don't go through the conditional cache: every login brings
+a new user token, and until /user answers there is nothing stable to key a
+user's entries on, so they would never revalidate and only pile up.
+"""
 
 from typing import Optional
 from urllib.parse import urlencode
 
-import httpx
-
 from backend.core.config import (
     GITHUB_CLIENT_ID,
     GITHUB_CLIENT_SECRET,
     GITHUB_OAUTH_CALLBACK_URL,
     GITHUB_OAUTH_SCOPE,
+    GITHUB_WEB_URL,
 )
+from backend.integrations.github.http import github_client
 
-AUTHORIZE_URL = "https://github.com/login/oauth/authorize"
-TOKEN_URL = "https://github.com/login/oauth/access_token"
-API_BASE = "https://api.github.com"
+AUTHORIZE_URL = f"{GITHUB_WEB_URL}/login/oauth/authorize"
+TOKEN_URL = f"{GITHUB_WEB_URL}/login/oauth/access_token"
 
 
 def build_authorize_url(state: str) -> str:
@@ -31,7 +36,7 @@ def build_authorize_url(state: str) -> str:
 
 def exchange_code_for_token(code: str) -> str:
     """Exchange the OAuth code for a user access token (uses the client secret)."""
-    resp = httpx.post(
+    resp = github_client().post(
         TOKEN_URL,
         headers={"Accept": "application/json"},
         data={
@@ -40,7 +45,6 @@ def exchange_code_for_token(code: str) -> str:
             "code": code,
             "redirect_uri": GITHUB_OAUTH_CALLBACK_URL,
         },
-        timeout=15,
     )
     resp.raise_for_status()
     data = resp.json()
@@ -52,14 +56,14 @@ def exchange_code_for_token(code: str) -> str:
 
 def fetch_github_user(token: str) -> dict:
     """Fetch the authenticated user's profile (login, id, name, avatar_url)."""
-    resp = httpx.get(f"{API_BASE}/user", headers=_auth_headers(token), timeout=15)
+    resp = github_client().get("/user", headers=_auth_headers(token))
     resp.raise_for_status()
     return resp.json()
 
 
 def fetch_primary_email(token: str) -> Optional[str]:
     """Return the user's primary, verified email if available."""
-    resp = httpx.get(f"{API_BASE}/user/emails", headers=_auth_headers(token), timeout=15)
+    resp = github_client().get("/user/emails", headers=_auth_headers(token))
     if resp.status_code != 200:
         return None
     emails = resp.json()
@@ -0,0 +1,254 @@
+"""Database-backed review job queue shared by the webhook and the workers."""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from backend import models
+from backend.core.config import (
+    REVIEW_DEBOUNCE_SECONDS,
+    REVIEW_JOB_HEARTBEAT_INTERVAL,
+    REVIEW_JOB_MAX_ATTEMPTS,
+    REVIEW_JOB_RETRY_BACKOFF,
+    REVIEW_JOB_VISIBILITY_TIMEOUT,
+)
+from backend.core.database import SessionLocal
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+DEAD = "dead"
+SUPERSEDED = "superseded"
+
+
+def enqueue_review(
+    db: Session, pr: "models.PullRequest", installation_id: int
+) -> models.ReviewJob:
+    """
+    Persist a review job for the PR's current head and return it.
+
+    Jobs still queued for the PR are coalesced: one for the same head is
+    reused, ones for older heads are superseded. Either way the job's start is
+    pushed back by the debounce window, so a burst of pushes yields one review.
+    Running jobs for older heads are superseded too; their worker's heartbeat
+    loses the lease and the review stops at its next `is_current` check.
+    """
+    run_after = datetime.utcnow() + timedelta(seconds=REVIEW_DEBOUNCE_SECONDS)
+
+    pending = (
+        db.query(models.ReviewJob)
+        .filter(models.ReviewJob.pr_id == pr.id, models.ReviewJob.status.in_((QUEUED, RUNNING)))
+        .order_by(models.ReviewJob.id)
+        .with_for_update()
+        .all()
+    )
+    job = None
+    for existing in pending:
+        if existing.head_sha == pr.head_sha:
+            if existing.status == QUEUED and job is None:
+                job = existing
+                continue
+            if existing.status == RUNNING:
+                continue
+        existing.status = SUPERSEDED
+        existing.locked_by = None
+        existing.locked_until = None
+
+    if job is None:
+        job = models.ReviewJob(
+            pr_id=pr.id,
+            head_sha=pr.head_sha,
+            status=QUEUED,
+            max_attempts=REVIEW_JOB_MAX_ATTEMPTS,
+        )
+        db.add(job)
+    job.installation_id = installation_id
+    job.run_after = run_after
+
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def is_current_head(db: Session, job: models.ReviewJob) -> bool:
+    """False once the PR has moved past the head this job was queued for."""
+    head_sha = (
+        db.query(models.PullRequest.head_sha)
+        .filter(models.PullRequest.id == job.pr_id)
+        .scalar()
+    )
+    return head_sha == job.head_sha
+
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[models.ReviewJob]:
+    """
+    Claim the oldest runnable job for this worker, or return None.
+
+    Runnable means queued and due, or running with an expired visibility
+    timeout (its worker died). Rows are locked with SKIP LOCKED so concurrent
+    workers on any node never claim the same job.
+    """
+    while True:
+        now = datetime.utcnow()
+        job = (
+            db.query(models.ReviewJob)
+            .filter(
+                or_(
+                    and_(
+                        models.ReviewJob.status == QUEUED,
+                        models.ReviewJob.run_after <= now,
+                    ),
+                    and_(
+                        models.ReviewJob.status == RUNNING,
+                        models.ReviewJob.locked_until < now,
+                    ),
+                )
+            )
+            .order_by(models.ReviewJob.run_after, models.ReviewJob.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if not job:
+            db.commit()
+            return None
+
+        if not is_current_head(db, job):
+            job.status = SUPERSEDED
+            job.locked_by = None
+            job.locked_until = None
+            db.commit()
+            continue
+
+        if job.attempts >= job.max_attempts:
+            # Abandoned on its last attempt; don't run it again.
+            job.status = DEAD
+            job.locked_by = None
+            job.locked_until = None
+            job.last_error = job.last_error or "Visibility timeout expired on final attempt"
+            db.commit()
+            continue
+
+        job.status = RUNNING
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.locked_until = now + timedelta(seconds=REVIEW_JOB_VISIBILITY_TIMEOUT)
+        db.commit()
+        db.refresh(job)
+        return job
+
+
+def extend_lease(db: Session, job_id: int, worker_id: str) -> bool:
+    """Push back a running job's timeout. False if the worker no longer holds it."""
+    result = db.execute(
+        _held_by(job_id, worker_id).values(
+            locked_until=datetime.utcnow() + timedelta(seconds=REVIEW_JOB_VISIBILITY_TIMEOUT)
+        )
+    )
+    db.commit()
+    return result.rowcount > 0
+
+
+class JobHeartbeat:
+    """
+    Extends a claimed job's lease from a background thread while it runs:
+
+        with JobHeartbeat(job.id, worker_id) as heartbeat:
+            ...  # check heartbeat.lost between steps
+
+    `lost` is set once the worker no longer holds the job: another worker
+    took it over, or a newer push superseded it.
+    """
+
+    def __init__(self, job_id: int, worker_id: str, interval: float = REVIEW_JOB_HEARTBEAT_INTERVAL):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self) -> "JobHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            db = SessionLocal()
+            try:
+                if not extend_lease(db, self.job_id, self.worker_id):
+                    print(f"Warning: Review job {self.job_id} lease lost (taken over or superseded)")
+                    self.lost.set()
+                    return
+            except Exception as e:  # noqa: BLE001
+                # Keep beating; the lease only lapses if this persists.
+                print(f"Warning: Heartbeat for review job {self.job_id} failed: {e}")
+            finally:
+                db.close()
+
+
+def complete_job(db: Session, job: models.ReviewJob, worker_id: str) -> bool:
+    return _release(db, job, worker_id, status=DONE, last_error=None)
+
+
+def supersede_job(db: Session, job: models.ReviewJob, worker_id: str) -> bool:
+    return _release(db, job, worker_id, status=SUPERSEDED)
+
+
+def fail_job(db: Session, job: models.ReviewJob, worker_id: str, error: str) -> bool:
+    """Schedule a retry with exponential backoff, or dead-letter the job."""
+    if job.attempts >= job.max_attempts:
+        return _release(db, job, worker_id, status=DEAD, last_error=error)
+    delay = REVIEW_JOB_RETRY_BACKOFF * (2 ** (job.attempts - 1))
+    return _release(
+        db,
+        job,
+        worker_id,
+        status=QUEUED,
+        last_error=error,
+        run_after=datetime.utcnow() + timedelta(seconds=delay),
+    )
+
+
+def defer_job(db: Session, job: models.ReviewJob, worker_id: str, delay: float, error: str) -> bool:
+    """Requeue the job after `delay` seconds without using up an attempt."""
+    return _release(
+        db,
+        job,
+        worker_id,
+        status=QUEUED,
+        last_error=error,
+        attempts=max(job.attempts - 1, 0),
+        run_after=datetime.utcnow() + timedelta(seconds=delay),
+    )
+
+
+def _release(db: Session, job: models.ReviewJob, worker_id: str, **values) -> bool:
+    """
+    Apply the job's outcome and drop the lock, only if `worker_id` still holds
+    it. If the lease expired and another worker claimed the job, this is a
+    no-op and returns False: the job's state belongs to its new owner.
+    """
+    job_id = job.id
+    result = db.execute(
+        _held_by(job_id, worker_id).values(locked_by=None, locked_until=None, **values)
+    )
+    db.commit()
+    if result.rowcount == 0:
+        print(f"Warning: Review job {job_id} lease lost; leaving it to its current worker")
+        return False
+    return True
+
+
+def _held_by(job_id: int, worker_id: str):
+    return update(models.ReviewJob).where(
+        models.ReviewJob.id == job_id,
+        models.ReviewJob.status == RUNNING,
+        models.ReviewJob.locked_by == worker_id,
+    )
@@ -0,0 +1,274 @@
+"""
+In-process cache of JSON responses for the polled read endpoints
+(dashboard, PR summary, PR issues), with ETags.
+
+Each response belongs to a scope ("dashboard", "pr:<id>") that has a version
+token. Writers bump the token after committing (`invalidate_pr`), which makes
+every cached body and ETag of that scope stale. Tokens live on an
+invalidation bus shared by the API replicas and the review workers, so a
+review committed by a worker invalidates every API process:
+
+- "sqlite": a small SQLite file; processes on one host, or a shared volume.
+- "database": the `cache_versions` table; API and workers on separate hosts.
+  Costs a primary-key read per request instead of the endpoint's queries.
+- "memory": this process only (no separate worker).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend import models
+from backend.core.config import (
+    RESPONSE_CACHE_BUS,
+    RESPONSE_CACHE_BUS_PATH,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+)
+from backend.core.database import SessionLocal, run_in_session
+
+DASHBOARD_SCOPE = "dashboard"
+
+
+def pr_scope(pr_id: int) -> str:
+    return f"pr:{pr_id}"
+
+
+@dataclass
+class CachedContent:
+    """A response body plus headers to cache with it (e.g. a next-page cursor)."""
+
+    content: Any
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class MemoryBus:
+    """Version tokens for a single process."""
+
+    def __init__(self):
+        self._versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def version(self, scope: str) -> str:
+        with self._lock:
+            # Random, not a counter, so tokens from before a restart never match.
+            return self._versions.setdefault(scope, os.urandom(8).hex())
+
+    def bump(self, scope: str) -> None:
+        with self._lock:
+            self._versions[scope] = os.urandom(8).hex()
+
+
+class SQLiteBus:
+    """Version tokens in a SQLite file shared by every process that opens it."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def version(self, scope: str) -> str:
+        conn = self._conn()
+        row = conn.execute("SELECT token FROM versions WHERE scope = ?", (scope,)).fetchone()
+        if row:
+            return row[0]
+        # First read of the scope: seed it. Later reads are plain SELECTs.
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO versions (scope, token) VALUES (?, ?)",
+                (scope, os.urandom(8).hex()),
+            )
+            row = conn.execute("SELECT token FROM versions WHERE scope = ?", (scope,)).fetchone()
+        return row[0]
+
+    def bump(self, scope: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO versions (scope, token) VALUES (?, ?)",
+                (scope, os.urandom(8).hex()),
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS versions (scope TEXT PRIMARY KEY, token TEXT NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+
+class DatabaseBus:
+    """Version tokens in the application database."""
+
+    def version(self, scope: str) -> str:
+        db = SessionLocal()
+        try:
+            row = db.get(models.CacheVersion, scope)
+            if row:
+                return row.token
+            token = os.urandom(8).hex()
+            db.add(models.CacheVersion(scope=scope, token=token))
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                return db.get(models.CacheVersion, scope).token
+            return token
+        finally:
+            db.close()
+
+    def bump(self, scope: str) -> None:
+        db = SessionLocal()
+        try:
+            token = os.urandom(8).hex()
+            stmt = (
+                update(models.CacheVersion)
+                .where(models.CacheVersion.scope == scope)
+                .values(token=token)
+            )
+            if not db.execute(stmt).rowcount:
+                db.add(models.CacheVersion(scope=scope, token=token))
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                db.execute(stmt)
+                db.commit()
+        finally:
+            db.close()
+
+
+class ResponseCache:
+    """
+    LRU of serialized response bodies by (scope, key), each tagged with the
+    scope version it was built at.
+    """
+
+    def __init__(self, bus, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, enabled: bool = True):
+        self.bus = bus
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lru: "OrderedDict[Tuple[str, str], Tuple[str, bytes, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def respond(
+        self, request: Request, scope: str, key: str, build: Callable[[Session], Any]
+    ) -> Response:
+        """
+        Answer a GET with the cached body for (scope, key), 304 if the client's
+        If-None-Match is current, or `build(db)` serialized and cached. `build`
+        runs through run_in_session and returns the JSON content, or a
+        CachedContent to cache headers too. Bus reads (sqlite3 / sync
+        SQLAlchemy) run in the threadpool, never on the event loop.
+        """
+        version = await run_in_threadpool(self._version, scope) if self.enabled else None
+        if version is None:
+            result = _as_cached_content(await run_in_session(build))
+            return JSONResponse(jsonable_encoder(result.content), headers=result.headers)
+
+        etag = '"' + hashlib.sha256(f"{scope}\0{key}\0{version}".encode()).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        client_tags = _parse_if_none_match(request.headers.get("if-none-match"))
+        if etag in client_tags or "*" in client_tags:
+            return Response(status_code=304, headers=headers)
+
+        with self._lock:
+            entry = self._lru.get((scope, key))
+            if entry and entry[0] == version:
+                self._lru.move_to_end((scope, key))
+                return Response(
+                    entry[1], media_type="application/json", headers={**entry[2], **headers}
+                )
+
+        result = _as_cached_content(await run_in_session(build))
+        body = json.dumps(jsonable_encoder(result.content), separators=(",", ":")).encode()
+        with self._lock:
+            self._lru[(scope, key)] = (version, body, result.headers)
+            self._lru.move_to_end((scope, key))
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+        return Response(body, media_type="application/json", headers={**result.headers, **headers})
+
+    def invalidate(self, *scopes: str) -> None:
+        for scope in scopes:
+            try:
+                self.bus.bump(scope)
+            except Exception as e:  # noqa: BLE001
+                print(f"Warning: Response cache invalidation failed for {scope}: {e}")
+        with self._lock:
+            for cached in [k for k in self._lru if k[0] in scopes]:
+                del self._lru[cached]
+
+    async def ainvalidate(self, *scopes: str) -> None:
+        """invalidate() from async code: the bus write runs in the threadpool."""
+        await run_in_threadpool(self.invalidate, *scopes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def _version(self, scope: str) -> Optional[str]:
+        try:
+            return self.bus.version(scope)
+        except Exception as e:  # noqa: BLE001
+            # Without a version nothing can be validated; serve uncached.
+            print(f"Warning: Response cache bus unavailable: {e}")
+            return None
+
+
+def _as_cached_content(result: Any) -> CachedContent:
+    return result if isinstance(result, CachedContent) else CachedContent(result)
+
+
+def _parse_if_none_match(value: Optional[str]) -> set:
+    if not value:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in value.split(",")}
+
+
+def _make_bus():
+    if RESPONSE_CACHE_BUS == "memory":
+        return MemoryBus()
+    if RESPONSE_CACHE_BUS == "database":
+        return DatabaseBus()
+    if RESPONSE_CACHE_BUS != "sqlite":
+        print(f"Warning: Unknown RESPONSE_CACHE_BUS {RESPONSE_CACHE_BUS!r}; using sqlite")
+    return SQLiteBus(RESPONSE_CACHE_BUS_PATH)
+
+
+_response_cache = ResponseCache(_make_bus(), enabled=RESPONSE_CACHE_ENABLED)
+
+
+def get_response_cache() -> ResponseCache:
+    return _response_cache
+
+
+def invalidate_pr(pr_id: int) -> None:
+    """Call after committing a change to a PR or its issues."""
+    _response_cache.invalidate(pr_scope(pr_id), DASHBOARD_SCOPE)
+
+
+def invalidate_dashboard() -> None:
+    """Call after committing a change to the dashboard's totals alone."""
+    _response_cache.invalidate(DASHBOARD_SCOPE)
+
+
+async def ainvalidate_pr(pr_id: int) -> None:
+    """invalidate_pr for async routes."""
+    await _response_cache.ainvalidate(pr_scope(pr_id), DASHBOARD_SCOPE)
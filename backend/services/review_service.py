@@ -1,12 +1,32 @@
-from typing import List
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
 
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 
 from backend import models
+from backend.core.config import REVIEW_INCREMENTAL
 from backend.review.types import Issue
-from backend.review.pipeline import run_review
+from backend.review.diff_parser import TRUNCATED, iter_unified_diff, parse_unified_diff
+from backend.review.filters import SkippedFile, filter_chunks
+from backend.review.fingerprint import issue_fingerprint
+from backend.review.trivial import drop_trivial_hunks
+from backend.review.pipeline import review_chunks
 from backend.review.markdown import issues_to_markdown
-from backend.integrations.github.client import fetch_pr_diff, post_pr_comment
+from backend.services.response_cache import invalidate_pr
+from backend.services.rollups import apply_severity_deltas, severity_deltas
+from backend.integrations.github.client import (
+    fetch_compare_diff,
+    fetch_compare_status,
+    post_pr_comment,
+)
+from backend.integrations.github.diff_cache import iter_cached_pr_diff_lines
+from backend.integrations.github.rate_limit import RateLimited
+
+
+class ReviewSuperseded(Exception):
+    """The PR moved to a newer head while this review was running."""
 
 
 def run_and_store_review(
@@ -14,40 +34,252 @@ def run_and_store_review(
     repo: "models.Repository",
     pr: "models.PullRequest",
     installation_id: int,
+    is_current: Optional[Callable[[], bool]] = None,
+    incremental: bool = REVIEW_INCREMENTAL,
 ) -> List[Issue]:
     """
     Fetch the PR diff, run the review pipeline, replace the PR's stored issues,
     and post the review comment back to GitHub. Returns the issues.
 
-    Shared by the webhook (automatic) and the rerun endpoint (manual) so the
+    Shared by the review worker (automatic) and the rerun endpoint (manual) so the
     review flow lives in exactly one place.
+
+    With `incremental`, a PR that was reviewed before only has the files
+    touched since the last reviewed head re-reviewed; stored issues on the
+    other files are carried forward.
+
+    A batch that fails or times out leaves the stored issues of that kind on
+    its files untouched, and the head isn't marked reviewed, so the next
+    review covers those files again.
+
+    `is_current` is checked before each expensive step; if it returns False
+    the review is abandoned with ReviewSuperseded and nothing is written.
+
+    The comment is skipped when nothing was re-reviewed and the comment for
+    this head already went out (a rerun, or a job retried after a redelivered
+    webhook), so the PR isn't spammed with copies.
     """
-    diff = fetch_pr_diff(repo.full_name, pr.pr_number, installation_id)
-
-    issues = run_review(diff)
-
-    # Replace the PR's issues with the new set.
-    db.query(models.ReviewIssue).filter(models.ReviewIssue.pr_id == pr.id).delete()
-    for issue in issues:
-        db.add(
-            models.ReviewIssue(
-                pr_id=pr.id,
-                file_path=issue.file_path,
-                line=issue.line,
-                kind=issue.kind,
-                severity=issue.severity,
-                message=issue.message,
-                suggestion=issue.suggestion,
-            )
+    _ensure_current(is_current)
+    head_sha = pr.head_sha
+    skipped: List[SkippedFile] = []
+    chunks = list(
+        iter_unified_diff(
+            iter_cached_pr_diff_lines(repo.full_name, pr.pr_number, pr.head_sha, installation_id),
+            skipped=skipped,
         )
+    )
+    chunks, filtered = filter_chunks(chunks)
+    chunks, trivial = drop_trivial_hunks(chunks)
+    skipped += filtered + trivial
+    if skipped:
+        total = sum(s.bytes for s in skipped)
+        print(f"Skipped {len(skipped)} file(s) ({total} bytes) in {repo.full_name}#{pr.pr_number}")
+    pr_files = {c.file_path for c in chunks}
+
+    touched: Optional[Set[str]] = None
+    if incremental:
+        touched = _files_touched_since_last_review(repo, pr, installation_id)
+    if touched is not None:
+        chunks = [c for c in chunks if c.file_path in touched]
+
+    _ensure_current(is_current)
+    new_issues, failed = review_chunks(chunks)
+
+    _ensure_current(is_current)
+
+    in_scope = None  # full review: every stored issue is up for replacement
+    if touched is not None:
+
+        def in_scope(path: str) -> bool:
+            # Only issues on re-reviewed files, or files no longer in the PR.
+            return path in touched or path not in pr_files
+
+    issues, new_fingerprints = _store_issues(db, pr, new_issues, in_scope, failed)
+
+    if failed:
+        print(
+            f"Warning: {len(failed)} agent batch result(s) missing for "
+            f"{repo.full_name}#{pr.pr_number}; not marking {head_sha[:7]} reviewed"
+        )
+    else:
+        pr.last_reviewed_sha = head_sha
+        pr.last_reviewed_at = datetime.utcnow()
     db.commit()
+    invalidate_pr(pr.id)
+
+    if touched == set() and pr.last_commented_sha == head_sha:
+        print(f"{repo.full_name}#{pr.pr_number} already commented at {head_sha[:7]}; not reposting")
+        return issues
 
-    # Posting the comment is best-effort; the review is already saved.
+    # Posting the comment is best-effort; the review is already saved. A rate
+    # limit is passed up so the worker retries later: the rerun finds the head
+    # already reviewed and only re-posts.
     try:
-        post_pr_comment(
-            repo.full_name, pr.pr_number, issues_to_markdown(issues), installation_id
-        )
+        body = issues_to_markdown(issues, skipped, new_fingerprints)
+        post_pr_comment(repo.full_name, pr.pr_number, body, installation_id)
+    except RateLimited:
+        raise
     except Exception as e:  # noqa: BLE001
         print(f"Warning: Failed to post PR comment: {e}")
+        return issues
 
+    pr.last_commented_sha = head_sha
+    db.commit()
     return issues
+
+
+def _store_issues(
+    db: Session,
+    pr: "models.PullRequest",
+    new_issues: List[Issue],
+    in_scope: Optional[Callable[[str], bool]] = None,
+    failed: Set[tuple[str, str]] = frozenset(),
+) -> tuple[List[Issue], Set[str]]:
+    """
+    Sync the PR's stored issues with `new_issues` by fingerprint: stored
+    issues in scope that weren't found again are deleted, unseen ones are
+    inserted, and found-again rows are kept (with their created_at), with
+    severity, message and suggestion brought up to date. Bulk statements,
+    plus the matching severity rollup deltas; the caller commits.
+
+    Rows whose (kind, file_path) is in `failed` were not re-reviewed, so
+    they are kept even when in scope.
+
+    Rows from before fingerprints existed are fingerprinted from their
+    columns, so they are matched, kept or replaced like any other.
+
+    Returns all of the PR's issues after the sync, and the fingerprints that
+    were newly inserted.
+    """
+    fresh: Dict[str, Issue] = {}
+    for issue in new_issues:
+        fresh.setdefault(issue_fingerprint(issue), issue)
+
+    rows = db.query(models.ReviewIssue).filter(models.ReviewIssue.pr_id == pr.id).all()
+
+    matched: Set[str] = set()
+    stale_ids: List[int] = []
+    updates: List[dict] = []
+    kept: List[Issue] = []
+    removed: Counter = Counter()
+    gained: Counter = Counter()
+    for row in rows:
+        fp = row.fingerprint or issue_fingerprint(_row_to_issue(row))
+        if fp in fresh and fp not in matched:
+            matched.add(fp)
+            changes = {
+                col: getattr(fresh[fp], col)
+                for col in ("severity", "message", "suggestion")
+                if getattr(row, col) != getattr(fresh[fp], col)
+            }
+            if "severity" in changes:
+                removed[row.severity] += 1
+                gained[fresh[fp].severity] += 1
+        elif (row.kind, row.file_path) not in failed and (
+            in_scope is None or in_scope(row.file_path)
+        ):
+            stale_ids.append(row.id)
+            removed[row.severity] += 1
+            continue
+        else:
+            kept.append(_row_to_issue(row))
+            changes = {}
+        if row.fingerprint != fp:
+            changes["fingerprint"] = fp
+        if changes:
+            updates.append({"id": row.id, **changes})
+
+    if stale_ids:
+        db.execute(
+            delete(models.ReviewIssue)
+            .where(models.ReviewIssue.id.in_(stale_ids))
+            .execution_options(synchronize_session=False)
+        )
+    if updates:
+        db.execute(
+            update(models.ReviewIssue).execution_options(synchronize_session=False), updates
+        )
+
+    added = [fp for fp in fresh if fp not in matched]
+    if added:
+        db.execute(
+            insert(models.ReviewIssue),
+            [
+                {
+                    "pr_id": pr.id,
+                    "file_path": fresh[fp].file_path,
+                    "line": fresh[fp].line,
+                    "kind": fresh[fp].kind,
+                    "severity": fresh[fp].severity,
+                    "message": fresh[fp].message,
+                    "suggestion": fresh[fp].suggestion,
+                    "fingerprint": fp,
+                }
+                for fp in added
+            ],
+        )
+        gained.update(fresh[fp].severity for fp in added)
+
+    apply_severity_deltas(db, pr.repo_id, severity_deltas(removed, gained))
+
+    # First review: nothing was reported before, so nothing is "new".
+    new_fingerprints = set(added) if rows else set()
+    return kept + list(fresh.values()), new_fingerprints
+
+
+def _files_touched_since_last_review(
+    repo: "models.Repository",
+    pr: "models.PullRequest",
+    installation_id: int,
+) -> Optional[Set[str]]:
+    """
+    Files changed between the last reviewed head and the current one, or None
+    when a full review is needed: first review, or the old head is no longer
+    an ancestor of the new one after a force-push (a three-dot compare would
+    then diff against the merge base and miss files).
+    """
+    if not pr.last_reviewed_sha or not pr.head_sha:
+        return None
+    if pr.last_reviewed_sha == pr.head_sha:
+        return set()
+
+    try:
+        status = fetch_compare_status(
+            repo.full_name, pr.last_reviewed_sha, pr.head_sha, installation_id
+        )
+        if status not in ("ahead", "identical"):
+            print(
+                f"Warning: {pr.last_reviewed_sha[:7]}..{pr.head_sha[:7]} is {status}; "
+                "running a full review"
+            )
+            return None
+        diff = fetch_compare_diff(
+            repo.full_name, pr.last_reviewed_sha, pr.head_sha, installation_id
+        )
+    except Exception as e:  # noqa: BLE001
+        print(f"Warning: Incremental diff unavailable, running a full review: {e}")
+        return None
+
+    skipped: List[SkippedFile] = []
+    touched = {c.file_path for c in parse_unified_diff(diff, skipped)}
+    if any(s.reason == TRUNCATED for s in skipped):
+        print("Warning: Incremental diff truncated, running a full review")
+        return None
+    # Oversized files were still touched; their old findings are replaced.
+    return touched | {s.file_path for s in skipped}
+
+
+def _row_to_issue(row: "models.ReviewIssue") -> Issue:
+    return Issue(
+        file_path=row.file_path,
+        line=row.line,
+        kind=row.kind,
+        severity=row.severity,
+        message=row.message,
+        suggestion=row.suggestion,
+    )
+
+
+def _ensure_current(is_current: Optional[Callable[[], bool]]) -> None:
+    if is_current is not None and not is_current():
+        raise ReviewSuperseded()
@@ -0,0 +1,106 @@
+"""
+Per-repository issue counts by severity, so the dashboard and repo pages
+don't aggregate review_issues on every load.
+
+The review service applies deltas in the same transaction that writes the
+issues. If the table ever drifts (manual edits, a bug), rebuild it:
+
+    python -m backend.services.rollups
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend import models
+from backend.services.response_cache import invalidate_dashboard
+
+
+def apply_severity_deltas(db: Session, repo_id: int, deltas: Mapping[str, int]) -> None:
+    """
+    Add `deltas` (severity -> change in issue count) to the repo's rollup
+    rows. Does not commit; the caller commits along with the issue writes.
+    """
+    for severity, delta in deltas.items():
+        if not delta or severity is None:
+            continue
+        stmt = (
+            update(models.SeverityRollup)
+            .where(
+                models.SeverityRollup.repo_id == repo_id,
+                models.SeverityRollup.severity == severity,
+            )
+            .values(count=models.SeverityRollup.count + delta)
+            .execution_options(synchronize_session=False)
+        )
+        if db.execute(stmt).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(
+                    insert(models.SeverityRollup).values(
+                        repo_id=repo_id, severity=severity, count=delta
+                    )
+                )
+        except IntegrityError:
+            # Another review of the same repo created the row first.
+            db.execute(stmt)
+
+
+def severity_deltas(before: Counter, after: Counter) -> Dict[str, int]:
+    return {s: after[s] - before[s] for s in set(before) | set(after) if after[s] != before[s]}
+
+
+def severity_counts(db: Session, repo_id: Optional[int] = None) -> Dict[str, int]:
+    """Issue counts by severity for one repository, or across all of them."""
+    query = db.query(models.SeverityRollup.severity, func.sum(models.SeverityRollup.count))
+    if repo_id is not None:
+        query = query.filter(models.SeverityRollup.repo_id == repo_id)
+    return {severity: int(count or 0) for severity, count in query.group_by(models.SeverityRollup.severity)}
+
+
+def rebuild_severity_rollups(db: Session) -> int:
+    """Recompute the whole table from review_issues. Returns the row count."""
+    db.execute(delete(models.SeverityRollup))
+    counts = db.execute(
+        select(
+            models.PullRequest.repo_id,
+            models.ReviewIssue.severity,
+            func.count(models.ReviewIssue.id),
+        )
+        .join(models.PullRequest, models.ReviewIssue.pr_id == models.PullRequest.id)
+        .where(models.ReviewIssue.severity.is_not(None))
+        .group_by(models.PullRequest.repo_id, models.ReviewIssue.severity)
+    ).all()
+    if counts:
+        db.execute(
+            insert(models.SeverityRollup),
+            [{"repo_id": r, "severity": s, "count": c} for r, s, c in counts],
+        )
+    db.commit()
+    # The dashboard's severity totals come from these rows.
+    invalidate_dashboard()
+    return len(counts)
+
+
+def main() -> None:
+    from backend.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_severity_rollups(db)
+    finally:
+        db.close()
+    print(f"Rebuilt severity rollups: {rows} row(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+X-GitHub-Delivery dedupe, so a redelivered webhook is acknowledged without
+queueing the same review again.
+
+Delivery ids live in the `webhook_deliveries` table, shared by every API
+replica and kept across restarts. A claim is written in the same transaction
+as the work it guards (PR upsert and job enqueue), so a crash before the
+commit leaves no claim behind and GitHub's redelivery is processed. The
+primary key serializes replicas: a second claim of the same id waits for
+the first transaction and then finds it taken. Ids expire after
+WEBHOOK_DELIVERY_TTL, and the table is trimmed to
+WEBHOOK_DELIVERY_MAX_ENTRIES every PRUNE_EVERY claims.
+"""
+
+import itertools
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from backend import models
+from backend.core.config import WEBHOOK_DELIVERY_MAX_ENTRIES, WEBHOOK_DELIVERY_TTL
+from backend.core.database import dialect_insert
+
+PRUNE_EVERY = 100
+
+_claims = itertools.count(1)
+
+
+def claim_delivery(db: Session, delivery_id: str, event: str) -> bool:
+    """
+    Add the delivery to the session's transaction. Returns False if it was
+    already handled within the TTL. Does not commit; the caller commits it
+    together with the work, or rolls both back.
+    """
+    now = datetime.utcnow()
+    # One upsert, no savepoint: insert, or take over an expired id.
+    stmt = (
+        dialect_insert(db)(models.WebhookDelivery)
+        .values(delivery_id=delivery_id, event=event, received_at=now)
+        .on_conflict_do_update(
+            index_elements=[models.WebhookDelivery.delivery_id],
+            set_={"received_at": now, "event": event},
+            where=models.WebhookDelivery.received_at < _expiry(now),
+        )
+    )
+    return db.execute(stmt).rowcount > 0
+
+
+def prune_if_due(db: Session) -> None:
+    """Call after committing a claim; prunes once every PRUNE_EVERY claims."""
+    if next(_claims) % PRUNE_EVERY == 0:
+        prune_deliveries(db)
+
+
+def prune_deliveries(db: Session, max_entries: int = WEBHOOK_DELIVERY_MAX_ENTRIES) -> int:
+    """Drop expired ids, then the oldest past `max_entries`. Returns rows removed."""
+    removed = db.execute(
+        delete(models.WebhookDelivery).where(
+            models.WebhookDelivery.received_at < _expiry(datetime.utcnow())
+        )
+    ).rowcount
+    cutoff = db.execute(
+        select(models.WebhookDelivery.received_at)
+        .order_by(models.WebhookDelivery.received_at.desc())
+        .offset(max_entries)
+        .limit(1)
+    ).scalar()
+    if cutoff is not None:
+        removed += db.execute(
+            delete(models.WebhookDelivery).where(models.WebhookDelivery.received_at <= cutoff)
+        ).rowcount
+    db.commit()
+    return removed
+
+
+def _expiry(now: datetime) -> datetime:
+    return now - timedelta(seconds=WEBHOOK_DELIVERY_TTL)
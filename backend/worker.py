@@ -0,0 +1,108 @@
+"""
+Review worker: claims queued review jobs and runs them.
+
+    python -m backend.worker
+
+Run as many of these as needed, on any number of nodes; they coordinate
+through row locks on the review_jobs table.
+"""
+
+import os
+import signal
+import socket
+import sys
+import threading
+from pathlib import Path
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend import models
+from backend.core.config import REVIEW_WORKER_POLL_INTERVAL
+from backend.core.database import SessionLocal, engine
+from backend.integrations.github.http import get_github_http
+from backend.integrations.github.rate_limit import RateLimited
+from backend.integrations.llm.client import get_llm_client
+from backend.services import job_queue
+from backend.services.review_service import ReviewSuperseded, run_and_store_review
+
+
+def process_job(db, job: models.ReviewJob, heartbeat: job_queue.JobHeartbeat) -> None:
+    pr = db.query(models.PullRequest).filter(models.PullRequest.id == job.pr_id).first()
+    if not pr:
+        raise ValueError(f"Pull request with id {job.pr_id} not found")
+
+    repo = db.query(models.Repository).filter(models.Repository.id == pr.repo_id).first()
+    if not repo:
+        raise ValueError(f"Repository for PR id {pr.id} not found")
+
+    run_and_store_review(
+        db,
+        repo,
+        pr,
+        job.installation_id or repo.installation_id,
+        # Stop at the next checkpoint once the job is no longer ours to run.
+        is_current=lambda: not heartbeat.lost.is_set() and job_queue.is_current_head(db, job),
+    )
+
+
+def run_once(worker_id: str) -> bool:
+    """Claim and process a single job. Returns False if the queue was empty."""
+    db = SessionLocal()
+    try:
+        job = job_queue.claim_next_job(db, worker_id)
+        if not job:
+            return False
+        try:
+            with job_queue.JobHeartbeat(job.id, worker_id) as heartbeat:
+                process_job(db, job, heartbeat)
+        except ReviewSuperseded:
+            db.rollback()
+            if not heartbeat.lost.is_set():
+                print(f"Review job {job.id} superseded by a newer push")
+            job_queue.supersede_job(db, job, worker_id)
+        except RateLimited as e:
+            db.rollback()
+            print(f"Warning: Review job {job.id} deferred: {e}")
+            job_queue.defer_job(db, job, worker_id, e.retry_after, str(e))
+        except Exception as e:  # noqa: BLE001
+            db.rollback()
+            print(f"Warning: Review job {job.id} failed (attempt {job.attempts}): {e}")
+            job_queue.fail_job(db, job, worker_id, str(e))
+        else:
+            job_queue.complete_job(db, job, worker_id)
+        return True
+    finally:
+        db.close()
+
+
+def main() -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    # SIGTERM (deploys) and Ctrl-C finish the current job, then exit.
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    github_http, llm = get_github_http(), get_llm_client()
+    github_http.open()
+    llm.open()
+    print(f"Review worker {worker_id} started")
+    try:
+        while not stop.is_set():
+            try:
+                busy = run_once(worker_id)
+            except Exception as e:  # noqa: BLE001
+                # Database hiccup; back off and keep the worker alive.
+                print(f"Warning: Worker loop error: {e}")
+                busy = False
+            if not busy:
+                stop.wait(REVIEW_WORKER_POLL_INTERVAL)
+    finally:
+        github_http.close()
+        llm.close()
+        engine.dispose()
+        print(f"Review worker {worker_id} stopped")
+
+
+if __name__ == "__main__":
+    main()
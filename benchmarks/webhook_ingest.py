@@ -0,0 +1,129 @@
+"""
+Requests per second through the GitHub webhook endpoint, in process.
+
+Sends signed deliveries with a realistically large pull_request payload
+(--payload-kb) for:
+  - an event we ignore by header (issues),
+  - a pull_request action we ignore (closed), rejected from the leading bytes,
+  - an accepted action (synchronize), fully parsed and queued.
+Also times a full parse of the payload with json and orjson for reference.
+
+    python -m benchmarks.webhook_ingest
+    python -m benchmarks.webhook_ingest --requests 5000 --payload-kb 200
+
+Uses a scratch SQLite database in the temp directory (recreated every run).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SECRET = "benchmark-secret"
+DB_PATH = Path(tempfile.gettempdir()) / "prauditor_webhook_bench.db"
+
+
+def make_payload(action: str, payload_kb: int, pr_number: int = 1) -> bytes:
+    filler = "x" * 1000
+    data = {
+        "action": action,
+        "number": pr_number,
+        "pull_request": {
+            "number": pr_number,
+            "title": "Benchmark PR",
+            "state": "open",
+            "head": {"sha": "a" * 40},
+            "body": "",
+            # GitHub payloads carry full user/repo objects; pad to size.
+            "labels": [{"name": f"label-{i}", "description": filler} for i in range(payload_kb)],
+        },
+        "repository": {"full_name": "bench/repo"},
+        "installation": {"id": 1},
+    }
+    return json.dumps(data).encode()
+
+
+def signed(body: bytes, event: str) -> dict:
+    sig = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return {
+        "X-GitHub-Event": event,
+        "X-Hub-Signature-256": f"sha256={sig}",
+        "Content-Type": "application/json",
+    }
+
+
+async def measure(client, body: bytes, headers: dict, requests: int) -> float:
+    url = "/api/webhook/github/webhook"
+    for _ in range(min(requests // 10, 50)):  # warm up
+        await client.post(url, content=body, headers=headers)
+    start = time.perf_counter()
+    for _ in range(requests):
+        r = await client.post(url, content=body, headers=headers)
+        if r.status_code >= 400:
+            raise SystemExit(f"Unexpected {r.status_code}: {r.text}")
+    return requests / (time.perf_counter() - start)
+
+
+async def run(args) -> None:
+    import httpx
+
+    from backend.main import app
+
+    closed = make_payload("closed", args.payload_kb)
+    accepted = make_payload("synchronize", args.payload_kb)
+    cases = [
+        ("ignored event (issues)", closed, signed(closed, "issues")),
+        ("ignored action (pull_request closed)", closed, signed(closed, "pull_request")),
+        ("accepted (pull_request synchronize)", accepted, signed(accepted, "pull_request")),
+    ]
+
+    print(f"payload: {len(accepted) / 1024:.0f} KB, {args.requests} requests per case")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, body, headers in cases:
+            rps = await measure(client, body, headers, args.requests)
+            print(f"  {name:40s} {rps:10.0f} req/s")
+
+
+def parse_timings(payload: bytes, repeat: int = 200) -> None:
+    decoders = [("json", json.loads)]
+    try:
+        import orjson
+
+        decoders.append(("orjson", orjson.loads))
+    except ImportError:
+        pass
+    print("full payload parse:")
+    for name, loads in decoders:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            loads(payload)
+        print(f"  {name:40s} {(time.perf_counter() - start) / repeat * 1e6:10.0f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--payload-kb", type=int, default=100)
+    args = parser.parse_args()
+
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+    os.environ["GITHUB_WEBHOOK_SECRET"] = SECRET
+    os.environ.setdefault("REVIEW_DEBOUNCE_SECONDS", "0")
+
+    asyncio.run(run(args))
+    parse_timings(make_payload("synchronize", args.payload_kb))
+
+
+if __name__ == "__main__":
+    main()
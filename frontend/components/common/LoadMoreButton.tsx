@@ -0,0 +1,35 @@
+import { Loader2 } from "lucide-react";
+
+import { Button } from "@/components/ui/button";
+import { cn } from "@/lib/utils";
+
+interface LoadMoreButtonProps {
+  hasNextPage: boolean;
+  isFetchingNextPage: boolean;
+  onLoadMore: () => void;
+  className?: string;
+}
+
+/** Footer for paginated lists; renders nothing once the last page is loaded. */
+export function LoadMoreButton({
+  hasNextPage,
+  isFetchingNextPage,
+  onLoadMore,
+  className,
+}: LoadMoreButtonProps) {
+  if (!hasNextPage) return null;
+
+  return (
+    <div className={cn("mt-6 flex justify-center", className)}>
+      <Button
+        variant="outline"
+        size="sm"
+        onClick={onLoadMore}
+        disabled={isFetchingNextPage}
+      >
+        {isFetchingNextPage ? <Loader2 className="animate-spin" /> : null}
+        {isFetchingNextPage ? "Loading…" : "Load more"}
+      </Button>
+    </div>
+  );
+}
@@ -4,17 +4,33 @@ import { useMemo, useState } from "react";
 import { FolderGit2 } from "lucide-react";
 
 import { useRepositories } from "@/hooks/useRepositories";
+import { useRepositoryOverviews } from "@/hooks/useRepositoryOverviews";
 import { PageHeader } from "@/components/common/PageHeader";
 import { SearchInput } from "@/components/common/SearchInput";
 import { EmptyState } from "@/components/common/EmptyState";
 import { ErrorCard } from "@/components/common/ErrorCard";
 import { CardGridSkeleton } from "@/components/common/LoadingSkeleton";
+import { LoadMoreButton } from "@/components/common/LoadMoreButton";
 import { RepositoryCard } from "@/components/repositories/RepositoryCard";
 
-/** Repositories route container: search + responsive card grid. */
+/**
+ * Repositories route container: search + responsive card grid. Search
+ * filters the pages loaded so far.
+ */
 export function RepositoriesView() {
-  const { data, isPending, isError, error, refetch } = useRepositories();
+  const {
+    data,
+    isPending,
+    isError,
+    error,
+    refetch,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useRepositories();
   const [query, setQuery] = useState("");
+  const ids = useMemo(() => (data ?? []).map((repo) => repo.id), [data]);
+  const { data: overviews } = useRepositoryOverviews(ids);
 
   const filtered = useMemo(() => {
     if (!data) return [];
@@ -51,18 +67,31 @@ export function RepositoriesView() {
           title="No repositories yet"
           description="Install the PRAuditor GitHub App on a repository to start reviewing pull requests."
         />
-      ) : filtered.length === 0 ? (
-        <EmptyState
-          icon={FolderGit2}
-          title="No matches"
-          description={`No repositories match “${query}”.`}
-        />
       ) : (
-        <div className="grid grid-cols-1 gap-4 sm:grid-cols-2 lg:grid-cols-3">
-          {filtered.map((repo) => (
-            <RepositoryCard key={repo.id} repository={repo} />
-          ))}
-        </div>
+        <>
+          {filtered.length === 0 ? (
+            <EmptyState
+              icon={FolderGit2}
+              title="No matches"
+              description={`No repositories match “${query}”.`}
+            />
+          ) : (
+            <div className="grid grid-cols-1 gap-4 sm:grid-cols-2 lg:grid-cols-3">
+              {filtered.map((repo) => (
+                <RepositoryCard
+                  key={repo.id}
+                  repository={repo}
+                  overview={overviews?.get(repo.id)}
+                />
+              ))}
+            </div>
+          )}
+          <LoadMoreButton
+            hasNextPage={hasNextPage}
+            isFetchingNextPage={isFetchingNextPage}
+            onLoadMore={() => fetchNextPage()}
+          />
+        </>
       )}
     </div>
   );
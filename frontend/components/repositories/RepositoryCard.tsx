@@ -3,30 +3,24 @@
 import Link from "next/link";
 import { ArrowRight, GitPullRequest } from "lucide-react";
 
-import { usePullRequests } from "@/hooks/usePullRequests";
 import { formatRelativeTime } from "@/lib/format";
 import { splitRepoName } from "@/lib/format";
 import { Card } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Skeleton } from "@/components/ui/skeleton";
-import type { PullRequest, Repository } from "@/types";
-
-function lastReviewedAt(prs: PullRequest[]): string | null {
-  let latest = 0;
-  for (const pr of prs) {
-    if (!pr.last_reviewed_at) continue;
-    const t = new Date(pr.last_reviewed_at).getTime();
-    if (!Number.isNaN(t) && t > latest) latest = t;
-  }
-  return latest ? new Date(latest).toISOString() : null;
-}
+import type { Repository, RepositoryOverview } from "@/types";
 
 /**
- * Repository summary card. Fetches its own PR list to show a live count + last
- * reviewed time. Cached by TanStack Query, so opening the repo is instant.
+ * Repository summary card: PR count + last reviewed time. The stats come
+ * from the grid's single overview request (see RepositoriesView).
  */
-export function RepositoryCard({ repository }: { repository: Repository }) {
-  const { data: prs, isPending } = usePullRequests(repository.id);
+export function RepositoryCard({
+  repository,
+  overview,
+}: {
+  repository: Repository;
+  overview: RepositoryOverview | undefined;
+}) {
   const { owner, name } = splitRepoName(repository.full_name);
 
   return (
@@ -40,16 +34,16 @@ export function RepositoryCard({ repository }: { repository: Repository }) {
         </h3>
 
         <div className="mt-4 flex items-center gap-4 text-sm text-muted-foreground">
-          {isPending ? (
+          {!overview ? (
             <Skeleton className="h-4 w-32" />
           ) : (
             <>
               <span className="inline-flex items-center gap-1.5">
                 <GitPullRequest className="h-4 w-4" />
-                {prs?.length ?? 0} PR{(prs?.length ?? 0) === 1 ? "" : "s"}
+                {overview.prs} PR{overview.prs === 1 ? "" : "s"}
               </span>
               <span>·</span>
-              <span>Reviewed {formatRelativeTime(lastReviewedAt(prs ?? []))}</span>
+              <span>Reviewed {formatRelativeTime(overview.last_review)}</span>
             </>
           )}
         </div>
@@ -10,6 +10,7 @@ import { PageHeader } from "@/components/common/PageHeader";
 import { SearchInput } from "@/components/common/SearchInput";
 import { ErrorCard } from "@/components/common/ErrorCard";
 import { ListSkeleton } from "@/components/common/LoadingSkeleton";
+import { LoadMoreButton } from "@/components/common/LoadMoreButton";
 import { PullRequestList } from "@/components/pullrequests/PullRequestList";
 import type { PullRequest } from "@/types";
 
@@ -28,13 +29,22 @@ function matches(pr: PullRequest, query: string): boolean {
 
 /** Repository detail route container: repo header + its pull requests. */
 export function RepositoryDetailView({ repoId }: RepositoryDetailViewProps) {
-  // No single-repo endpoint yet; resolve the name from the cached list.
+  // No single-repo endpoint yet; resolve the name from the pages cached so
+  // far (the header falls back to the id if it isn't among them).
   // TODO(backend): replace with GET /api/repos/{repoId} when available.
   const { data: repositories } = useRepositories();
   const repo = repositories?.find((r) => r.id === repoId);
 
-  const { data: prs, isPending, isError, error, refetch } =
-    usePullRequests(repoId);
+  const {
+    data: prs,
+    isPending,
+    isError,
+    error,
+    refetch,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = usePullRequests(repoId);
   const [query, setQuery] = useState("");
 
   const filtered = useMemo(
@@ -74,7 +84,14 @@ export function RepositoryDetailView({ repoId }: RepositoryDetailViewProps) {
       ) : isPending ? (
         <ListSkeleton count={5} />
       ) : (
-        <PullRequestList pullRequests={filtered} />
+        <>
+          <PullRequestList pullRequests={filtered} />
+          <LoadMoreButton
+            hasNextPage={hasNextPage}
+            isFetchingNextPage={isFetchingNextPage}
+            onLoadMore={() => fetchNextPage()}
+          />
+        </>
       )}
     </div>
   );
@@ -28,7 +28,8 @@ const ACTIONS: ActionDef[] = [
  * yet. Wiring guide once they do:
  *   1. Add a mutation hook (e.g. useRerunReview) calling the matching service
  *      method in services/pullRequests.ts / services/reviews.ts.
- *   2. On success, invalidate queryKeys.reviewIssues(prId) (and dashboard).
+ *   2. On success, invalidate queryKeys.reviewIssues(prId),
+ *      queryKeys.reviewSummary(prId) (and dashboard).
  *   3. Wrap destructive actions (Merge) in <ConfirmDialog/>.
  */
 export function ReviewActions({ prId }: { prId: number }) {
@@ -5,11 +5,13 @@ import { useMemo } from "react";
 import { CheckCircle2, ChevronLeft } from "lucide-react";
 
 import { useReviewIssues } from "@/hooks/useReviewIssues";
+import { useReviewSummary } from "@/hooks/useReviewSummary";
 import { groupIssuesByFile, summarizeIssues } from "@/lib/review";
 import { PageHeader } from "@/components/common/PageHeader";
 import { EmptyState } from "@/components/common/EmptyState";
 import { ErrorCard } from "@/components/common/ErrorCard";
 import { ReviewSkeleton } from "@/components/common/LoadingSkeleton";
+import { LoadMoreButton } from "@/components/common/LoadMoreButton";
 import { ReviewSummarySidebar } from "@/components/reviews/ReviewSummarySidebar";
 import { FileIssueSection } from "@/components/reviews/FileIssueSection";
 
@@ -21,14 +23,29 @@ interface ReviewDetailViewProps {
  * Review detail route container — the primary screen. Two-column layout:
  * a sticky summary rail and the file-grouped issue list.
  *
+ * Issues load a page at a time, with "Load more" below the list while more
+ * remain. The summary rail counts the whole review from the summary endpoint
+ * (the loaded pages stand in until it arrives).
+ *
  * NOTE: There is no single-PR endpoint yet, so PR title/number are not shown
  * here. TODO(backend): fetch GET /api/prs/{prId} to render richer PR metadata.
  */
 export function ReviewDetailView({ prId }: ReviewDetailViewProps) {
-  const { data: issues, isPending, isError, error, refetch } =
-    useReviewIssues(prId);
+  const {
+    data: issues,
+    isPending,
+    isError,
+    error,
+    refetch,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useReviewIssues(prId);
+
+  const { data: totals } = useReviewSummary(prId);
 
-  const summary = useMemo(() => summarizeIssues(issues ?? []), [issues]);
+  const loaded = useMemo(() => summarizeIssues(issues ?? []), [issues]);
+  const summary = totals ?? loaded;
   const groups = useMemo(() => groupIssuesByFile(issues ?? []), [issues]);
 
   return (
@@ -67,6 +84,11 @@ export function ReviewDetailView({ prId }: ReviewDetailViewProps) {
                 <FileIssueSection key={group.filePath} prId={prId} group={group} />
               ))
             )}
+            <LoadMoreButton
+              hasNextPage={hasNextPage}
+              isFetchingNextPage={isFetchingNextPage}
+              onLoadMore={() => fetchNextPage()}
+            />
           </div>
         </div>
       )}
@@ -5,7 +5,9 @@
 export const queryKeys = {
   dashboard: ["dashboard"] as const,
   repositories: ["repositories"] as const,
+  repositoryOverviews: (ids: number[]) => ["repositories", "overview", ids] as const,
   pullRequests: (repoId: number) => ["repositories", repoId, "prs"] as const,
   reviewIssues: (prId: number) => ["prs", prId, "issues"] as const,
+  reviewSummary: (prId: number) => ["prs", prId, "summary"] as const,
   reviewComments: (prId: number) => ["prs", prId, "comments"] as const,
 };
@@ -1,16 +1,20 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 
 import { pullRequestsService } from "@/services/pullRequests";
 import { queryKeys } from "@/hooks/queryKeys";
-import type { PullRequest } from "@/types";
+import { flattenPages } from "@/lib/api-client";
 
-/** Fetch pull requests for a repository. */
+/** Fetch pull requests for a repository, one page at a time. */
 export function usePullRequests(repoId: number | undefined) {
-  return useQuery<PullRequest[]>({
+  return useInfiniteQuery({
     queryKey: repoId ? queryKeys.pullRequests(repoId) : ["repositories", "pending", "prs"],
-    queryFn: () => pullRequestsService.getPullRequests(repoId as number),
+    queryFn: ({ pageParam }) =>
+      pullRequestsService.getPullRequests(repoId as number, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    select: flattenPages,
     enabled: typeof repoId === "number" && !Number.isNaN(repoId),
   });
 }
@@ -1,15 +1,21 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 
 import { repositoriesService } from "@/services/repositories";
 import { queryKeys } from "@/hooks/queryKeys";
-import type { Repository } from "@/types";
+import { flattenPages } from "@/lib/api-client";
 
-/** Fetch all repositories known to PRAuditor. */
+/**
+ * Fetch repositories known to PRAuditor, one page at a time. `data` is the
+ * rows loaded so far; call `fetchNextPage` while `hasNextPage` for more.
+ */
 export function useRepositories() {
-  return useQuery<Repository[]>({
+  return useInfiniteQuery({
     queryKey: queryKeys.repositories,
-    queryFn: () => repositoriesService.getRepositories(),
+    queryFn: ({ pageParam }) => repositoriesService.getRepositories(pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    select: flattenPages,
   });
 }
@@ -0,0 +1,22 @@
+"use client";
+
+import { keepPreviousData, useQuery } from "@tanstack/react-query";
+
+import { repositoriesService } from "@/services/repositories";
+import { queryKeys } from "@/hooks/queryKeys";
+import type { RepositoryOverview } from "@/types";
+
+/**
+ * Card stats for the given repositories, keyed by id: one request for the
+ * whole grid instead of one per card. Loading another page of repositories
+ * keeps showing the stats already fetched until the new ones arrive.
+ */
+export function useRepositoryOverviews(ids: number[]) {
+  return useQuery({
+    queryKey: queryKeys.repositoryOverviews(ids),
+    queryFn: () => repositoriesService.getOverviews(ids),
+    enabled: ids.length > 0,
+    placeholderData: keepPreviousData,
+    select: (rows: RepositoryOverview[]) => new Map(rows.map((row) => [row.id, row])),
+  });
+}
@@ -1,16 +1,20 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 
 import { reviewsService } from "@/services/reviews";
 import { queryKeys } from "@/hooks/queryKeys";
-import type { ReviewIssue } from "@/types";
+import { flattenPages } from "@/lib/api-client";
 
-/** Fetch the review issues for a pull request. */
+/** Fetch the review issues for a pull request, one page at a time. */
 export function useReviewIssues(prId: number | undefined) {
-  return useQuery<ReviewIssue[]>({
+  return useInfiniteQuery({
     queryKey: prId ? queryKeys.reviewIssues(prId) : ["prs", "pending", "issues"],
-    queryFn: () => reviewsService.getReviewIssues(prId as number),
+    queryFn: ({ pageParam }) =>
+      reviewsService.getReviewIssues(prId as number, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    select: flattenPages,
     enabled: typeof prId === "number" && !Number.isNaN(prId),
   });
 }
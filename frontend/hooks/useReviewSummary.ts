@@ -0,0 +1,17 @@
+"use client";
+
+import { useQuery } from "@tanstack/react-query";
+
+import { reviewsService } from "@/services/reviews";
+import { queryKeys } from "@/hooks/queryKeys";
+import { summarizeCounts } from "@/lib/review";
+
+/** Severity counts for a pull request's whole review, not just the loaded issue pages. */
+export function useReviewSummary(prId: number | undefined) {
+  return useQuery({
+    queryKey: prId ? queryKeys.reviewSummary(prId) : ["prs", "pending", "summary"],
+    queryFn: () => reviewsService.getSummary(prId as number),
+    select: summarizeCounts,
+    enabled: typeof prId === "number" && !Number.isNaN(prId),
+  });
+}
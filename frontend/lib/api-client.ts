@@ -35,6 +35,47 @@ interface RequestOptions extends Omit<RequestInit, "body"> {
 }
 
 async function request<T>(path: string, options: RequestOptions = {}): Promise<T> {
+  const response = await send(path, options);
+
+  // 204 No Content
+  if (response.status === 204) {
+    return undefined as T;
+  }
+
+  return (await response.json()) as T;
+}
+
+/** One page of a paginated list endpoint. */
+export interface Page<T> {
+  items: T[];
+  /** Pass back as `cursor` for the next page; null on the last page. */
+  nextCursor: string | null;
+}
+
+/** The rows of every page loaded so far, for `useInfiniteQuery`'s `select`. */
+export function flattenPages<T>(data: { pages: Page<T>[] }): T[] {
+  return data.pages.flatMap((page) => page.items);
+}
+
+/**
+ * GET one page of a paginated list endpoint. The backend returns up to
+ * `limit` rows per request and the cursor for the next page in
+ * `X-Next-Cursor`. Callers fetch further pages on demand (see the
+ * `useInfiniteQuery` hooks) rather than walking the whole list up front.
+ */
+async function getPage<T>(path: string, cursor?: string | null): Promise<Page<T>> {
+  const separator = path.includes("?") ? "&" : "?";
+  const pagePath = cursor
+    ? `${path}${separator}cursor=${encodeURIComponent(cursor)}`
+    : path;
+  const response = await send(pagePath, { method: "GET" });
+  return {
+    items: (await response.json()) as T[],
+    nextCursor: response.headers.get("X-Next-Cursor"),
+  };
+}
+
+async function send(path: string, options: RequestOptions = {}): Promise<Response> {
   const { body, headers, ...rest } = options;
 
   const response = await fetch(`${API_BASE_URL}${path}`, {
@@ -60,12 +101,7 @@ async function request<T>(path: string, options: RequestOptions = {}): Promise<T
     );
   }
 
-  // 204 No Content
-  if (response.status === 204) {
-    return undefined as T;
-  }
-
-  return (await response.json()) as T;
+  return response;
 }
 
 async function safeParse(response: Response): Promise<unknown> {
@@ -78,6 +114,7 @@ async function safeParse(response: Response): Promise<unknown> {
 
 export const apiClient = {
   get: <T>(path: string) => request<T>(path, { method: "GET" }),
+  getPage,
   post: <T>(path: string, body?: unknown) =>
     request<T>(path, { method: "POST", body }),
   put: <T>(path: string, body?: unknown) =>
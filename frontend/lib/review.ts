@@ -1,5 +1,6 @@
 import {
   type FileIssueGroup,
+  type PullRequestSummary,
   type ReviewIssue,
   type ReviewSummary,
   type RiskLevel,
@@ -62,6 +63,23 @@ export function summarizeIssues(issues: ReviewIssue[]): ReviewSummary {
   return summary;
 }
 
+/** Per-severity counts + risk placeholder from the backend's PR summary. */
+export function summarizeCounts(pr: PullRequestSummary): ReviewSummary {
+  const { critical, major, minor, info } = pr.issues;
+  const summary: ReviewSummary = {
+    total: critical + major + minor + info,
+    critical,
+    major,
+    minor,
+    info,
+    riskScore: null,
+    riskLevel: null,
+    reviewedAt: pr.last_reviewed_at,
+  };
+  summary.riskLevel = deriveRiskLevel(summary);
+  return summary;
+}
+
 /**
  * Coarse risk level derived from severity mix. This is a UI-side placeholder;
  * TODO: replace with the backend Risk Scoring agent (see Stage 4 roadmap)
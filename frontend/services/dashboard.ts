@@ -1,3 +1,4 @@
+import type { Page } from "@/lib/api-client";
 import type { DashboardStats, RecentReview } from "@/types";
 import { normalizeSeverity } from "@/lib/review";
 import { repositoriesService } from "@/services/repositories";
@@ -17,13 +18,17 @@ const RECENT_REVIEWS_LIMIT = 8;
  */
 export const dashboardService = {
   async getDashboardStats(): Promise<DashboardStats> {
-    const repositories = await repositoriesService.getRepositories();
+    const repositories = await allPages((cursor) =>
+      repositoriesService.getRepositories(cursor),
+    );
 
     // Fetch PRs for every repo in parallel.
     const prsByRepo = await Promise.all(
       repositories.map(async (repo) => ({
         repo,
-        prs: await pullRequestsService.getPullRequests(repo.id),
+        prs: await allPages((cursor) =>
+          pullRequestsService.getPullRequests(repo.id, cursor),
+        ),
       })),
     );
 
@@ -36,7 +41,9 @@ export const dashboardService = {
     // Fetch issues for reviewed PRs in parallel.
     const issuesByPr = await Promise.all(
       reviewedPrs.map(async ({ repo, pr }) => {
-        const issues = await reviewsService.getReviewIssues(pr.id);
+        const issues = await allPages((cursor) =>
+          reviewsService.getReviewIssues(pr.id, cursor),
+        );
         return { repo, pr, issues };
       }),
     );
@@ -77,6 +84,20 @@ export const dashboardService = {
   },
 };
 
+/** Every row of a paginated list; the totals above need all of them. */
+async function allPages<T>(
+  fetchPage: (cursor: string | null) => Promise<Page<T>>,
+): Promise<T[]> {
+  const rows: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await fetchPage(cursor);
+    rows.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return rows;
+}
+
 function sortByReviewedAtDesc(a: RecentReview, b: RecentReview): number {
   const ta = a.reviewedAt ? new Date(a.reviewedAt).getTime() : 0;
   const tb = b.reviewedAt ? new Date(b.reviewedAt).getTime() : 0;
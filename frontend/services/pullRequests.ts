@@ -1,4 +1,4 @@
-import {apiClient, NotImplementedError } from "@/lib/api-client";
+import {apiClient, NotImplementedError, type Page } from "@/lib/api-client";
 import type { PullRequest } from "@/types";
 
 //The shape the backend sends back when you trigger a re-review
@@ -9,8 +9,8 @@ export interface RerunReviewResponse {
 }
 
 export const pullRequestsService = {
-  getPullRequests(repoId: number): Promise<PullRequest[]> {
-    return apiClient.get(`/api/repos/${repoId}/prs`);
+  getPullRequests(repoId: number, cursor?: string | null): Promise<Page<PullRequest>> {
+    return apiClient.getPage<PullRequest>(`/api/repos/${repoId}/prs`, cursor);
   },
 
   getPullRequest(prId: number): Promise<PullRequest> {
@@ -1,8 +1,14 @@
-import { apiClient } from "@/lib/api-client";
-import type { Repository } from "@/types";
+import { apiClient, type Page } from "@/lib/api-client";
+import type { Repository, RepositoryOverview } from "@/types";
 
 export const repositoriesService = {
-  getRepositories(): Promise<Repository[]> {
-    return apiClient.get<Repository[]>("/api/repos/repositories");
+  getRepositories(cursor?: string | null): Promise<Page<Repository>> {
+    return apiClient.getPage<Repository>("/api/repos/repositories", cursor);
+  },
+
+  /** PR count, last review and critical count for many repositories in one request. */
+  getOverviews(ids: number[]): Promise<RepositoryOverview[]> {
+    const query = ids.map((id) => `ids=${id}`).join("&");
+    return apiClient.get<RepositoryOverview[]>(`/api/repos/overview?${query}`);
   },
 };
@@ -1,5 +1,10 @@
-import { apiClient, NotImplementedError } from "@/lib/api-client";
-import type { AddCommentInput, ReviewComment, ReviewIssue } from "@/types";
+import { apiClient, NotImplementedError, type Page } from "@/lib/api-client";
+import type {
+  AddCommentInput,
+  PullRequestSummary,
+  ReviewComment,
+  ReviewIssue,
+} from "@/types";
 
 /**
  * Reviews service. `getReviewIssues` is live. Comments map to endpoints the
@@ -7,11 +12,19 @@ import type { AddCommentInput, ReviewComment, ReviewIssue } from "@/types";
  */
 export const reviewsService = {
   /**
-   * GET /api/prs/{prId}/issues  ->  ReviewIssue[]
+   * GET /api/prs/{prId}/issues?cursor=  ->  one page of ReviewIssue[]
    * Implemented: exists on the backend today.
    */
-  getReviewIssues(prId: number): Promise<ReviewIssue[]> {
-    return apiClient.get<ReviewIssue[]>(`/api/prs/${prId}/issues`);
+  getReviewIssues(prId: number, cursor?: string | null): Promise<Page<ReviewIssue>> {
+    return apiClient.getPage<ReviewIssue>(`/api/prs/${prId}/issues`, cursor);
+  },
+
+  /**
+   * GET /api/prs/{prId}/summary  ->  issue counts by severity over the whole
+   * review, however many issue pages are loaded.
+   */
+  getSummary(prId: number): Promise<PullRequestSummary> {
+    return apiClient.get<PullRequestSummary>(`/api/prs/${prId}/summary`);
   },
 
   /**
@@ -38,6 +38,15 @@ export interface Repository {
   installation_id?: number | null;
 }
 
+/** Per-repository stats, as returned by GET /api/repos/overview. */
+export interface RepositoryOverview {
+  id: number;
+  name: string;
+  prs: number;
+  last_review: string | null;
+  critical: number;
+}
+
 export interface PullRequest {
   id: number;
   pr_number: number;
@@ -47,6 +56,18 @@ export interface PullRequest {
   last_reviewed_at: string | null;
 }
 
+/** GET /api/prs/{id}/summary: the PR plus its issue counts by severity. */
+export interface PullRequestSummary {
+  id: number;
+  repo: string;
+  pr_number: number;
+  title: string | null;
+  state: string | null;
+  head_sha: string | null;
+  last_reviewed_at: string | null;
+  issues: Record<"critical" | "major" | "minor" | "info", number>;
+}
+
 export interface ReviewIssue {
   id: number;
   file_path: string;
@@ -75,7 +96,7 @@ export interface AuthUser {
 // Derived / view-model types (computed on the frontend)
 // ---------------------------------------------------------------------------
 
-/** Aggregated counts for a single review, derived from its issues. */
+/** Aggregated counts for a single review. */
 export interface ReviewSummary {
   total: number;
   critical: number;
@@ -85,7 +106,7 @@ export interface ReviewSummary {
   /** Placeholder until a Risk Scoring agent exists on the backend. */
   riskScore: number | null;
   riskLevel: RiskLevel | null;
-  /** Latest issue timestamp, used as the review time. */
+  /** When the PR was last reviewed. */
   reviewedAt: string | null;
 }
 
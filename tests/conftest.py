@@ -0,0 +1,37 @@
+"""
+Test settings. Configuration is read at import time, so the environment is
+set up here, before anything under backend/ is imported.
+"""
+
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="prauditor-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["RESPONSE_CACHE_BUS"] = "memory"
+os.environ["GITHUB_WEBHOOK_SECRET"] = ""
+os.environ["REVIEW_DEBOUNCE_SECONDS"] = "0"
+os.environ["DIFF_CACHE_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def db_tables():
+    """Fresh tables for every test."""
+    from backend.core.database import Base, engine, init_db
+
+    init_db()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db(db_tables):
+    from backend.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
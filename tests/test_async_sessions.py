@@ -0,0 +1,121 @@
+"""The read routes and the webhook with DB_ASYNC=true (AsyncSession.run_sync)."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from backend import models  # noqa: E402
+from backend.core import database  # noqa: E402
+from backend.services import response_cache  # noqa: E402
+
+
+class LoopCheckingBus(response_cache.MemoryBus):
+    """Records whether each bus call ran on the event loop thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def version(self, scope):
+        self.calls.append(("version", _on_event_loop()))
+        return super().version(scope)
+
+    def bump(self, scope):
+        self.calls.append(("bump", _on_event_loop()))
+        super().bump(scope)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@pytest.fixture
+def async_db(monkeypatch):
+    url = database._async_url(database.engine.url.render_as_string(hide_password=False))
+    # NullPool: TestClient runs each request's loop in a portal thread.
+    engine = create_async_engine(url, poolclass=NullPool)
+    sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    opened = []
+
+    def session_factory():
+        opened.append(1)
+        return sessions()
+
+    monkeypatch.setattr(database, "AsyncSessionLocal", session_factory)
+    return opened
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = LoopCheckingBus()
+    monkeypatch.setattr(response_cache, "_response_cache", response_cache.ResponseCache(bus))
+    return bus
+
+
+@pytest.fixture
+def client():
+    from backend.main import app
+
+    return TestClient(app)
+
+
+def _seed(db):
+    repo = models.Repository(full_name="octo/repo", installation_id=1)
+    db.add(repo)
+    db.flush()
+    pr = models.PullRequest(repo_id=repo.id, pr_number=7, title="t", state="open", head_sha="a" * 40)
+    db.add(pr)
+    db.flush()
+    db.add(models.ReviewIssue(pr_id=pr.id, file_path="a.py", line=1, kind="logic", severity="major", message="m"))
+    db.commit()
+    return repo, pr
+
+
+def test_read_routes_run_on_async_sessions(db, async_db, bus, client):
+    repo, pr = _seed(db)
+
+    r = client.get("/api/dashboard")
+    assert r.status_code == 200
+    assert r.json()["repositories"] == 1
+    assert client.get("/api/dashboard", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+    summary = client.get(f"/api/prs/{pr.id}/summary")
+    assert summary.status_code == 200
+    assert summary.json()["issues"]["major"] == 1
+    issues = client.get(f"/api/prs/{pr.id}/issues")
+    assert [i["message"] for i in issues.json()] == ["m"]
+    assert client.get(f"/api/repos/{repo.id}").status_code == 200
+
+    assert async_db, "routes did not use the async session"
+    assert bus.calls and not any(on_loop for _, on_loop in bus.calls)
+
+
+def test_webhook_invalidates_off_the_event_loop(db, async_db, bus, client):
+    payload = {
+        "action": "opened",
+        "pull_request": {"number": 3, "title": "t", "state": "open", "head": {"sha": "b" * 40}},
+        "repository": {"full_name": "octo/repo"},
+        "installation": {"id": 1},
+    }
+    r = client.post(
+        "/api/webhook/github/webhook",
+        json=payload,
+        headers={"X-GitHub-Event": "pull_request", "X-GitHub-Delivery": "d-1"},
+    )
+    assert r.status_code == 202
+    assert db.query(models.ReviewJob).count() == 1
+
+    assert async_db
+    assert ("bump", False) in bus.calls
+    assert not any(on_loop for _, on_loop in bus.calls)
@@ -0,0 +1,69 @@
+"""Prompt batching: budget boundaries, hunk splits and stable ordering."""
+
+from backend.review.batching import chunk_tokens, pack_chunks, split_chunk
+from backend.review.types import DiffChunk
+
+
+def _chunk(path, *hunk_sizes):
+    lines = [f"diff --git a/{path} b/{path}", f"--- a/{path}", f"+++ b/{path}"]
+    start = 1
+    for n in hunk_sizes:
+        lines.append(f"@@ -{start},{n} +{start},{n} @@")
+        lines.extend(f"+line {start + i} of {path}" for i in range(n))
+        start += n + 10
+    return DiffChunk(path, "\n".join(lines))
+
+
+def _hunks(patch):
+    return [l for l in patch.split("\n") if not l.startswith(("diff ", "--- ", "+++ "))]
+
+
+def test_chunk_exactly_at_budget_is_not_split():
+    chunk = _chunk("a.py", 5, 5)
+    budget = chunk_tokens(chunk)
+    assert split_chunk(chunk, budget) == [chunk]
+    assert pack_chunks([chunk], budget) == [[chunk]]
+
+
+def test_chunks_filling_the_budget_exactly_share_a_batch():
+    a, b = _chunk("a.py", 4), _chunk("b.py", 4)
+    assert pack_chunks([a, b], chunk_tokens(a) + chunk_tokens(b)) == [[a, b]]
+    assert pack_chunks([a, b], chunk_tokens(a) + chunk_tokens(b) - 1) == [[a], [b]]
+
+
+def test_oversized_chunk_splits_on_hunk_boundaries():
+    chunk = _chunk("a.py", 6, 6, 6)
+    budget = chunk_tokens(chunk) - 1
+
+    pieces = split_chunk(chunk, budget)
+
+    assert len(pieces) == 2
+    header = chunk.patch.split("\n")[:3]
+    for piece in pieces:
+        assert piece.file_path == "a.py"
+        assert piece.patch.split("\n")[:3] == header
+        assert piece.patch.split("\n")[3].startswith("@@")
+        assert chunk_tokens(piece) <= budget
+    assert sum((_hunks(p.patch) for p in pieces), []) == _hunks(chunk.patch)
+
+
+def test_single_hunk_over_budget_is_kept_whole():
+    chunk = _chunk("a.py", 40)
+    assert split_chunk(chunk, chunk_tokens(chunk) // 2) == [chunk]
+    assert pack_chunks([chunk], chunk_tokens(chunk) // 2) == [[chunk]]
+
+
+def test_order_is_preserved_within_and_across_batches():
+    chunks = [_chunk(f"f{i}.py", n) for i, n in enumerate([2, 9, 3, 7, 1, 5, 8])]
+    budget = chunk_tokens(chunks[1]) + chunk_tokens(chunks[4])
+
+    batches = pack_chunks(chunks, budget)
+
+    index = {c.file_path: i for i, c in enumerate(chunks)}
+    positions = [[index[c.file_path] for c in batch] for batch in batches]
+    assert len(batches) > 1
+    assert sorted(i for batch in positions for i in batch) == list(range(len(chunks)))
+    assert all(batch == sorted(batch) for batch in positions)
+    assert [batch[0] for batch in positions] == sorted(batch[0] for batch in positions)
+    assert all(sum(chunk_tokens(c) for c in batch) <= budget for batch in batches)
+    assert pack_chunks(chunks, budget) == batches
@@ -0,0 +1,52 @@
+"""Shared HTTP clients: no cookies across users, opened and closed with the process."""
+
+import signal
+
+import httpx
+
+from backend import worker
+from backend.integrations.github.http import GitHubHTTP
+
+
+def test_github_client_refuses_cookies():
+    sent = []
+
+    def handler(request):
+        sent.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "_gh_sess=abc; Path=/; Domain=api.github.test"})
+
+    gh = GitHubHTTP(base_url="https://api.github.test", http2=False)
+    client = httpx.Client(**gh._options(), transport=httpx.MockTransport(handler))
+    client.get("/user", headers={"Authorization": "Bearer first"})
+    client.get("/user", headers={"Authorization": "Bearer second"})
+
+    assert sent == [None, None]
+    assert len(client.cookies.jar) == 0
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+
+    def open(self):
+        self.events.append("open")
+
+    def close(self):
+        self.events.append("close")
+
+
+def test_worker_opens_clients_and_closes_them_on_sigterm(monkeypatch):
+    handlers, github_http, llm = {}, _Recorder(), _Recorder()
+    monkeypatch.setattr(signal, "signal", lambda sig, handler: handlers.__setitem__(sig, handler))
+    monkeypatch.setattr(worker, "get_github_http", lambda: github_http)
+    monkeypatch.setattr(worker, "get_llm_client", lambda: llm)
+
+    def run_once(worker_id):
+        assert github_http.events == ["open"] and llm.events == ["open"]
+        handlers[signal.SIGTERM](signal.SIGTERM, None)
+        return True
+
+    monkeypatch.setattr(worker, "run_once", run_once)
+    worker.main()
+
+    assert github_http.events == ["open", "close"] and llm.events == ["open", "close"]
@@ -0,0 +1,65 @@
+"""PR diff cache: head verification and size-bounded eviction."""
+
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend import models
+from backend.integrations.github import diff_cache
+from backend.integrations.github.diff_cache import DiffCache
+
+DIFF = "diff --git a/a.py b/a.py\n@@ -1 +1 @@\n-x = 1\n+x = 2"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = DiffCache(max_bytes=10_000, enabled=True)
+    monkeypatch.setattr(diff_cache, "_diff_cache", cache)
+    monkeypatch.setattr(diff_cache, "iter_pr_diff_lines", lambda *a: iter(DIFF.split("\n")))
+    monkeypatch.setattr(diff_cache, "fetch_pr_diff", lambda *a: DIFF)
+    return cache
+
+
+def _head(monkeypatch, sha):
+    monkeypatch.setattr(diff_cache, "fetch_pr_head_sha", lambda *a: sha)
+
+
+def test_streamed_diff_is_cached_when_head_matches(db, cache, monkeypatch):
+    _head(monkeypatch, "a" * 40)
+    assert list(diff_cache.iter_cached_pr_diff_lines("o/r", 1, "a" * 40, 1)) == DIFF.split("\n")
+    assert cache.get("o/r", 1, "a" * 40) is not None
+
+
+def test_diff_of_a_newer_head_is_not_cached(db, cache, monkeypatch):
+    _head(monkeypatch, "b" * 40)
+    list(diff_cache.iter_cached_pr_diff_lines("o/r", 1, "a" * 40, 1))
+    assert diff_cache.get_cached_pr_diff("o/r", 1, "a" * 40, 1) == DIFF
+    assert db.query(models.PrDiff).count() == 0
+
+
+def test_head_check_failure_skips_caching(db, cache, monkeypatch):
+    def fail(*a):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(diff_cache, "fetch_pr_head_sha", fail)
+    assert diff_cache.get_cached_pr_diff("o/r", 1, "a" * 40, 1) == DIFF
+    assert db.query(models.PrDiff).count() == 0
+
+
+def test_eviction_drops_least_recently_read(db):
+    cache = DiffCache(max_bytes=250, enabled=True)
+    now = datetime.utcnow()
+    for i in range(3):
+        db.add(
+            models.PrDiff(
+                repo_full_name="o/r", pr_number=i, head_sha="a" * 40, data=b"x" * 100,
+                size=100, raw_size=100, created_at=now, accessed_at=now - timedelta(minutes=10 - i),
+            )
+        )
+    db.commit()
+
+    cache.put("o/r", 9, "a" * 40, zlib.compress(b"y"), 1)
+
+    db.expire_all()
+    assert sorted(r.pr_number for r in db.query(models.PrDiff)) == [1, 2, 9]
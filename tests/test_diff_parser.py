@@ -0,0 +1,43 @@
+"""Diff parser size limits: dropped files are reported, not just logged."""
+
+import io
+
+from backend.review.diff_parser import TRUNCATED, iter_unified_diff
+from backend.review.filters import filter_chunks
+
+
+def _file(path, added):
+    lines = [f"diff --git a/{path} b/{path}", f"--- a/{path}", f"+++ b/{path}", f"@@ -0,0 +1,{len(added)} @@"]
+    return "\n".join(lines + [f"+{l}" for l in added]) + "\n"
+
+
+def _parse(diff, **limits):
+    skipped = []
+    chunks = list(iter_unified_diff(io.StringIO(diff), skipped=skipped, **limits))
+    return [c.file_path for c in chunks], skipped
+
+
+def test_oversized_file_is_reported_as_skipped():
+    diff = _file("small.py", ["x = 1"]) + _file("big.py", ["y" * 500]) + _file("last.py", ["z = 2"])
+    kept, skipped = _parse(diff, max_file_bytes=200)
+    assert kept == ["small.py", "last.py"]
+    assert [(s.file_path, s.reason) for s in skipped] == [("big.py", "too large")]
+    assert skipped[0].bytes > 500
+
+
+def test_oversized_last_file_is_reported():
+    kept, skipped = _parse(_file("a.py", ["x"]) + _file("big.py", ["y" * 500]), max_file_bytes=200)
+    assert kept == ["a.py"] and [s.file_path for s in skipped] == ["big.py"]
+
+
+def test_total_cap_reports_the_partial_file():
+    diff = _file("a.py", ["x = 1"]) + _file("b.py", ["y" * 80] * 5) + _file("c.py", ["z"])
+    kept, skipped = _parse(diff, max_total_bytes=300)
+    assert kept == ["a.py"]
+    assert [(s.file_path, s.reason) for s in skipped] == [("b.py", TRUNCATED)]
+
+
+def test_filters_leave_size_to_the_parser():
+    chunks = list(iter_unified_diff(io.StringIO(_file("a.py", ["x" * 1000])), max_file_bytes=10_000))
+    kept, skipped = filter_chunks(chunks)
+    assert [c.file_path for c in kept] == ["a.py"] and skipped == []
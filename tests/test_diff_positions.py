@@ -0,0 +1,86 @@
+"""Diff positions: line mapping across hunks, snapping, context trimming, line checks."""
+
+from backend.review.diff_parser import parse_hunks, parse_unified_diff, trim_context
+from backend.review.pipeline import _check_lines
+from backend.review.types import Issue
+
+PATCH = "\n".join(
+    [
+        "diff --git a/src/x.py b/src/x.py",
+        "--- a/src/x.py",
+        "+++ b/src/x.py",
+        "@@ -1,3 +1,4 @@ def f():",
+        " a",
+        "-b",
+        "+B",
+        "+B2",
+        " c",
+        "@@ -20,2 +21,2 @@ def g():",
+        " x",
+        "-y",
+        "+Y",
+    ]
+) + "\n"
+
+
+def _chunk():
+    (chunk,) = parse_unified_diff(PATCH)
+    return chunk
+
+
+def _issue(path="src/x.py", line=None):
+    return Issue(file_path=path, line=line, kind="logic", severity="minor", message="m", suggestion=None)
+
+
+def test_lines_map_to_positions_across_hunks():
+    chunk = _chunk()
+    assert [(h.position, h.new_lines) for h in chunk.hunks] == [
+        (0, {1: 1, 2: 3, 3: 4, 4: 5}),
+        (6, {21: 7, 22: 9}),
+    ]
+    assert chunk.position_for_line(3) == 4
+    assert chunk.position_for_line(22) == 9
+    assert chunk.position_for_line(10) is None
+
+
+def test_nearest_line_snaps_to_the_closest_hunk():
+    chunk = _chunk()
+    assert chunk.nearest_line(10) == 4
+    assert chunk.nearest_line(19) == 21
+    assert chunk.nearest_line(22) == 22
+
+
+def test_trim_context_keeps_line_numbers():
+    trimmed = trim_context(_chunk(), 0)
+    body = trimmed.patch.split("\n")[3:]
+    assert body == [
+        "@@ -2,1 +2,2 @@ def f():",
+        "-b",
+        "+B",
+        "+B2",
+        "@@ -21,1 +22,1 @@ def g():",
+        "-y",
+        "+Y",
+    ]
+    assert [sorted(h.new_lines) for h in parse_hunks(trimmed.patch.split("\n"))] == [[2, 3], [22]]
+
+
+def test_trim_context_keeps_requested_context():
+    assert trim_context(_chunk(), 3).patch == PATCH.rstrip("\n")
+
+
+def test_check_lines_normalizes_paths_and_snaps_lines():
+    issues = [
+        _issue("b/src/x.py", 3),
+        _issue("./src/x.py", "22"),
+        _issue("a/src/x.py", 6),
+        _issue("src/x.py", 12),
+        _issue("src/other.py", 1),
+    ]
+    checked = _check_lines(issues, [_chunk()])
+    assert [(i.file_path, i.line) for i in checked] == [
+        ("src/x.py", 3),
+        ("src/x.py", 22),
+        ("src/x.py", 4),
+        ("src/x.py", None),
+    ]
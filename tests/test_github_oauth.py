@@ -0,0 +1,26 @@
+"""OAuth profile calls bypass the conditional cache."""
+
+import httpx
+
+from backend.integrations.github.conditional import get_conditional_cache
+from backend.services import github_oauth
+
+
+def test_profile_calls_are_not_cached(monkeypatch):
+    def handler(request):
+        assert "if-none-match" not in request.headers
+        if request.url.path == "/user":
+            return httpx.Response(200, json={"login": "octocat"}, headers={"etag": '"u1"'})
+        return httpx.Response(
+            200, json=[{"email": "o@example.com", "primary": True, "verified": True}], headers={"etag": '"e1"'}
+        )
+
+    client = httpx.Client(transport=httpx.MockTransport(handler), base_url="https://api.github.test")
+    monkeypatch.setattr(github_oauth, "github_client", lambda: client)
+    before = get_conditional_cache().stats()
+
+    for token in ("gho_first", "gho_second"):
+        assert github_oauth.fetch_github_user(token) == {"login": "octocat"}
+        assert github_oauth.fetch_primary_email(token) == "o@example.com"
+
+    assert get_conditional_cache().stats() == before
@@ -0,0 +1,80 @@
+"""Installation tokens: single-flight minting, early refresh, and retry after a 401."""
+
+import threading
+import time
+
+import httpx
+
+from backend.integrations.github import app_auth, client
+from backend.integrations.github.app_auth import InstallationTokenCache, _CachedToken
+
+
+def _minter(monkeypatch, delay=0.0):
+    calls = []
+
+    def mint(installation_id):
+        calls.append(installation_id)
+        time.sleep(delay)
+        return f"token-{len(calls)}", time.time() + 3600
+
+    monkeypatch.setattr(app_auth, "_request_installation_token", mint)
+    return calls
+
+
+def test_concurrent_misses_mint_once(monkeypatch):
+    calls = _minter(monkeypatch, delay=0.05)
+    cache = InstallationTokenCache()
+    start = threading.Barrier(8)
+    tokens = []
+
+    def get():
+        start.wait()
+        tokens.append(cache.get(1))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == [1] and tokens == ["token-1"] * 8
+
+
+def test_token_about_to_expire_is_replaced_before_use(monkeypatch):
+    calls = _minter(monkeypatch)
+    cache = InstallationTokenCache()
+    cache._tokens[1] = _CachedToken("old", time.time() + app_auth.TOKEN_EXPIRY_MARGIN - 1)
+
+    assert cache.get(1) == "token-1" and calls == [1]
+
+
+def test_token_near_expiry_is_refreshed_in_the_background(monkeypatch):
+    calls = _minter(monkeypatch)
+    cache = InstallationTokenCache()
+    cache._tokens[1] = _CachedToken("old", time.time() + app_auth.TOKEN_REFRESH_MARGIN - 1)
+
+    assert cache.get(1) == "old"
+    deadline = time.monotonic() + 5
+    while cache._tokens[1].token == "old" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache._tokens[1].token == "token-1" and calls == [1]
+    assert cache.get(1) == "token-1"
+
+
+def test_revoked_token_is_replaced_and_the_request_retried(monkeypatch):
+    current = {"token": "revoked"}
+    sent = []
+
+    def handler(request):
+        sent.append(request.headers["authorization"])
+        return httpx.Response(401 if request.headers["authorization"] == "token revoked" else 201)
+
+    http = httpx.Client(transport=httpx.MockTransport(handler), base_url="https://api.github.test")
+    monkeypatch.setattr(client, "github_client", lambda: http)
+    monkeypatch.setattr(client, "send_with_rate_limit", lambda installation_id, send, **kw: send())
+    monkeypatch.setattr(client, "get_installation_token", lambda installation_id: current["token"])
+    monkeypatch.setattr(client, "invalidate_installation_token", lambda installation_id: current.update(token="fresh"))
+
+    client.post_pr_comment("octo/repo", 1, "body", 1)
+
+    assert sent == ["token revoked", "token fresh"]
@@ -0,0 +1,123 @@
+"""Review jobs: coalescing on enqueue, heartbeat and owner-only completion."""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend import models
+from backend.services import job_queue
+
+
+@pytest.fixture
+def pr(db):
+    repo = models.Repository(full_name="octo/repo", installation_id=1)
+    db.add(repo)
+    db.flush()
+    pr = models.PullRequest(repo_id=repo.id, pr_number=1, head_sha="a" * 40)
+    db.add(pr)
+    db.commit()
+    return pr
+
+
+@pytest.fixture
+def job(db, pr):
+    job_queue.enqueue_review(db, pr, 1)
+    return job_queue.claim_next_job(db, "w1")
+
+
+def _steal(db, job):
+    """Let w1's lease expire and have w2 claim the job."""
+    job.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    stolen = job_queue.claim_next_job(db, "w2")
+    assert stolen.id == job.id and stolen.locked_by == "w2"
+    return stolen
+
+
+def test_owner_completes_job(db, job):
+    assert job_queue.complete_job(db, job, "w1")
+    db.refresh(job)
+    assert job.status == job_queue.DONE and job.locked_by is None
+
+
+def test_lost_lease_makes_completion_a_no_op(db, job):
+    _steal(db, job)
+    for release in (
+        lambda: job_queue.complete_job(db, job, "w1"),
+        lambda: job_queue.fail_job(db, job, "w1", "boom"),
+        lambda: job_queue.defer_job(db, job, "w1", 5, "rate limited"),
+        lambda: job_queue.supersede_job(db, job, "w1"),
+    ):
+        assert not release()
+    db.refresh(job)
+    assert job.status == job_queue.RUNNING and job.locked_by == "w2" and job.attempts == 2
+
+
+def test_owner_failure_requeues_with_backoff(db, job):
+    assert job_queue.fail_job(db, job, "w1", "boom")
+    db.refresh(job)
+    assert job.status == job_queue.QUEUED and job.last_error == "boom"
+    assert job.run_after > datetime.utcnow()
+
+
+def test_extend_lease_only_for_owner(db, job):
+    job.locked_until = datetime.utcnow() + timedelta(seconds=1)
+    db.commit()
+    assert job_queue.extend_lease(db, job.id, "w1")
+    db.refresh(job)
+    assert job.locked_until > datetime.utcnow() + timedelta(seconds=60)
+    assert not job_queue.extend_lease(db, job.id, "w2")
+
+
+def test_heartbeat_keeps_lease_and_notices_takeover(db, job):
+    job.locked_until = datetime.utcnow() + timedelta(seconds=1)
+    db.commit()
+    with job_queue.JobHeartbeat(job.id, "w1", interval=0.01) as heartbeat:
+        time.sleep(0.1)
+        db.refresh(job)
+        assert job.locked_until > datetime.utcnow() + timedelta(seconds=60)
+        assert not heartbeat.lost.is_set()
+        db.commit()
+
+        # Take the job over directly: expiring the lease for _steal would
+        # race with the heartbeat renewing it.
+        job.locked_by = "w2"
+        db.commit()
+        deadline = time.monotonic() + 2
+        while not heartbeat.lost.is_set() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert heartbeat.lost.is_set()
+
+
+def test_push_to_same_head_updates_the_pending_job(db, pr):
+    first = job_queue.enqueue_review(db, pr, 1)
+    second = job_queue.enqueue_review(db, pr, 2)
+
+    assert second.id == first.id and second.installation_id == 2
+    assert db.query(models.ReviewJob).count() == 1
+
+
+def test_newer_head_supersedes_queued_and_running_jobs(db, pr, job):
+    pr.head_sha = "b" * 40
+    db.commit()
+    queued = job_queue.enqueue_review(db, pr, 1)
+    pr.head_sha = "c" * 40
+    db.commit()
+    latest = job_queue.enqueue_review(db, pr, 1)
+
+    db.refresh(job)
+    db.refresh(queued)
+    assert job.status == job_queue.SUPERSEDED and job.locked_by is None
+    assert queued.status == job_queue.SUPERSEDED
+    assert latest.status == job_queue.QUEUED and latest.head_sha == "c" * 40
+    assert not job_queue.extend_lease(db, job.id, "w1")
+    assert not job_queue.complete_job(db, job, "w1")
+
+
+def test_running_job_for_the_same_head_is_left_alone(db, pr, job):
+    queued = job_queue.enqueue_review(db, pr, 1)
+
+    db.refresh(job)
+    assert job.status == job_queue.RUNNING and job.locked_by == "w1"
+    assert queued.id != job.id and queued.status == job_queue.QUEUED
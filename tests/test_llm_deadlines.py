@@ -0,0 +1,116 @@
+"""Agent calls are bounded by a deadline and share one process-wide pool."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from backend.integrations.llm.client import LLMClient
+from backend.review import pipeline
+from backend.review.types import DiffChunk
+
+
+def _client(handler, **kwargs):
+    client = LLMClient(api_url="https://llm.test/v1/chat", **kwargs)
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _async_client(handler, **kwargs):
+    client = LLMClient(api_url="https://llm.test/v1/chat", **kwargs)
+    client._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _reply(content="[]"):
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+def test_request_timeout_is_cut_to_the_deadline():
+    seen = []
+
+    def handler(request):
+        seen.append(request.extensions["timeout"])
+        return _reply()
+
+    client = _client(handler, read_timeout=60)
+    assert client.chat([], deadline=time.monotonic() + 2) == "[]"
+    assert 0 < seen[0]["read"] <= 2 and seen[0]["connect"] <= 2
+
+
+def test_past_deadline_raises_without_calling():
+    calls = []
+    client = _client(lambda r: calls.append(r) or _reply())
+    with pytest.raises(TimeoutError):
+        client.chat([], deadline=time.monotonic() - 1)
+    assert calls == []
+
+
+def test_retry_that_would_overrun_the_deadline_gives_up():
+    client = _client(lambda r: httpx.Response(503, headers={"Retry-After": "20"}), max_retries=3)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        client.chat([], deadline=started + 1)
+    assert time.monotonic() - started < 1
+
+
+def test_async_request_timeout_is_cut_to_the_deadline():
+    seen = []
+
+    def handler(request):
+        seen.append(request.extensions["timeout"])
+        return _reply()
+
+    client = _async_client(handler, read_timeout=60)
+    assert asyncio.run(client.achat([], deadline=time.monotonic() + 2)) == "[]"
+    assert 0 < seen[0]["read"] <= 2 and seen[0]["connect"] <= 2
+
+
+def test_async_past_deadline_raises_without_calling():
+    calls = []
+    client = _async_client(lambda r: calls.append(r) or _reply())
+    with pytest.raises(TimeoutError):
+        asyncio.run(client.achat([], deadline=time.monotonic() - 1))
+    assert calls == []
+
+
+def test_async_retry_that_would_overrun_the_deadline_gives_up():
+    client = _async_client(lambda r: httpx.Response(503, headers={"Retry-After": "20"}), max_retries=3)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        asyncio.run(client.achat([], deadline=started + 1))
+    assert time.monotonic() - started < 1
+
+
+def _chunk(path="a.py"):
+    return DiffChunk(file_path=path, patch="@@ -1 +1 @@\n-x\n+y\n")
+
+
+def test_agents_share_one_pool_and_get_a_deadline(monkeypatch):
+    deadlines, threads = [], set()
+
+    def agent(batch, deadline):
+        deadlines.append(deadline - time.monotonic())
+        threads.add(threading.current_thread().name)
+        return []
+
+    monkeypatch.setattr(pipeline, "AGENTS", [("logic", agent)])
+    assert pipeline._agent_pool() is pipeline._agent_pool()
+
+    tasks = [(0, [_chunk()]), (0, [_chunk("b.py")])]
+    assert pipeline._run_tasks(tasks, timeout=30) == [[], []]
+    assert all(25 < d <= 30 for d in deadlines)
+    assert all(name.startswith("review-agent") for name in threads)
+
+
+def test_timed_out_task_is_dropped_and_others_kept(monkeypatch):
+    def agent(batch, deadline):
+        if batch[0].file_path == "slow.py":
+            raise TimeoutError("LLM call ran past its deadline")
+        return []
+
+    monkeypatch.setattr(pipeline, "AGENTS", [("logic", agent)])
+    outcomes = pipeline._run_tasks([(0, [_chunk("slow.py")]), (0, [_chunk()])], timeout=1)
+    assert outcomes == [None, []]
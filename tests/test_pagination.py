@@ -0,0 +1,92 @@
+"""Keyset pagination: cursor encoding and page boundaries."""
+
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from backend import models
+from backend.api.pagination import _decode, _encode, paginate
+
+ISSUE_KEY = (models.ReviewIssue.created_at, models.ReviewIssue.id)
+
+
+@pytest.fixture
+def pr(db):
+    repo = models.Repository(full_name="octo/repo", installation_id=1)
+    db.add(repo)
+    db.flush()
+    pr = models.PullRequest(repo_id=repo.id, pr_number=1)
+    db.add(pr)
+    db.commit()
+    return pr
+
+
+def _token(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "columns, values",
+    [
+        (ISSUE_KEY, [datetime(2024, 5, 1, 12, 30, 45, 123456), 42]),
+        ((models.Repository.full_name,), ["octo/répo"]),
+        ((models.PullRequest.pr_number,), [7]),
+    ],
+)
+def test_cursor_round_trip(columns, values):
+    cursor = _encode(values)
+    assert "=" not in cursor
+    assert _decode(cursor, columns) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        _token({"created_at": "2024-01-01"}),
+        _token(["2024-01-01T00:00:00"]),
+        _token(["2024-01-01T00:00:00", 1, 2]),
+        _token(["yesterday", 1]),
+        _token([5, 1]),
+        _token(["2024-01-01T00:00:00", "1 OR 1=1"]),
+        _token(["2024-01-01T00:00:00", True]),
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as e:
+        _decode(cursor, ISSUE_KEY)
+    assert e.value.status_code == 400
+
+
+def test_pages_split_rows_that_tie_on_the_sort_key(db, pr):
+    same_time = datetime(2024, 1, 1)
+    for i in range(5):
+        db.add(
+            models.ReviewIssue(
+                pr_id=pr.id, file_path="a.py", line=i, kind="logic",
+                severity="minor", message=f"m{i}", created_at=same_time,
+            )
+        )
+    db.commit()
+
+    query = db.query(models.ReviewIssue).filter(models.ReviewIssue.pr_id == pr.id)
+    seen, cursor = [], None
+    while True:
+        rows, cursor = paginate(query, ISSUE_KEY, 2, cursor, descending=True)
+        seen.extend(r.id for r in rows)
+        if cursor is None:
+            break
+    assert seen == sorted(seen, reverse=True) and len(set(seen)) == 5
+
+
+def test_endpoint_rejects_tampered_cursor(pr):
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    r = TestClient(app).get(f"/api/prs/{pr.id}/issues", params={"cursor": _token(["x", 1])})
+    assert r.status_code == 400
@@ -0,0 +1,102 @@
+"""GitHub rate limiting: 304 accounting and published budget snapshots."""
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import models
+from backend.integrations.github import conditional
+from backend.integrations.github.conditional import NOT_MODIFIED, ConditionalCache
+from backend.integrations.github.rate_limit import RateLimiter
+
+
+def _limiter(**kwargs):
+    return RateLimiter(reserve=0, **kwargs)
+
+
+def _response(status=200, **headers):
+    return httpx.Response(status, headers={k.replace("_", "-"): str(v) for k, v in headers.items()})
+
+
+def test_replayed_304_gives_its_token_back():
+    limiter = _limiter()
+    limiter.record(1, _response(x_ratelimit_limit=5000, x_ratelimit_remaining=10))
+    limiter.acquire(1)
+    limiter.record(1, httpx.Response(200, extensions={NOT_MODIFIED: True}))
+    assert limiter._buckets[1].remaining == 10
+
+
+def test_fresh_response_without_headers_keeps_the_spend():
+    limiter = _limiter()
+    limiter.record(1, _response(x_ratelimit_limit=5000, x_ratelimit_remaining=10))
+    limiter.acquire(1)
+    limiter.record(1, httpx.Response(200))
+    assert limiter._buckets[1].remaining == 9
+
+
+def test_conditional_replay_carries_rate_limit_headers(monkeypatch):
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"x-ratelimit-remaining": "4999"})
+        return httpx.Response(200, json={"ok": True}, headers={"etag": '"v1"', "x-ratelimit-remaining": "4998"})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler), base_url="https://api.github.test")
+    monkeypatch.setattr(conditional, "github_client", lambda: client)
+    cache = ConditionalCache(max_bytes=1 << 20)
+
+    first = cache.get("/user", {}, "installation:1")
+    assert not first.extensions.get(NOT_MODIFIED)
+    replay = cache.get("/user", {}, "installation:1")
+    assert replay.status_code == 200 and replay.json() == {"ok": True}
+    assert replay.extensions[NOT_MODIFIED] and replay.headers["x-ratelimit-remaining"] == "4999"
+
+
+def test_snapshots_are_throttled_and_rejections_published_at_once(db):
+    now = [1_000_000.0]
+    limiter = _limiter(clock=lambda: now[0], snapshot_interval=10)
+    reset = now[0] + 3600
+
+    limiter.record(7, _response(x_ratelimit_limit=5000, x_ratelimit_remaining=4000, x_ratelimit_reset=reset))
+    limiter.record(7, _response(x_ratelimit_remaining=3999))
+    row = db.get(models.GitHubRateLimit, 7)
+    assert (row.limit, row.remaining) == (5000, 4000)
+    assert row.reset_at == datetime.utcfromtimestamp(reset)
+
+    limiter.record(7, _response(429, retry_after=30, x_ratelimit_remaining=3990))
+    db.expire_all()
+    row = db.get(models.GitHubRateLimit, 7)
+    assert row.remaining == 3990
+    assert row.paused_until == datetime.utcfromtimestamp(now[0] + 30)
+
+
+@pytest.fixture
+def client():
+    from backend.main import app
+
+    return TestClient(app)
+
+
+def test_endpoint_serves_published_snapshots(db, client):
+    now = datetime.utcnow()
+    db.add_all(
+        [
+            models.GitHubRateLimit(
+                installation_id=1, limit=5000, remaining=12,
+                reset_at=now + timedelta(minutes=10), paused_until=now + timedelta(seconds=30),
+                updated_at=now,
+            ),
+            models.GitHubRateLimit(
+                installation_id=2, limit=5000, remaining=0,
+                reset_at=now - timedelta(minutes=1), updated_at=now - timedelta(hours=1),
+            ),
+        ]
+    )
+    db.commit()
+
+    body = client.get("/api/github/rate-limits").json()
+    assert body["1"]["remaining"] == 12 and 590 < body["1"]["reset_in"] <= 600
+    assert 0 < body["1"]["paused_for"] <= 30
+    # The reset has passed since the snapshot: reported refilled.
+    assert body["2"]["remaining"] == 5000 and body["2"]["reset_in"] is None
@@ -0,0 +1,59 @@
+"""Repository overview: per-repo aggregates in one query, and the ids filter."""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import models
+from backend.api.repos import _overview, _overview_query
+
+
+@pytest.fixture
+def repos(db):
+    alpha = models.Repository(full_name="octo/alpha", installation_id=1)
+    beta = models.Repository(full_name="octo/beta", installation_id=1)
+    empty = models.Repository(full_name="octo/empty", installation_id=1)
+    db.add_all([alpha, beta, empty])
+    db.flush()
+    db.add_all(
+        [
+            models.PullRequest(repo_id=alpha.id, pr_number=1, last_reviewed_at=datetime(2024, 5, 1)),
+            models.PullRequest(repo_id=alpha.id, pr_number=2, last_reviewed_at=datetime(2024, 6, 1)),
+            models.PullRequest(repo_id=alpha.id, pr_number=3),
+            models.PullRequest(repo_id=beta.id, pr_number=1),
+            models.SeverityRollup(repo_id=alpha.id, severity="critical", count=4),
+            models.SeverityRollup(repo_id=alpha.id, severity="major", count=9),
+            models.SeverityRollup(repo_id=beta.id, severity="minor", count=2),
+        ]
+    )
+    db.commit()
+    return alpha, beta, empty
+
+
+def test_overview_counts_and_latest_review(db, repos):
+    rows = {row["name"]: row for row in map(_overview, _overview_query(db).all())}
+    assert rows["octo/alpha"] == {
+        "id": repos[0].id,
+        "name": "octo/alpha",
+        "prs": 3,
+        "last_review": "2024-06-01T00:00:00",
+        "critical": 4,
+    }
+    assert rows["octo/beta"]["prs"] == 1 and rows["octo/beta"]["critical"] == 0
+    assert rows["octo/empty"] == {
+        "id": repos[2].id,
+        "name": "octo/empty",
+        "prs": 0,
+        "last_review": None,
+        "critical": 0,
+    }
+
+
+def test_overview_endpoint_filters_by_ids(repos):
+    from backend.main import app
+
+    alpha, _, empty = repos
+    r = TestClient(app).get("/api/repos/overview", params={"ids": [empty.id, alpha.id]})
+    assert r.status_code == 200
+    assert [row["name"] for row in r.json()] == ["octo/alpha", "octo/empty"]
@@ -0,0 +1,41 @@
+"""Response cache version buses and rollup invalidation."""
+
+from backend import models
+from backend.services import response_cache
+from backend.services.response_cache import DASHBOARD_SCOPE, SQLiteBus
+from backend.services.rollups import rebuild_severity_rollups
+
+
+def test_sqlite_bus_reads_without_writing(tmp_path):
+    bus = SQLiteBus(str(tmp_path / "bus.db"))
+    token = bus.version("pr:1")
+    conn = bus._conn()
+    writes = conn.total_changes
+
+    assert bus.version("pr:1") == token
+    assert bus.version("pr:1") == token
+    assert conn.total_changes == writes
+
+
+def test_sqlite_bus_bump_changes_token_across_connections(tmp_path):
+    path = str(tmp_path / "bus.db")
+    reader, writer = SQLiteBus(path), SQLiteBus(path)
+    before = reader.version("dashboard")
+    writer.bump("dashboard")
+    assert reader.version("dashboard") != before
+
+
+def test_rollup_rebuild_invalidates_dashboard(db):
+    bus = response_cache.get_response_cache().bus
+    repo = models.Repository(full_name="octo/repo", installation_id=1)
+    db.add(repo)
+    db.flush()
+    pr = models.PullRequest(repo_id=repo.id, pr_number=1)
+    db.add(pr)
+    db.flush()
+    db.add(models.ReviewIssue(pr_id=pr.id, file_path="a.py", line=1, kind="logic", severity="major", message="m"))
+    db.commit()
+
+    before = bus.version(DASHBOARD_SCOPE)
+    assert rebuild_severity_rollups(db) == 1
+    assert bus.version(DASHBOARD_SCOPE) != before
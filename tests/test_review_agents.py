@@ -0,0 +1,54 @@
+"""Agent output parsing and what the pipeline caches from it."""
+
+import pytest
+
+from backend.review import agents, pipeline
+from backend.review.cache import ResultCache
+from backend.review.types import DiffChunk
+
+
+def _chunk(path="a.py"):
+    return DiffChunk(file_path=path, patch=f"@@ -1 +1 @@\n-x = 1\n+x = 2  # {path}\n")
+
+
+@pytest.mark.parametrize("reply", ["sorry, I can't", '{"issues": []}', "[{broken"])
+def test_unparseable_reply_raises(monkeypatch, reply):
+    monkeypatch.setattr(agents, "chat", lambda *a, **k: reply)
+    with pytest.raises(agents.AgentOutputError):
+        agents.logic_agent([_chunk()])
+
+
+def test_json_array_with_surrounding_text_is_parsed(monkeypatch):
+    reply = 'Here you go:\n[{"file_path": "a.py", "line": 1, "message": "m"}]\nThanks'
+    monkeypatch.setattr(agents, "chat", lambda *a, **k: reply)
+    issues = agents.logic_agent([_chunk()])
+    assert [(i.file_path, i.kind, i.message) for i in issues] == [("a.py", "logic", "m")]
+
+
+def test_empty_array_is_a_valid_result(monkeypatch):
+    monkeypatch.setattr(agents, "chat", lambda *a, **k: "[]")
+    assert agents.logic_agent([_chunk()]) == []
+
+
+def test_failed_agent_output_is_not_cached(monkeypatch):
+    cache = ResultCache(persistent=False)
+    monkeypatch.setattr(pipeline, "REVIEW_CACHE_ENABLED", True)
+    monkeypatch.setattr(pipeline, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(agents, "chat", lambda *a, **k: "not json")
+
+    results, failed = pipeline._run_agents([_chunk()], timeout=5)
+
+    assert results == [[] for _ in pipeline.AGENTS]
+    assert failed == {(kind, "a.py") for kind, _ in pipeline.AGENTS}
+    assert cache.stats()["memory_entries"] == 0
+
+
+def test_successful_agent_output_is_cached(monkeypatch):
+    cache = ResultCache(persistent=False)
+    monkeypatch.setattr(pipeline, "REVIEW_CACHE_ENABLED", True)
+    monkeypatch.setattr(pipeline, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(agents, "chat", lambda *a, **k: "[]")
+
+    pipeline._run_agents([_chunk()], timeout=5)
+
+    assert cache.stats()["memory_entries"] == len(pipeline.AGENTS)
@@ -0,0 +1,105 @@
+"""run_and_store_review: incremental scope and comment posting."""
+
+import pytest
+
+from backend import models
+from backend.integrations.github.rate_limit import RateLimited
+from backend.services import review_service
+
+DIFF = (
+    "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-x = 1\n+x = 2\n"
+    "diff --git a/b.py b/b.py\n--- a/b.py\n+++ b/b.py\n@@ -1 +1 @@\n-y = 1\n+y = 2\n"
+)
+COMPARE = "diff --git a/b.py b/b.py\n--- a/b.py\n+++ b/b.py\n@@ -1 +1 @@\n-y = 1\n+y = 2\n"
+
+
+@pytest.fixture
+def github(monkeypatch):
+    calls = {"posted": [], "reviewed": [], "status": "ahead", "post_error": None, "failed": set()}
+
+    def post(repo, number, body, installation_id):
+        if calls["post_error"]:
+            raise calls["post_error"]
+        calls["posted"].append(body)
+
+    def review(chunks):
+        calls["reviewed"].append(sorted(c.file_path for c in chunks))
+        return [], calls["failed"]
+
+    monkeypatch.setattr(review_service, "iter_cached_pr_diff_lines", lambda *a: iter(DIFF.split("\n")))
+    monkeypatch.setattr(review_service, "fetch_compare_status", lambda *a: calls["status"])
+    monkeypatch.setattr(review_service, "fetch_compare_diff", lambda *a: COMPARE)
+    monkeypatch.setattr(review_service, "post_pr_comment", post)
+    monkeypatch.setattr(review_service, "review_chunks", review)
+    return calls
+
+
+@pytest.fixture
+def repo_pr(db):
+    repo = models.Repository(full_name="octo/repo", installation_id=1)
+    db.add(repo)
+    db.flush()
+    pr = models.PullRequest(repo_id=repo.id, pr_number=1, head_sha="b" * 40)
+    db.add(pr)
+    db.commit()
+    return repo, pr
+
+
+def _run(db, repo_pr):
+    repo, pr = repo_pr
+    return review_service.run_and_store_review(db, repo, pr, 1, incremental=True)
+
+
+def test_first_review_posts_and_records_the_head(db, repo_pr, github):
+    _run(db, repo_pr)
+    assert github["reviewed"] == [["a.py", "b.py"]] and len(github["posted"]) == 1
+    assert repo_pr[1].last_commented_sha == "b" * 40
+
+
+def test_unchanged_head_is_not_reposted(db, repo_pr, github):
+    _run(db, repo_pr)
+    _run(db, repo_pr)
+    assert github["reviewed"][1] == [] and len(github["posted"]) == 1
+
+
+def test_rate_limited_comment_is_posted_on_retry(db, repo_pr, github):
+    github["post_error"] = RateLimited(1, 120)
+    with pytest.raises(RateLimited):
+        _run(db, repo_pr)
+    assert repo_pr[1].last_reviewed_sha == "b" * 40 and repo_pr[1].last_commented_sha is None
+
+    github["post_error"] = None
+    _run(db, repo_pr)
+    assert github["reviewed"][1] == [] and len(github["posted"]) == 1
+
+
+def test_push_reviews_only_touched_files(db, repo_pr, github):
+    repo, pr = repo_pr
+    pr.last_reviewed_sha = pr.last_commented_sha = "a" * 40
+    db.commit()
+    _run(db, repo_pr)
+    assert github["reviewed"] == [["b.py"]] and len(github["posted"]) == 1
+
+
+@pytest.mark.parametrize("status", ["diverged", "behind"])
+def test_force_push_falls_back_to_full_review(db, repo_pr, github, status):
+    repo, pr = repo_pr
+    pr.last_reviewed_sha = pr.last_commented_sha = "a" * 40
+    db.commit()
+    github["status"] = status
+    _run(db, repo_pr)
+    assert github["reviewed"] == [["a.py", "b.py"]]
+
+
+def test_failed_batch_keeps_issues_and_head_unreviewed(db, repo_pr, github):
+    repo, pr = repo_pr
+    for path in ("a.py", "b.py"):
+        db.add(models.ReviewIssue(pr_id=pr.id, file_path=path, line=1, kind="logic", severity="high", message="m"))
+    db.commit()
+    github["failed"] = {("logic", "a.py")}
+
+    _run(db, repo_pr)
+
+    left = db.query(models.ReviewIssue.file_path).filter_by(pr_id=pr.id).all()
+    assert [p for (p,) in left] == ["a.py"]
+    assert pr.last_reviewed_sha is None
@@ -0,0 +1,130 @@
+"""Full and incremental syncs of a PR's stored issues (_store_issues)."""
+
+import pytest
+
+from backend import models
+from backend.review.fingerprint import issue_fingerprint
+from backend.review.types import Issue
+from backend.services.review_service import _store_issues
+from backend.services.rollups import severity_counts
+
+
+def _issue(path="a.py", line=1, severity="minor", message="bad", suggestion=None):
+    return Issue(
+        file_path=path, line=line, kind="logic", severity=severity, message=message, suggestion=suggestion
+    )
+
+
+@pytest.fixture
+def pr(db):
+    repo = models.Repository(full_name="octo/repo", installation_id=1)
+    db.add(repo)
+    db.flush()
+    pr = models.PullRequest(repo_id=repo.id, pr_number=1)
+    db.add(pr)
+    db.commit()
+    return pr
+
+
+def _rows(db, pr):
+    db.expire_all()
+    return {
+        (r.file_path, r.line): r
+        for r in db.query(models.ReviewIssue).filter(models.ReviewIssue.pr_id == pr.id)
+    }
+
+
+def _counts(db, pr):
+    return {s: n for s, n in severity_counts(db, pr.repo_id).items() if n}
+
+
+def _store(db, pr, issues, in_scope=None):
+    result = _store_issues(db, pr, issues, in_scope)
+    db.commit()
+    return result
+
+
+def _legacy_row(db, pr, issue):
+    """A row written before fingerprints existed."""
+    db.add(models.ReviewIssue(pr_id=pr.id, fingerprint=None, **vars(issue)))
+    db.commit()
+
+
+def test_full_review_keeps_unchanged_replaces_stale(db, pr):
+    _store(db, pr, [_issue(line=1), _issue(line=2)])
+    first = _rows(db, pr)
+
+    issues, new = _store(db, pr, [_issue(line=1), _issue(line=3)])
+
+    rows = _rows(db, pr)
+    assert set(rows) == {("a.py", 1), ("a.py", 3)}
+    assert rows[("a.py", 1)].id == first[("a.py", 1)].id
+    assert rows[("a.py", 1)].created_at == first[("a.py", 1)].created_at
+    assert new == {issue_fingerprint(_issue(line=3))}
+    assert len(issues) == 2
+    assert _counts(db, pr) == {"minor": 2}
+
+
+def test_first_review_marks_nothing_new(db, pr):
+    _, new = _store(db, pr, [_issue()])
+    assert new == set()
+
+
+def test_found_again_with_new_severity_updates_row_and_rollup(db, pr):
+    _store(db, pr, [_issue(severity="minor", suggestion="old")])
+    row_id = _rows(db, pr)[("a.py", 1)].id
+
+    issues, new = _store(db, pr, [_issue(severity="critical", suggestion="new")])
+
+    row = _rows(db, pr)[("a.py", 1)]
+    assert row.id == row_id
+    assert (row.severity, row.suggestion) == ("critical", "new")
+    assert [i.severity for i in issues] == ["critical"]
+    assert new == set()
+    assert _counts(db, pr) == {"critical": 1}
+
+
+def test_incremental_keeps_out_of_scope_and_replaces_in_scope(db, pr):
+    _store(db, pr, [_issue("a.py", 1), _issue("b.py", 1, severity="major")])
+
+    issues, _ = _store(db, pr, [_issue("a.py", 5)], in_scope=lambda path: path == "a.py")
+
+    assert set(_rows(db, pr)) == {("a.py", 5), ("b.py", 1)}
+    assert {(i.file_path, i.line) for i in issues} == {("a.py", 5), ("b.py", 1)}
+    assert _counts(db, pr) == {"minor": 1, "major": 1}
+
+
+def test_incremental_keeps_out_of_scope_legacy_rows(db, pr):
+    _store(db, pr, [_issue("a.py", 1)])
+    _legacy_row(db, pr, _issue("b.py", 2))
+
+    issues, _ = _store(db, pr, [_issue("a.py", 1)], in_scope=lambda path: path == "a.py")
+
+    rows = _rows(db, pr)
+    assert set(rows) == {("a.py", 1), ("b.py", 2)}
+    # Backfilled on the way through.
+    assert rows[("b.py", 2)].fingerprint == issue_fingerprint(_issue("b.py", 2))
+    assert {(i.file_path, i.line) for i in issues} == {("a.py", 1), ("b.py", 2)}
+
+
+def test_legacy_rows_in_scope_are_matched_or_replaced(db, pr):
+    _legacy_row(db, pr, _issue("a.py", 1))
+    _legacy_row(db, pr, _issue("a.py", 2))
+    kept_id = _rows(db, pr)[("a.py", 1)].id
+
+    _, new = _store(db, pr, [_issue("a.py", 1)], in_scope=lambda path: path == "a.py")
+
+    rows = _rows(db, pr)
+    assert set(rows) == {("a.py", 1)}
+    assert rows[("a.py", 1)].id == kept_id
+    assert rows[("a.py", 1)].fingerprint is not None
+    assert new == set()
+
+
+def test_dashboard_total_counts_issues_without_severity(db, pr):
+    from backend.api.dashboard import _dashboard_stats
+
+    _store(db, pr, [_issue(line=1, severity="critical"), _issue(line=2, severity=None)])
+
+    stats = _dashboard_stats(db)
+    assert stats["reviews"] == 2 and stats["critical"] == 1
@@ -0,0 +1,127 @@
+"""drop_trivial_hunks: one positive and one negative case per rule."""
+
+from backend.review.diff_parser import parse_unified_diff
+from backend.review.trivial import drop_trivial_hunks
+
+
+def _file(path, *hunks, header=()):
+    lines = [f"diff --git a/{path} b/{path}", *header, f"--- a/{path}", f"+++ b/{path}"]
+    for body in hunks:
+        minus = sum(1 for l in body if not l.startswith("+"))
+        plus = sum(1 for l in body if not l.startswith("-"))
+        lines.append(f"@@ -1,{minus} +1,{plus} @@")
+        lines.extend(body)
+    return "\n".join(lines) + "\n"
+
+
+def _run(*files):
+    kept, skipped = drop_trivial_hunks(parse_unified_diff("".join(files)))
+    return [c.file_path for c in kept], {s.file_path: s.reason for s in skipped}
+
+
+# --- whitespace-only ---------------------------------------------------------
+
+
+def test_reformatting_is_dropped():
+    kept, skipped = _run(_file("a.js", ["-if (x)  {", "-\treturn  1;  ", "+if (x) {", "+    return 1;"]))
+    assert kept == [] and skipped == {"a.js": "no reviewable changes"}
+
+
+def test_reindenting_split_tokens_is_kept():
+    kept, _ = _run(_file("a.c", ["-int a = b;", "+inta = b;"]))
+    assert kept == ["a.c"]
+
+
+def test_joining_operators_is_kept():
+    kept, _ = _run(_file("a.js", ["-x = a - -b;", "+x = a--b;"]))
+    assert kept == ["a.js"]
+
+
+def test_reindenting_python_is_kept():
+    kept, _ = _run(_file("a.py", ["-    return x", "+return x"]))
+    assert kept == ["a.py"]
+
+
+# --- moved block -------------------------------------------------------------
+
+_BLOCK = ["function f() {", "  const a = 1;", "  return a + 2;", "}"]
+
+
+def test_block_moved_between_files_is_dropped():
+    kept, skipped = _run(
+        _file("a.js", [f"-{l}" for l in _BLOCK]),
+        _file("b.js", [f"+{l}" for l in _BLOCK]),
+    )
+    assert kept == [] and set(skipped) == {"a.js", "b.js"}
+
+
+def test_block_moved_and_edited_is_kept():
+    edited = [*_BLOCK[:2], "  return a + 3;", _BLOCK[3]]
+    kept, _ = _run(
+        _file("a.js", [f"-{l}" for l in _BLOCK]),
+        _file("b.js", [f"+{l}" for l in edited]),
+    )
+    assert "b.js" in kept
+
+
+def test_short_runs_are_not_treated_as_moves():
+    kept, _ = _run(
+        _file("a.js", ["-}", "-return;"]),
+        _file("b.js", ["+}", "+return;"]),
+    )
+    assert set(kept) == {"a.js", "b.js"}
+
+
+def test_python_block_moved_deeper_is_kept():
+    block = ["total += n", "count += 1", "seen.add(n)"]
+    kept, _ = _run(
+        _file("a.py", [f"-{l}" for l in block]),
+        _file("b.py", [" with lock:", *(f"+    {l}" for l in block)]),
+    )
+    assert set(kept) == {"a.py", "b.py"}
+
+
+def test_one_removal_pairs_with_one_copy():
+    kept, skipped = _run(
+        _file("a.js", [f"-{l}" for l in _BLOCK]),
+        _file("b.js", [f"+{l}" for l in _BLOCK]),
+        _file("c.js", [f"+{l}" for l in _BLOCK]),
+    )
+    assert kept == ["c.js"] and set(skipped) == {"a.js", "b.js"}
+
+
+# --- import reorder ----------------------------------------------------------
+
+
+def test_import_reorder_is_dropped():
+    kept, skipped = _run(
+        _file("a.py", ["-import os", "-import sys", "+import sys", "+import os"])
+    )
+    assert kept == [] and "a.py" in skipped
+
+
+def test_added_import_is_kept():
+    kept, _ = _run(_file("a.py", ["-import os", "+import os", "+import subprocess"]))
+    assert kept == ["a.py"]
+
+
+# --- rename only -------------------------------------------------------------
+
+
+def test_pure_rename_is_skipped():
+    diff = "\n".join(
+        [
+            "diff --git a/old.py b/new.py",
+            "similarity index 100%",
+            "rename from old.py",
+            "rename to new.py",
+        ]
+    ) + "\n"
+    kept, skipped = _run(diff)
+    assert kept == [] and skipped == {"new.py": "rename only"}
+
+
+def test_rename_with_changes_is_kept():
+    diff = _file("new.py", ["-x = 1", "+x = 2"], header=("similarity index 90%", "rename from old.py", "rename to new.py"))
+    kept, _ = _run(diff)
+    assert kept == ["new.py"]
@@ -0,0 +1,107 @@
+"""X-GitHub-Delivery dedupe in the webhook."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import models
+from backend.api import webhook
+from backend.services import webhook_deliveries
+from backend.services.webhook_deliveries import claim_delivery, prune_deliveries
+
+PAYLOAD = {
+    "action": "opened",
+    "pull_request": {"number": 3, "title": "t", "state": "open", "head": {"sha": "a" * 40}},
+    "repository": {"full_name": "octo/repo"},
+    "installation": {"id": 1},
+}
+
+
+@pytest.fixture
+def client():
+    from backend.main import app
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def _deliver(client, delivery_id="d-1"):
+    return client.post(
+        "/api/webhook/github/webhook",
+        json=PAYLOAD,
+        headers={"X-GitHub-Event": "pull_request", "X-GitHub-Delivery": delivery_id},
+    )
+
+
+def test_redelivery_is_acknowledged_without_work(db, client):
+    assert _deliver(client).status_code == 202
+    r = _deliver(client)
+    assert r.status_code == 200 and r.json() == {"duplicate": True}
+    assert db.query(models.ReviewJob).count() == 1
+    assert db.query(models.WebhookDelivery).count() == 1
+
+
+def test_failure_before_commit_leaves_no_claim(db, client, monkeypatch):
+    def crash(*args):
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(webhook, "enqueue_review", crash)
+    assert _deliver(client).status_code == 500
+    assert db.query(models.WebhookDelivery).count() == 0
+    assert db.query(models.PullRequest).count() == 0
+
+    monkeypatch.undo()
+    assert _deliver(client).status_code == 202
+    assert db.query(models.ReviewJob).count() == 1
+
+
+def test_uncommitted_claim_is_not_visible(db):
+    from backend.core.database import SessionLocal
+
+    other = SessionLocal()
+    try:
+        assert claim_delivery(other, "d-1", "pull_request")
+        other.rollback()  # e.g. the process died before committing
+    finally:
+        other.close()
+    assert claim_delivery(db, "d-1", "pull_request")
+
+
+def test_expired_delivery_is_claimed_again(db):
+    assert claim_delivery(db, "d-1", "pull_request")
+    db.commit()
+    assert not claim_delivery(db, "d-1", "pull_request")
+    db.rollback()
+
+    db.query(models.WebhookDelivery).update({"received_at": datetime.utcnow() - timedelta(days=30)})
+    db.commit()
+    assert claim_delivery(db, "d-1", "pull_request")
+
+
+def test_prune_drops_expired_and_oldest(db, monkeypatch):
+    now = datetime.utcnow()
+    db.add(models.WebhookDelivery(delivery_id="old", received_at=now - timedelta(days=30)))
+    for i in range(5):
+        db.add(models.WebhookDelivery(delivery_id=f"d-{i}", received_at=now - timedelta(seconds=5 - i)))
+    db.commit()
+
+    assert prune_deliveries(db, max_entries=3) == 3
+    remaining = {d.delivery_id for d in db.query(models.WebhookDelivery)}
+    assert remaining == {"d-2", "d-3", "d-4"}
+
+
+def test_missing_delivery_header_is_processed(db, client):
+    for _ in range(2):
+        r = client.post(
+            "/api/webhook/github/webhook", json=PAYLOAD, headers={"X-GitHub-Event": "pull_request"}
+        )
+        assert r.status_code == 202
+    assert db.query(models.WebhookDelivery).count() == 0
+
+
+def test_prune_runs_periodically(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(webhook_deliveries, "PRUNE_EVERY", 1)
+    monkeypatch.setattr(webhook_deliveries, "prune_deliveries", lambda db: calls.append(1))
+    webhook_deliveries.prune_if_due(db)
+    assert calls
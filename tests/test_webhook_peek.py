@@ -0,0 +1,97 @@
+"""Webhook action peek: ignored events stop before the payload is parsed."""
+
+import json
+from urllib.parse import quote_plus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import models
+from backend.api import webhook
+from backend.integrations.github.webhook_utils import peek_action
+
+PR = {"number": 3, "title": "t", "state": "open", "head": {"sha": "a" * 40}}
+REST = {"pull_request": PR, "repository": {"full_name": "octo/repo"}, "installation": {"id": 1}}
+
+
+@pytest.mark.parametrize(
+    "body, action",
+    [
+        (b'{"action":"labeled","number":3}', "labeled"),
+        (b' \n{ "action" : "synchronize", "number": 3}', "synchronize"),
+        (b'{"action":"opened"', "opened"),
+        # Not something a regex should guess at: parse in full instead.
+        (b'{"action":"a\\"b","number":3}', None),
+        (b'{"pull_request":{"action":"closed"},"action":"opened"}', None),
+        (b'{"number":3,"action":"opened"}', None),
+        (b'{"acti', None),
+        (b'{"action":"' + b"x" * 200 + b'"}', None),
+        (b"", None),
+        (b"[]", None),
+    ],
+)
+def test_peek_action(body, action):
+    assert peek_action(body) == action
+
+
+def test_peek_action_form_encoded():
+    payload = json.dumps({"action": "closed", **REST})
+    assert peek_action(b"payload=" + quote_plus(payload).encode(), form_encoded=True) == "closed"
+    assert peek_action(b"other=1", form_encoded=True) is None
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    calls = []
+    load = webhook.load_payload
+
+    def counting(*args):
+        calls.append(1)
+        return load(*args)
+
+    monkeypatch.setattr(webhook, "load_payload", counting)
+    return calls
+
+
+@pytest.fixture
+def client():
+    from backend.main import app
+
+    return TestClient(app)
+
+
+def _post(client, body):
+    return client.post(
+        "/api/webhook/github/webhook",
+        content=body,
+        headers={"X-GitHub-Event": "pull_request", "Content-Type": "application/json"},
+    )
+
+
+def test_ignored_action_is_not_parsed(db, client, parsed):
+    r = _post(client, json.dumps({"action": "labeled", **REST}))
+    assert r.json() == {"ignored": True} and parsed == []
+    assert db.query(models.ReviewJob).count() == 0
+
+
+def test_review_action_is_queued(db, client, parsed):
+    r = _post(client, json.dumps({"action": "synchronize", **REST}))
+    assert r.status_code == 202 and parsed == [1]
+    assert db.query(models.ReviewJob).count() == 1
+
+
+def test_action_after_nested_key_falls_back_to_a_full_parse(db, client, parsed):
+    body = {**REST, "pull_request": {"action": "closed", **PR}}
+    body = {"pull_request": body.pop("pull_request"), "action": "opened", **body}
+    r = _post(client, json.dumps(body))
+    assert r.status_code == 202 and parsed == [1]
+
+
+def test_missing_action_falls_back_to_a_full_parse(db, client, parsed):
+    r = _post(client, json.dumps(REST))
+    assert r.json() == {"ignored": True} and parsed == [1]
+
+
+def test_truncated_body_is_rejected_after_parsing(db, client, parsed):
+    r = _post(client, '{"action":"opened","pull_request":{')
+    assert r.status_code == 400 and parsed == [1]